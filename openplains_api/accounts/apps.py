@@ -1,6 +1,10 @@
-# from django.apps import AppConfig
+from django.apps import AppConfig
 
 
-# class AccountsConfig(AppConfig):
-#     default_auto_field = 'django.db.models.BigAutoField'
-#     name = 'accounts'
+class AccountsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'accounts'
+
+    def ready(self):
+        # Revoke cached credentials when users or tokens change
+        from . import signals  # noqa: F401
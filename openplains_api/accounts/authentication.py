@@ -0,0 +1,142 @@
+###############################################################################
+# Filename: authentication.py                                                  #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import hashlib
+import hmac
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from knox.auth import TokenAuthentication
+from knox.models import AuthToken
+from knox.settings import CONSTANTS, knox_settings
+from rest_framework.authentication import BasicAuthentication
+
+
+def credentialKey(kind, *parts):
+    """
+    Cache key of a verified credential. Keyed with an HMAC under SECRET_KEY so
+    the cache never holds anything that could be used to recover a password or token.
+    """
+    message = '\0'.join(parts).encode('utf-8')
+    digest = hmac.new(settings.SECRET_KEY.encode('utf-8'), message, hashlib.sha256).hexdigest()
+    return f"auth_{kind}_{digest}"
+
+
+def generationKey(user_id):
+    return f"auth_generation_{user_id}"
+
+
+def userGeneration(user_id):
+    return cache.get(generationKey(user_id), 0)
+
+
+def revokeCachedCredentials(user_id):
+    """Invalidate every cached credential of a user"""
+    key = generationKey(user_id)
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def claimedGeneration(user_ids):
+    """
+    (user id, generation) of the user a credential claims to belong to, read before
+    the credential is verified. A revocation landing during the check then leaves
+    the cached entry under an older generation, so it is never accepted.
+    """
+    user_id = user_ids.first()
+    return user_id, userGeneration(user_id) if user_id is not None else 0
+
+
+def cachedPrincipal(key):
+    """Cached (user, auth) for a credential, unless the user's credentials were revoked since"""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    user, auth, generation, expiry = entry
+    if generation != userGeneration(user.pk) or not user.is_active:
+        return None
+    if expiry is not None and expiry <= timezone.now():
+        return None
+    return user, auth
+
+
+def cachePrincipal(key, user, auth, generation, expiry=None):
+    cache.set(key, (user, auth, generation, expiry), settings.AUTH_CACHE_TTL)
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    """
+    HTTP Basic authentication that remembers verified username/password pairs
+    for AUTH_CACHE_TTL seconds, so repeated calls skip the PBKDF2 password check
+    """
+
+    def authenticate_credentials(self, userid, password, request=None):
+        key = credentialKey('basic', userid, password)
+        principal = cachedPrincipal(key)
+        if principal is not None:
+            return principal
+        User = get_user_model()
+        user_id, generation = claimedGeneration(
+            User._default_manager.filter(**{User.USERNAME_FIELD: userid}).values_list('pk', flat=True)
+        )
+        user, auth = super().authenticate_credentials(userid, password, request)
+        if user.pk == user_id:
+            cachePrincipal(key, user, auth, generation)
+        return user, auth
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Knox token authentication that remembers verified tokens for AUTH_CACHE_TTL
+    seconds, so repeated calls skip the token digest and the AuthToken query
+    """
+
+    def authenticate_credentials(self, token):
+        if knox_settings.AUTO_REFRESH:
+            # Every request has to extend the expiry in the database
+            return super().authenticate_credentials(token)
+        text = token.decode('utf-8') if isinstance(token, bytes) else token
+        key = credentialKey('token', text)
+        principal = cachedPrincipal(key)
+        if principal is not None:
+            return principal
+        user_id, generation = claimedGeneration(
+            AuthToken.objects.filter(token_key=text[:CONSTANTS.TOKEN_KEY_LENGTH]).values_list('user_id', flat=True)
+        )
+        user, auth_token = super().authenticate_credentials(token)
+        if user.pk == user_id:
+            cachePrincipal(key, user, auth_token, generation, auth_token.expiry)
+        return user, auth_token
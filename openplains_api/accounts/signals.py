@@ -0,0 +1,57 @@
+###############################################################################
+# Filename: signals.py                                                         #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from knox.models import AuthToken
+from .authentication import revokeCachedCredentials
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def revokeOnUserChange(sender, instance, **kwargs):
+    """Password changes and deactivation must not be hidden by cached credentials"""
+    revokeCachedCredentials(instance.pk)
+
+
+@receiver(post_delete, sender=AuthToken)
+def revokeOnTokenDelete(sender, instance, **kwargs):
+    """Logout and logoutall delete knox tokens"""
+    revokeCachedCredentials(instance.user_id)
+
+
+@receiver(user_logged_out)
+def revokeOnLogout(sender, user, **kwargs):
+    if user is not None:
+        revokeCachedCredentials(user.pk)
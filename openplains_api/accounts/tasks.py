@@ -0,0 +1,43 @@
+###############################################################################
+# Filename: tasks.py                                                           #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+from celery import shared_task
+from django.utils import timezone
+from knox.models import AuthToken
+
+
+@shared_task()
+def purgeExpiredTokens():
+    """Delete expired knox tokens, knox only removes them when they are presented"""
+    deleted, _ = AuthToken.objects.filter(expiry__lt=timezone.now()).delete()
+    print(f"purgeExpiredTokens: deleted {deleted} tokens")
+    return deleted
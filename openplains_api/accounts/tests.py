@@ -3,8 +3,17 @@
 # # Create your tests here.
 from django.urls import reverse
 from rest_framework.test import APITestCase
+from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from knox.models import AuthToken
+from unittest import mock
+import base64
+from .authentication import CachedBasicAuthentication, CachedTokenAuthentication, revokeCachedCredentials
 
 
 class AccountsTest(APITestCase):
@@ -134,3 +143,58 @@ class AccountsTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(User.objects.count(), 2)
         self.assertEqual(len(response.data['email']), 1)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CachedAuthenticationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('testuser', 'test@example.com', 'testpassword')
+        self.factory = APIRequestFactory()
+
+    def basic_request(self, password='testpassword'):
+        credentials = base64.b64encode(f"testuser:{password}".encode()).decode()
+        return self.factory.get('/', HTTP_AUTHORIZATION=f"Basic {credentials}")
+
+    def token_request(self, token):
+        return self.factory.get('/', HTTP_AUTHORIZATION=f"Token {token}")
+
+    def test_basic_credentials_are_verified_once(self):
+        with mock.patch('rest_framework.authentication.authenticate', wraps=authenticate) as verify:
+            for _ in range(3):
+                user, _ = CachedBasicAuthentication().authenticate(self.basic_request())
+                self.assertEqual(user, self.user)
+        self.assertEqual(verify.call_count, 1)
+
+    def test_password_change_revokes_cached_basic_credentials(self):
+        CachedBasicAuthentication().authenticate(self.basic_request())
+        self.user.set_password('newpassword')
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            CachedBasicAuthentication().authenticate(self.basic_request())
+
+    def test_revocation_during_verification_is_not_cached_over(self):
+        def revokeMidCheck(*args, **kwargs):
+            user = authenticate(*args, **kwargs)
+            revokeCachedCredentials(self.user.pk)
+            return user
+
+        with mock.patch('rest_framework.authentication.authenticate', side_effect=revokeMidCheck):
+            CachedBasicAuthentication().authenticate(self.basic_request())
+        with mock.patch('rest_framework.authentication.authenticate', wraps=authenticate) as verify:
+            CachedBasicAuthentication().authenticate(self.basic_request())
+        self.assertEqual(verify.call_count, 1)
+
+    def test_token_lookup_is_cached(self):
+        _, token = AuthToken.objects.create(self.user)
+        CachedTokenAuthentication().authenticate(self.token_request(token))
+        with self.assertNumQueries(0):
+            user, _ = CachedTokenAuthentication().authenticate(self.token_request(token))
+        self.assertEqual(user, self.user)
+
+    def test_deleted_token_is_rejected(self):
+        instance, token = AuthToken.objects.create(self.user)
+        CachedTokenAuthentication().authenticate(self.token_request(token))
+        instance.delete()
+        with self.assertRaises(AuthenticationFailed):
+            CachedTokenAuthentication().authenticate(self.token_request(token))
@@ -8,7 +8,7 @@ from django.contrib.auth.models import User
 from .serializers import UserSerializer, UserDetailSerializer, LoginSerializer, UserProfileSerializer
 from knox.models import AuthToken
 from django.http import Http404
-from knox.auth import TokenAuthentication
+from .authentication import CachedTokenAuthentication
 import logging
 logger = logging.getLogger('django')
 
@@ -65,7 +65,7 @@ class UserDetail(APIView):
 
 class UserProfile(APIView):
     """User Profile View"""
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (AllowAny,)
     serializer_class = UserProfileSerializer
 
@@ -7,26 +7,33 @@ For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 """
 
-from multiprocessing.spawn import import_main_path
 import os
-import django
-from channels.auth import AuthMiddlewareStack
-from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.security.websocket import AllowedHostsOriginValidator
 
 from django.core.asgi import get_asgi_application
-import savana.routing
-import world.routing
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
 
-# application = get_asgi_application()
+from savana.utils import tracing  # noqa: E402
+
+# Before get_asgi_application() so the Django instrumentation middleware is loaded
+tracing.configure('savana-api')
+
+# Set up Django before the routing modules import consumers and models
+django_asgi_app = get_asgi_application()
+
+from channels.auth import AuthMiddlewareStack  # noqa: E402
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import AllowedHostsOriginValidator  # noqa: E402
+
+import savana.routing  # noqa: E402
+import world.routing  # noqa: E402
+
 ws_url_patters = []
 ws_url_patters.extend(savana.routing.websocket_urlpatterns)
 ws_url_patters.extend(world.routing.websocket_urlpatterns)
 
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
+    "http": django_asgi_app,
     # Just HTTP for now. (We can add other protocols later.)
     "websocket": AllowedHostsOriginValidator(
         AuthMiddlewareStack(
@@ -34,6 +34,7 @@
 # https://www.caktusgroup.com/blog/2021/08/11/using-celery-scheduling-tasks/
 import os
 from celery import Celery
+from celery.signals import worker_init, worker_process_init
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
 
@@ -49,3 +50,19 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 # files and registers any tasks it finds in them. We can import the
 # tasks files some other way if we prefer.
 app.autodiscover_tasks()
+
+
+@worker_process_init.connect
+def configureTracing(**kwargs):
+    # Per pool process, the span exporter thread doesn't survive the fork
+    from savana.utils import tracing
+    tracing.configure('savana-celery', celery=True)
+
+
+@worker_init.connect
+def persistentConnections(**kwargs):
+    # Before the pool forks, tasks run on long lived threads so their connections are reused
+    from django.conf import settings
+    from django.db import connections
+    for alias in connections:
+        connections[alias].settings_dict['CONN_MAX_AGE'] = settings.WORKER_CONN_MAX_AGE
@@ -46,6 +46,7 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 from pathlib import Path
 import environ
 import os
+import sys
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -114,9 +115,9 @@ INSTALLED_APPS = [
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         # 'oauth2_provider.contrib.rest_framework.OAuth2Authentication'
-        'rest_framework.authentication.BasicAuthentication',
+        'accounts.authentication.CachedBasicAuthentication',
         # 'rest_framework.authentication.SessionAuthentication',
-        'knox.auth.TokenAuthentication',
+        'accounts.authentication.CachedTokenAuthentication',
     ],
     # Use Django's standard `django.contrib.auth` permissions,
     # or allow read-only access for unauthenticated users.
@@ -128,6 +129,9 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10
 }
 
+# Seconds verified Basic credentials and knox tokens are cached, see accounts.authentication
+AUTH_CACHE_TTL = env.int('AUTH_CACHE_TTL', default=60)
+
 # Add Later
 AUTHENTICATION_BACKENDS = (
     'django.contrib.auth.backends.ModelBackend',  # default
@@ -136,6 +140,8 @@ AUTHENTICATION_BACKENDS = (
 
 
 MIDDLEWARE = [
+    'savana.middleware.MetricsMiddleware',
+    'savana.middleware.SamplingProfilerMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -145,13 +151,34 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'savana.middleware.ActiniaUnavailableMiddleware',
 ]
 
 if DEBUG:
-    import os  # only if you haven't already imported this
     import socket  # only if you haven't already imported this
-    hostname, _, ips = socket.gethostbyname_ex(socket.gethostname())
-    INTERNAL_IPS = [ip[:-1] + '1' for ip in ips] + ['127.0.0.1', '10.0.2.2']
+
+    class LazyInternalIPs:
+        """
+        Docker gateway addresses for the debug toolbar, resolved on the first
+        request instead of with a DNS lookup every time settings are loaded
+        """
+
+        def __init__(self):
+            self.ips = None
+
+        def resolve(self):
+            if self.ips is None:
+                hostname, _, ips = socket.gethostbyname_ex(socket.gethostname())
+                self.ips = [ip[:-1] + '1' for ip in ips] + ['127.0.0.1', '10.0.2.2']
+            return self.ips
+
+        def __contains__(self, ip):
+            return ip in self.resolve()
+
+        def __iter__(self):
+            return iter(self.resolve())
+
+    INTERNAL_IPS = LazyInternalIPs()
 
 
 CORS_ALLOWED_ORIGINS = [
@@ -246,6 +273,14 @@ WSGI_APPLICATION = 'api.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# Under ASGI each request's sync code runs on a new thread, so connections kept
+# open there are never reused and pile up (Django #33497). The API closes them
+# after every request, pool with pgbouncer instead. Celery workers run tasks on
+# long lived threads and keep theirs for WORKER_CONN_MAX_AGE, see api/celery.py.
+# Health checks replace connections the database dropped.
+DB_CONN_MAX_AGE = env.int('CONN_MAX_AGE', default=0)
+WORKER_CONN_MAX_AGE = env.int('WORKER_CONN_MAX_AGE', default=60)
+
 DATABASES = {
     # 'default': {
     #     'ENGINE': 'django.db.backends.sqlite3',
@@ -257,7 +292,9 @@ DATABASES = {
         'USER': env('POSTGRES_USER'),
         'PASSWORD': env('POSTGRES_PASSWORD'),
         'HOST': env('POSTGRES_HOST'),
-        'PORT': env('POSTGRES_PORT')
+        'PORT': env('POSTGRES_PORT'),
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True
     },
     'actinia': {
         'ENGINE': 'django.contrib.gis.db.backends.postgis',
@@ -265,7 +302,9 @@ DATABASES = {
         'USER': env('ACTINIA_POSTGRES_USER'),
         'PASSWORD': env('ACTINIA_POSTGRES_PASSWORD'),
         'HOST': env('POSTGRES_HOST'),
-        'PORT': env('POSTGRES_PORT')
+        'PORT': env('POSTGRES_PORT'),
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True
     }
 }
 
@@ -303,7 +342,50 @@ ACTINIA = {
     'ACTINIA_VERSION': env('ACTINIA_VERSION'),
     'ACTINIA_BASEURL': env('ACTINIA_BASEURL'),
     'ACTINIA_LOCATION': env('ACTINIA_LOCATION'),
-    'ACTINIA_MAPSET': env('ACTINIA_MAPSET')
+    'ACTINIA_MAPSET': env('ACTINIA_MAPSET'),
+    # Connection pool of the async client used by the savana proxy views
+    'ACTINIA_MAX_CONNECTIONS': env.int('ACTINIA_MAX_CONNECTIONS', default=200),
+    'ACTINIA_MAX_KEEPALIVE_CONNECTIONS': env.int('ACTINIA_MAX_KEEPALIVE_CONNECTIONS', default=50),
+    # API tokens replace per-request password checks, they are renewed
+    # REFRESH_MARGIN seconds before expiry and Basic auth is used for
+    # TOKEN_RETRY seconds after a failed token request
+    'ACTINIA_TOKEN_LIFETIME': env.int('ACTINIA_TOKEN_LIFETIME', default=3600),
+    'ACTINIA_TOKEN_REFRESH_MARGIN': env.int('ACTINIA_TOKEN_REFRESH_MARGIN', default=300),
+    'ACTINIA_TOKEN_RETRY': env.int('ACTINIA_TOKEN_RETRY', default=60),
+    # Pool of actinia-core nodes (host:port) sharing one redis. Mapsets stick to
+    # a node, pinned per location with ACTINIA_LOCATION_NODES=CONUS=host:port.
+    # All nodes must share the same secret key, one API token is used for the pool.
+    'ACTINIA_NODES': env.list('ACTINIA_NODES', default=[env('ACTINIA_BASEURL')]),
+    'ACTINIA_LOCATION_NODES': env.dict('ACTINIA_LOCATION_NODES', default={}),
+    'ACTINIA_RESOURCE_NODE_TTL': env.int('ACTINIA_RESOURCE_NODE_TTL', default=7 * 24 * 60 * 60),
+    'ACTINIA_HEALTH_TIMEOUT': env.float('ACTINIA_HEALTH_TIMEOUT', default=2.0),
+    'ACTINIA_HEALTH_TTL': env.int('ACTINIA_HEALTH_TTL', default=60),
+    # Seconds each process routes from its own copy of node health and load
+    'ACTINIA_NODE_STATE_TTL': env.int('ACTINIA_NODE_STATE_TTL', default=5),
+    # Read timeouts adapt per route to a multiple of its observed latency
+    # percentile, ACTINIA_TIMEOUT applies until a route has enough samples
+    'ACTINIA_CONNECT_TIMEOUT': env.float('ACTINIA_CONNECT_TIMEOUT', default=3.05),
+    'ACTINIA_TIMEOUT': env.float('ACTINIA_TIMEOUT', default=30.0),
+    'ACTINIA_TIMEOUT_MIN': env.float('ACTINIA_TIMEOUT_MIN', default=2.0),
+    'ACTINIA_TIMEOUT_MAX': env.float('ACTINIA_TIMEOUT_MAX', default=120.0),
+    'ACTINIA_TIMEOUT_PERCENTILE': env.float('ACTINIA_TIMEOUT_PERCENTILE', default=0.99),
+    'ACTINIA_TIMEOUT_MULTIPLIER': env.float('ACTINIA_TIMEOUT_MULTIPLIER', default=3.0),
+    # Fail fast for BREAKER_RESET seconds after BREAKER_THRESHOLD failures in a row
+    'ACTINIA_BREAKER_THRESHOLD': env.int('ACTINIA_BREAKER_THRESHOLD', default=5),
+    'ACTINIA_BREAKER_RESET': env.int('ACTINIA_BREAKER_RESET', default=30)
+}
+
+# Terracotta metadata database and COG directory shared with the terracotta service
+TERRACOTTA = {
+    'TERRACOTTA_DB': env('TERRACOTTA_DB', default='/terracotta/actinia.sqlite'),
+    'TERRACOTTA_DATA': env('TERRACOTTA_DATA', default='/terracotta/optimized'),
+}
+
+# Content-addressed store of actinia results. It must be on the same filesystem
+# as the actinia resources, duplicates are hard linked to the stored copy.
+RESULT_STORE = {
+    'ROOT': env('RESULT_STORE_ROOT', default='/actinia_core/resources/.cas'),
+    'GC_GRACE_SECONDS': env.int('RESULT_STORE_GC_GRACE_SECONDS', default=3600),
 }
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -362,6 +444,16 @@ GS_BUCKET_NAME = env('GS_BUCKET_NAME')
 GS_PROJECT_ID = env('GS_PROJECT_ID')
 GOOGLE_APPLICATION_CREDENTIALS = env('GOOGLE_APPLICATION_CREDENTIALS')
 
+# Uploads of actinia results to GCS, see savana.utils.gcs
+GCS_UPLOAD = {
+    'CHUNK_SIZE': env.int('GCS_UPLOAD_CHUNK_SIZE', default=16 * 1024 * 1024),  # Multiple of 256 KiB
+    'PART_SIZE': env.int('GCS_UPLOAD_PART_SIZE', default=128 * 1024 * 1024),
+    'PARALLEL_THRESHOLD': env.int('GCS_UPLOAD_PARALLEL_THRESHOLD', default=256 * 1024 * 1024),
+    'CONCURRENCY': env.int('GCS_UPLOAD_CONCURRENCY', default=8),
+    # Upload every finished actinia GeoTIFF export to the bucket
+    'UPLOAD_EXPORTS': env.bool('GCS_UPLOAD_EXPORTS', default=False),
+}
+
 STATICFILES_STORAGE = 'storages.backends.gcloud.GoogleCloudStorage'
 
 
@@ -390,6 +482,49 @@ CELERY_RESULT_BACKEND = f'redis://{env("REDIS_USER")}:{env("REDIS_PASSWORD")}@dj
 
 # CELERY_TIMEZONE = "America/New_York"
 
+# On-demand sampling profiler. Requests sent with `X-Profile: <TOKEN>` and
+# requests or tasks matched by an enabled ProfilingRule (admin) are profiled,
+# at most MAX_PER_MINUTE across all processes.
+PROFILER = {
+    'TOKEN': env('PROFILER_TOKEN', default=''),
+    'MAX_PER_MINUTE': env.int('PROFILER_MAX_PER_MINUTE', default=6),
+    'INTERVAL': env.float('PROFILER_INTERVAL', default=0.001),  # Seconds between samples
+    'RULES_TTL': env.int('PROFILER_RULES_TTL', default=30),
+}
+
+# OpenTelemetry tracing of requests, Celery tasks, actinia calls and websocket
+# events, exported over OTLP/gRPC to a local collector (the jaeger service)
+OTEL_ENABLED = env.bool('OTEL_ENABLED', default=False)
+OTEL_EXPORTER_OTLP_ENDPOINT = env('OTEL_EXPORTER_OTLP_ENDPOINT', default='http://jaeger:4317')
+
+# Port the Celery worker serves its Prometheus metrics on, 0 disables it.
+# Set PROMETHEUS_MULTIPROC_DIR in the worker environment to merge the pool processes.
+PROMETHEUS_CELERY_PORT = env.int('PROMETHEUS_CELERY_PORT', default=0)
+
+# Bearer token Prometheus sends to scrape /metrics on the API, the endpoint is
+# disabled while it is empty so traffic and route names aren't public
+PROMETHEUS_METRICS_TOKEN = env('PROMETHEUS_METRICS_TOKEN', default='')
+
+# Periodic tasks run by `celery -A api.celery beat`
+CELERY_BEAT_SCHEDULE = {
+    'sync-active-resources': {
+        'task': 'savana.tasks.syncActiveResources',
+        'schedule': 30.0,
+    },
+    'check-actinia-nodes': {
+        'task': 'savana.tasks.checkActiniaNodes',
+        'schedule': 20.0,
+    },
+    'collect-result-blobs': {
+        'task': 'savana.tasks.collectResultBlobs',
+        'schedule': 6 * 60 * 60.0,
+    },
+    'purge-expired-tokens': {
+        'task': 'accounts.tasks.purgeExpiredTokens',
+        'schedule': 60 * 60.0,
+    },
+}
+
 # Django Extension Shell Plus Settings
 SHELL_PLUS = "ipython"
 
@@ -419,4 +554,7 @@ SHELL_PLUS_POST_IMPORTS = [
     # ("module2.submodule", ("func1", "func2", "class1", "etc"))
 ]
 
-os.environ["DJANGO_ALLOW_ASYNC_UNSAFE"] = "true"  # only use in development
+# The notebook runs inside Jupyter's event loop, allow it to query the ORM directly.
+# Everything else must go through sync_to_async / database_sync_to_async.
+if 'shell_plus' in sys.argv:
+    os.environ.setdefault("DJANGO_ALLOW_ASYNC_UNSAFE", "true")  # only use in development
@@ -17,6 +17,7 @@ from django.conf import settings
 from django.contrib import admin
 # from django.contrib.auth.models import User, Group
 from django.urls import include, path
+from savana.views import exportMetrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -26,7 +27,8 @@ urlpatterns = [
     path('api/auth/', include('knox.urls')),
     path('savana/', include('savana.urls')),
     path('world/', include('world.urls')),
-    path('grassapp/', include('grassapp.urls'))
+    path('grassapp/', include('grassapp.urls')),
+    path('metrics', exportMetrics, name='metrics')
 ]
 
 if settings.DEBUG:
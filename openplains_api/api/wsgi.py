@@ -13,4 +13,9 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
 
+from savana.utils import tracing  # noqa: E402
+
+# Before the handler loads the middleware so the Django instrumentation is included
+tracing.configure('savana-api')
+
 application = get_wsgi_application()
@@ -1,6 +1,7 @@
 from django.contrib import admin
 # Register your models here.
-from .models import OpenPlainsModel, Goal, ModelGoal, ModelExtent
+from .models import OpenPlainsModel, Goal, ModelGoal, ModelExtent, ModuleTiming, StacItem, ResultBlob
+from .models import ProfilingRule, ProfileReport
 
 
 class ModelAdmin(admin.ModelAdmin):
@@ -22,7 +23,40 @@ class ModelExtentAdmin(admin.ModelAdmin):
     autocomplete_fields = ('county',)
 
 
+class ModuleTimingAdmin(admin.ModelAdmin):
+    list_display = ("module", "count", "total_seconds", "min_seconds", "max_seconds", "updated")
+    ordering = ("-total_seconds",)
+
+
+class StacItemAdmin(admin.ModelAdmin):
+    list_display = ("item_id", "collection", "start_datetime", "end_datetime", "updated")
+    search_fields = ("item_id",)
+    list_filter = ("collection",)
+
+
+class ResultBlobAdmin(admin.ModelAdmin):
+    list_display = ("digest", "size", "created")
+    search_fields = ("digest",)
+
+
+class ProfilingRuleAdmin(admin.ModelAdmin):
+    list_display = ("name", "kind", "pattern", "sample_rate", "enabled", "expires")
+    list_editable = ("enabled",)
+    list_filter = ("kind", "enabled")
+
+
+class ProfileReportAdmin(admin.ModelAdmin):
+    list_display = ("target", "kind", "trigger", "duration", "created", "file")
+    list_filter = ("kind", "trigger")
+    search_fields = ("target",)
+
+
 admin.site.register(OpenPlainsModel, ModelAdmin)
 admin.site.register(Goal, GoalAdmin)
 admin.site.register(ModelGoal, ModelGoalAdmin)
 admin.site.register(ModelExtent, ModelExtentAdmin)
+admin.site.register(ModuleTiming, ModuleTimingAdmin)
+admin.site.register(StacItem, StacItemAdmin)
+admin.site.register(ResultBlob, ResultBlobAdmin)
+admin.site.register(ProfilingRule, ProfilingRuleAdmin)
+admin.site.register(ProfileReport, ProfileReportAdmin)
@@ -9,3 +9,7 @@ class SavanaConfig(AppConfig):
         # Import celery app now that Django is mostly ready.
         # This initializes Celery and autodiscovers tasks
         import api.celery
+        # Connect the Celery signal handlers recording task metrics
+        from .utils import metrics  # noqa: F401
+        # Connect the Celery signal handlers sampling tasks with the profiler
+        from .utils import sampler  # noqa: F401
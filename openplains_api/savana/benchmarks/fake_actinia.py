@@ -0,0 +1,185 @@
+###############################################################################
+# Filename: fake_actinia.py                                                    #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 1x1 transparent PNG used for render requests
+PNG_PIXEL = bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6360000002000005000157c36b8c0000000049454e44ae426082'
+)
+
+
+def process_log(entries):
+    """Fake process log with one step per entry"""
+    modules = ['r.import', 'g.region', 'r.watershed', 'r.stats', 'r.univar', 'v.out.ogr']
+    return [
+        {
+            'executable': modules[i % len(modules)],
+            'id': f"{modules[i % len(modules)]}_{i}",
+            'parameter': [f"input=map_{i}", f"output=out_{i}"],
+            'return_code': 0,
+            'run_time': 0.25 * (i + 1),
+            'stderr': ['Reading raster map...', '100%'],
+            'stdout': ''
+        }
+        for i in range(entries)
+    ]
+
+
+def resource_response(user_id, resource_id, status='finished', log_entries=0):
+    """Fake actinia ProcessingResponseModel"""
+    now = time.time()
+    return {
+        'accept_datetime': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(now)),
+        'accept_timestamp': now,
+        'datetime': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(now)),
+        'message': f"Resource {status}",
+        'process_log': process_log(log_entries),
+        'process_results': {},
+        'progress': {'num_of_steps': log_entries, 'step': log_entries},
+        'resource_id': resource_id,
+        'status': status,
+        'time_delta': 0.1,
+        'timestamp': now,
+        'urls': {
+            'resources': [],
+            'status': f"http://actinia/api/v3/resources/{user_id}/{resource_id}"
+        },
+        'user_id': user_id
+    }
+
+
+class FakeActinia:
+    """
+    Local actinia-core stand-in for benchmarks.
+    Serves canned responses for the routes used by savana after sleeping
+    for `latency` seconds, so no GRASS installation is needed.
+    """
+
+    def __init__(self, latency=0.05, log_entries=20, user_id='actinia-gdi', version='v3'):
+        self.latency = latency
+        self.log_entries = log_entries
+        self.user_id = user_id
+        self.version = version
+        self.server = None
+        self.thread = None
+
+    @property
+    def baseurl(self):
+        host, port = self.server.server_address
+        return f"{host}:{port}"
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                time.sleep(fake.latency)
+                status, content_type, body = fake.route(self.command, self.path.split('?')[0])
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_DELETE = _respond
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def route(self, method, path):
+        """Canned response for an actinia route"""
+        path = path[len(f"/api/{self.version}"):]
+
+        def ok(data):
+            return 200, 'application/json', json.dumps(data).encode('utf-8')
+
+        if path.endswith('/render'):
+            return 200, 'image/png', PNG_PIXEL
+        if path == '/token':
+            return ok({'status': 'success', 'token': f"token-{uuid.uuid4()}", 'message': 'token expires in 3600 seconds'})
+        if method == 'POST' and re.search(r'/(processing_async|processing_async_export|geotiff_async_orig)$', path):
+            resource_id = f"resource_id-{uuid.uuid4()}"
+            return ok(resource_response(self.user_id, resource_id, status='accepted'))
+        match = re.fullmatch(r'/resources/([^/]+)/([^/]+)', path)
+        if match:
+            return ok(resource_response(match[1], match[2], log_entries=self.log_entries))
+        match = re.fullmatch(r'/resources/([^/]+)', path)
+        if match:
+            return ok({'resource_list': []})
+        if re.fullmatch(r'/actinia_templates/[^/]+', path):
+            inputs = [{'param': 'input', 'value': ''}, {'param': 'layer', 'value': ''}, {'param': 'where', 'value': ''}]
+            return ok({'template': {'version': '1', 'list': [{}, {'inputs': inputs}]}})
+        if path == '/locations':
+            return ok({'status': 'success', 'locations': ['nc_spm_08', 'CONUS']})
+        if re.fullmatch(r'/locations/[^/]+/info', path):
+            return ok({'status': 'finished', 'process_results': {'projection': 'PROJCS["NAD83"]', 'region': {'nsres': 10, 'ewres': 10}}})
+        if re.fullmatch(r'/locations/[^/]+/mapsets', path):
+            return ok({'status': 'success', 'process_results': ['PERMANENT', 'user1']})
+        if re.fullmatch(r'/locations/[^/]+/mapsets/[^/]+/(raster|vector)_layers', path):
+            return ok({'status': 'success', 'process_results': [f"layer_{i}" for i in range(50)]})
+        if re.fullmatch(r'/locations/[^/]+/mapsets/[^/]+/raster_layers/[^/]+', path):
+            info = {'cells': '2025000', 'cols': '1500', 'rows': '1350', 'datatype': 'FCELL', 'min': '55.57', 'max': '156.33'}
+            return ok({'status': 'finished', 'process_results': info, 'process_log': process_log(1)})
+        if path.startswith('/grass_modules'):
+            modules = [{'id': f"r.module{i}", 'description': 'Fake module', 'categories': ['raster']} for i in range(100)]
+            return ok({'status': 'success', 'processes': modules})
+        return 404, 'application/json', json.dumps({'status': 'error', 'message': f"Unknown route {path}"}).encode('utf-8')
@@ -0,0 +1,60 @@
+###############################################################################
+# Filename: stats.py                                                           #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import math
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(name, samples, elapsed):
+    """Latency percentiles in milliseconds and throughput of a benchmark run.
+    Args:
+        name: Name of the benchmarked endpoint, task or consumer
+        samples: Per-request latencies in seconds
+        elapsed: Wall time of the whole run in seconds
+    """
+    return {
+        'name': name,
+        'requests': len(samples),
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'mean_ms': sum(samples) / len(samples) * 1000,
+        'throughput': len(samples) / elapsed if elapsed else None
+    }
@@ -0,0 +1,175 @@
+###############################################################################
+# Filename: websocket_load.py                                                  #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import asyncio
+import json
+import time
+import zlib
+from collections import defaultdict
+
+import websockets
+
+from .stats import percentile
+
+
+class Subscriber:
+    """One websocket client subscribed to a resource group"""
+
+    def __init__(self, url, group):
+        self.url = url
+        self.group = group
+        self.received = set()
+        self.latencies = []
+        self.errors = 0
+
+    async def run(self, ready, stop):
+        try:
+            async with websockets.connect(self.url, open_timeout=30, max_queue=None) as ws:
+                ready.set_result(True)
+                while not stop.is_set():
+                    try:
+                        frame = await asyncio.wait_for(ws.recv(), timeout=0.5)
+                    except asyncio.TimeoutError:
+                        continue
+                    self.handle(frame)
+        except Exception as e:
+            self.errors += 1
+            if not ready.done():
+                ready.set_exception(e)
+
+    def handle(self, frame):
+        now = time.time()
+        if isinstance(frame, bytes):
+            frame = zlib.decompress(frame).decode('utf-8')
+        data = json.loads(frame)
+        events = data['events'] if data.get('type') == 'batch' else [data]
+        for event in events:
+            for probe in event.get('process_log') or []:
+                if 'loadtest_seq' in probe:
+                    self.received.add(probe['loadtest_seq'])
+                    self.latencies.append(now - probe['loadtest_sent'])
+
+
+class WebsocketLoad:
+    """
+    Open `clients` websocket connections spread over `groups` resource groups of a
+    running Daphne server and drive synthetic 'finished' events through the channel
+    layer. Each event carries its send time and a sequence number in the process_log,
+    which ActiniaResourceConsumer forwards unchanged, so delivery latency and dropped
+    messages can be measured on the client side.
+    """
+
+    def __init__(self, channel_layer, url, clients, groups, rate, duration, query='throttle=0'):
+        self.channel_layer = channel_layer
+        self.url = url.rstrip('/')
+        self.clients = clients
+        self.groups = groups
+        self.rate = rate
+        self.duration = duration
+        self.query = query
+
+    def group_name(self, group):
+        return f"loadtest{group}"
+
+    async def connect(self, ramp):
+        """Connect subscribers in batches of `ramp` per second"""
+        self.stop = asyncio.Event()
+        self.subscribers = []
+        self.tasks = []
+        failed = 0
+        loop = asyncio.get_running_loop()
+        for i in range(self.clients):
+            group = i % self.groups
+            subscriber = Subscriber(f"{self.url}/ws/savana/resource/{self.group_name(group)}/?{self.query}", group)
+            ready = loop.create_future()
+            self.subscribers.append(subscriber)
+            self.tasks.append(asyncio.ensure_future(subscriber.run(ready, self.stop)))
+            try:
+                await ready
+            except Exception:
+                failed += 1
+            if ramp and (i + 1) % ramp == 0:
+                await asyncio.sleep(1)
+        return failed
+
+    async def drive(self):
+        """Send events round robin over the groups at `rate` events per second"""
+        sent = defaultdict(set)
+        interval = 1 / self.rate
+        start = time.perf_counter()
+        seq = 0
+        while time.perf_counter() - start < self.duration:
+            group = seq % self.groups
+            await self.channel_layer.group_send(f"savana_{self.group_name(group)}", {
+                'type': 'resource_message',
+                'message': 'finished',
+                'resource_id': f"resource_id-loadtest-{seq}",
+                'resources': [],
+                'process_log': [{'loadtest_seq': seq, 'loadtest_sent': time.time()}]
+            })
+            sent[group].add(seq)
+            seq += 1
+            delay = start + seq * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        return sent, time.perf_counter() - start
+
+    async def close(self, drain):
+        await asyncio.sleep(drain)
+        self.stop.set()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    def report(self, sent, elapsed, failed):
+        expected = 0
+        delivered = 0
+        latencies = []
+        for subscriber in self.subscribers:
+            if subscriber.errors:
+                continue
+            expected += len(sent[subscriber.group])
+            delivered += len(subscriber.received & sent[subscriber.group])
+            latencies.extend(subscriber.latencies)
+        return {
+            'clients': self.clients,
+            'groups': self.groups,
+            'failed_connections': failed,
+            'events_sent': sum(len(s) for s in sent.values()),
+            'send_rate': sum(len(s) for s in sent.values()) / elapsed,
+            'deliveries_expected': expected,
+            'deliveries': delivered,
+            'dropped': expected - delivered,
+            'drop_rate': (expected - delivered) / expected if expected else 0,
+            'p50_ms': (percentile(latencies, 50) or 0) * 1000,
+            'p95_ms': (percentile(latencies, 95) or 0) * 1000,
+            'p99_ms': (percentile(latencies, 99) or 0) * 1000,
+            'max_ms': max(latencies, default=0) * 1000,
+        }
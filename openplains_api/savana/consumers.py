@@ -30,24 +30,74 @@
 #                                                                              #
 ###############################################################################
 from email.policy import default
+import asyncio
 import json
+import zlib
+from urllib.parse import parse_qs
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 from .models.OPEnums import StatusEnum
 from .models.OPModel import OpenPlainsModel
 from . import tasks
 from .utils import actinia as acp
+from .utils.events import diff_event
+from .utils import metrics
+from .utils import tracing
 from django.contrib.gis.gdal import GDALRaster
 import os
 
 
+@database_sync_to_async
+def markModelReady(model_id):
+    # update() instead of get()/save(), save() may call actinia to create the location
+    return OpenPlainsModel.objects.filter(pk=model_id).update(status=StatusEnum.READY)
+
+
+def rasterStatistics(path):
+    """min, max, mean and std of the first band of a raster"""
+    rst = GDALRaster(path, write=False)
+    return rst.bands[0].statistics()
+
+
+def eventKey(event):
+    """Events are merged and delta encoded per event type and resource"""
+    return (event.get('type'), event.get('resource_id'))
+
+
 class ActiniaResourceConsumer(AsyncWebsocketConsumer):
     """
     Listens for actinia resources status changes and send results to client
+
+    Clients can tune the stream with query string options:
+        throttle: Milliseconds to coalesce updates before sending them
+        delta: Send only new process_log entries and changed fields
+        compress: Set to "deflate" to receive zlib compressed binary frames
     """
 
+    throttle_window = 0  # Seconds to coalesce updates per resource
+    delta_encoding = False
+
+    def configure_stream(self):
+        """Read the per-client stream options from the query string"""
+        params = parse_qs(self.scope.get('query_string', b'').decode())
+        if 'throttle' in params:
+            try:
+                self.throttle_window = max(0, int(params['throttle'][0])) / 1000
+            except ValueError:
+                # Keep the default window rather than refusing the connection
+                pass
+        if 'delta' in params:
+            self.delta_encoding = params['delta'][0].lower() not in ('0', 'false')
+        self.compression = params.get('compress', [None])[0] == 'deflate'
+        self.pending_events = {}
+        self.sent_events = {}
+        self.flush_task = None
+
     async def connect(self):
         print("ActiniaResourceConsumer: Connect")
         print("ActiniaResourceConsumer: Channel Name: ", self.channel_name)
+        self.configure_stream()
 
         self.resource_name = self.scope['url_route']['kwargs']['resource_name']
         print("ActiniaResourceConsumer: Resource Name: ", self.resource_name)
@@ -60,8 +110,10 @@ class ActiniaResourceConsumer(AsyncWebsocketConsumer):
             self.resource_group_name,
             self.channel_name
         )
+        metrics.WEBSOCKET_SUBSCRIPTIONS.labels('resource').inc()
 
         await self.accept()
+        metrics.WEBSOCKET_CONNECTIONS.labels(type(self).__name__).inc()
 
     async def disconnect(self, close_code):
         print("ActiniaResourceConsumer: Disconnect")
@@ -72,6 +124,61 @@ class ActiniaResourceConsumer(AsyncWebsocketConsumer):
             self.resource_group_name,
             self.channel_name
         )
+        metrics.WEBSOCKET_SUBSCRIPTIONS.labels('resource').dec()
+        metrics.WEBSOCKET_CONNECTIONS.labels(type(self).__name__).dec()
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+
+    async def dispatch(self, message):
+        """Handle channel layer events inside a span continuing the trace of their actinia job"""
+        if message.get('type') in ('resource_message', 'model_setup') and message.get('resource_id'):
+            with tracing.jobSpan(f"websocket {message['type']}", message['resource_id'], message.get('traceparent')):
+                return await super().dispatch(message)
+        return await super().dispatch(message)
+
+    async def send_event(self, event):
+        """
+        Queue a resource event for the client. Updates of the same type for the
+        same resource within the throttle window are merged, only the latest
+        one is sent. A resource's model_setup and resource_message events are
+        kept apart so neither replaces the other.
+        Events carry the traceparent of the job's trace when tracing is on.
+        """
+        tracing.stamp(event)
+        self.pending_events[eventKey(event)] = event
+        if self.throttle_window == 0:
+            await self.flush_events()
+        elif self.flush_task is None:
+            self.flush_task = asyncio.ensure_future(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.throttle_window)
+        self.flush_task = None
+        await self.flush_events()
+
+    async def flush_events(self):
+        events, self.pending_events = self.pending_events, {}
+        payload = []
+        for key, event in events.items():
+            if self.delta_encoding:
+                delta = diff_event(self.sent_events.get(key), event)
+                self.sent_events[key] = event
+                if delta is not None:
+                    payload.append(delta)
+            else:
+                payload.append(event)
+        if payload:
+            await self.send_payload(payload)
+
+    async def send_payload(self, events):
+        for event in events:
+            await self.send_text(json.dumps(event))
+
+    async def send_text(self, text):
+        if self.compression:
+            await self.send(bytes_data=zlib.compress(text.encode('utf-8')))
+        else:
+            await self.send(text_data=text)
 
     # Receive message from WebSocket
     async def receive(self, text_data):
@@ -106,14 +213,16 @@ class ActiniaResourceConsumer(AsyncWebsocketConsumer):
 
         # accepted, running, finished, terminated, error'
 
+        # Polling talks to the cache and the broker, it runs in a thread like the ORM calls
         if message in ['accepted']:
-            tasks.asyncResourceStatus.delay(user_id, resource_id)
+            await sync_to_async(tasks.pollResourceStatus, thread_sensitive=False)(user_id, resource_id)
         elif message in ['running']:
-            await self.send(text_data=json.dumps({
+            await self.send_event({
+                'type': "resource_message",
                 'message': message,
                 'resource_id': resource_id
-            }))
-            tasks.asyncResourceStatus.delay(user_id, resource_id, "resource_message")
+            })
+            await sync_to_async(tasks.pollResourceStatus, thread_sensitive=False)(user_id, resource_id, "resource_message")
 
         elif message == 'finished':
             resources = event['resources']
@@ -124,10 +233,10 @@ class ActiniaResourceConsumer(AsyncWebsocketConsumer):
                 resource_location = os.path.join('/actinia_core', 'resources', resource_owner, resource_id, file_name)
                 print("Resource Location: ", resource_location)
                 # resource_location = os.path.join('/vsicurl/', resources[0])
-                rst = GDALRaster(resource_location, write=False)
-                print("GDAL RASTER Statistics: ", rst.bands[0].statistics())
-                raster_stats = rst.bands[0].statistics()
-                await self.send(text_data=json.dumps({
+                # Reading the raster blocks, keep it off the event loop
+                raster_stats = await sync_to_async(rasterStatistics, thread_sensitive=False)(resource_location)
+                print("GDAL RASTER Statistics: ", raster_stats)
+                await self.send_event({
                     'type': "resource_message",
                     'message': message,
                     'resource_id': resource_id,
@@ -138,28 +247,28 @@ class ActiniaResourceConsumer(AsyncWebsocketConsumer):
                         'mean': raster_stats[2],
                         'median': raster_stats[3]
                     }
-                }))
+                })
             else:
-                await self.send(text_data=json.dumps({
+                await self.send_event({
                     'type': "resource_message",
                     'message': message,
                     'resource_id': resource_id,
                     'resources': resources,
                     'process_log': event['process_log']
-                }))
+                })
         elif message == 'error':
-            await self.send(text_data=json.dumps({
+            await self.send_event({
                 'type': "resource_message",
                 'message': message,
                 'resource_id': resource_id,
-            }))
+            })
         else:
             # Send message to WebSocket
-            await self.send(text_data=json.dumps({
+            await self.send_event({
                 'type': "resource_message",
                 'message': message,
                 'resource_id': resource_id
-            }))
+            })
 
     # Check if model ingest is complete and update the database.
     async def model_setup(self, event):
@@ -167,7 +276,7 @@ class ActiniaResourceConsumer(AsyncWebsocketConsumer):
         print("ActiniaResourceConsumer: Resource message event", event)
 
         status = event['status']
-        message = event['message']
+        message = event.get('active_message')
         resource_id = event['resource_id']
         model_id = event['model_id']
         user_id = acp.currentUser()  # scope["user"]
@@ -175,27 +284,160 @@ class ActiniaResourceConsumer(AsyncWebsocketConsumer):
         print("Task Message: ", message)
         # accepted, running, finished, terminated, error'
         if status in ['accepted', 'running']:
-            tasks.asyncModelUpdateResourceStatus.delay(model_id, user_id, resource_id, "model_setup")
+            await sync_to_async(tasks.pollModelResourceStatus, thread_sensitive=False)(model_id, user_id, resource_id, "model_setup")
 
         elif status == 'finished':
             print("Model Finished Import")
-            # TODO - figure out why this isn't updatating the model.
-            model = OpenPlainsModel.objects.get(pk=model_id)
-            model.status = StatusEnum.READY
-            model.save()
-            print("Model Status Updated to Ready")
+            updated = await markModelReady(model_id)
+            print("Model Status Updated to Ready: ", updated)
 
-            await self.send(text_data=json.dumps({
+            await self.send_event({
                 'type': "model_setup",
                 'message': message,
                 'resource_id': resource_id,
                 'resources': resources
-            }))
+            })
         else:
-            await self.send(text_data=json.dumps({
+            await self.send_event({
                 'type': "model_setup",
                 'message': message,
                 'resource_id': resource_id,
                 'resources': resources,
                 'process_log': event['process_log']
-            }))
+            })
+
+
+class ActiniaMultiplexConsumer(ActiniaResourceConsumer):
+    """
+    Single websocket that subscribes to many actinia resources and models.
+
+    The client sends {"action": "subscribe" | "unsubscribe", "resource_id": ..., "model_id": ...}
+    and receives {"type": "batch", "events": [...]} frames. Events arriving
+    within the throttle window are sent together and are delta encoded
+    unless the client connects with ?delta=0. Messages that can't be handled
+    are answered with an {"type": "error", "message": ...} frame.
+    """
+
+    throttle_window = 0.25
+    delta_encoding = True
+    max_subscriptions = 100  # Groups a single socket may join
+    message_types = ('resource_message', 'model_setup')  # Handlers a client may trigger
+
+    async def connect(self):
+        print("ActiniaMultiplexConsumer: Connect", self.channel_name)
+        self.configure_stream()
+        self.subscriptions = set()
+        self.last_events = {}
+        await self.accept()
+        metrics.WEBSOCKET_CONNECTIONS.labels(type(self).__name__).inc()
+
+    async def disconnect(self, close_code):
+        print("ActiniaMultiplexConsumer: Disconnect Close Code:", close_code)
+        for group_name in self.subscriptions:
+            await self.channel_layer.group_discard(group_name, self.channel_name)
+            metrics.WEBSOCKET_SUBSCRIPTIONS.labels(metrics.groupKind(group_name)).dec()
+        self.subscriptions.clear()
+        metrics.WEBSOCKET_CONNECTIONS.labels(type(self).__name__).dec()
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+
+    @staticmethod
+    def resource_group(resource_id):
+        return "savana_%s" % resource_id.replace('-', '_')
+
+    @staticmethod
+    def model_group(model_id):
+        return "savana_model_%s" % model_id
+
+    def _groups(self, data):
+        groups = []
+        if data.get('resource_id'):
+            groups.append(self.resource_group(data['resource_id']))
+        if data.get('model_id') is not None:
+            groups.append(self.model_group(data['model_id']))
+        return groups
+
+    def _invalid(self, data):
+        """Why a client message can't be handled, None if it can"""
+        if not isinstance(data, dict):
+            return "Messages must be JSON objects"
+        if data.get('action', 'subscribe') not in ('subscribe', 'unsubscribe'):
+            return f"Unknown action {data['action']}"
+        resource_id = data.get('resource_id')
+        if resource_id and not (isinstance(resource_id, str) and acp.RESOURCE_ID.fullmatch(resource_id)):
+            return "Invalid resource_id"
+        model_id = data.get('model_id')
+        if model_id is not None and (isinstance(model_id, bool) or not str(model_id).isdigit()):
+            return "Invalid model_id"
+        if data.get('message_type') not in (None,) + self.message_types:
+            return f"Unknown message_type {data['message_type']}"
+        return None
+
+    async def send_error(self, message):
+        await self.send_text(json.dumps({'type': 'error', 'message': message}))
+
+    async def receive(self, text_data):
+        print("ActiniaMultiplexConsumer: Recieve", text_data)
+        try:
+            data = json.loads(text_data)
+        except ValueError:
+            await self.send_error("Messages must be JSON")
+            return
+        error = self._invalid(data)
+        if error:
+            await self.send_error(error)
+            return
+        action = data.get('action', 'subscribe')
+        groups = self._groups(data)
+
+        if action == 'subscribe':
+            new_groups = [group_name for group_name in groups if group_name not in self.subscriptions]
+            if len(self.subscriptions) + len(new_groups) > self.max_subscriptions:
+                await self.send_error(f"A socket can subscribe to at most {self.max_subscriptions} resources and models")
+                return
+            for group_name in new_groups:
+                await self.channel_layer.group_add(group_name, self.channel_name)
+                self.subscriptions.add(group_name)
+                metrics.WEBSOCKET_SUBSCRIPTIONS.labels(metrics.groupKind(group_name)).inc()
+
+            # Kick off status polling the same way the single resource socket does
+            if data.get('message') and data.get('resource_id'):
+                await self.channel_layer.group_send(
+                    self.resource_group(data['resource_id']),
+                    {
+                        'type': data.get('message_type') or 'resource_message',
+                        'message': data['message'],
+                        'resource_id': data['resource_id'],
+                        'model_id': data.get('model_id')
+                    }
+                )
+        elif action == 'unsubscribe':
+            for group_name in groups:
+                if group_name in self.subscriptions:
+                    await self.channel_layer.group_discard(group_name, self.channel_name)
+                    self.subscriptions.discard(group_name)
+                    metrics.WEBSOCKET_SUBSCRIPTIONS.labels(metrics.groupKind(group_name)).dec()
+            for events in (self.last_events, self.sent_events):
+                for key in [key for key in events if key[1] == data.get('resource_id')]:
+                    del events[key]
+
+    async def resource_message(self, event):
+        if self._is_duplicate(event):
+            return
+        await super().resource_message(event)
+
+    async def model_setup(self, event):
+        if self._is_duplicate(event):
+            return
+        await super().model_setup(event)
+
+    def _is_duplicate(self, event):
+        """A socket subscribed to a model and its resource receives each update twice"""
+        key = eventKey(event)
+        if self.last_events.get(key) == event:
+            return True
+        self.last_events[key] = event
+        return False
+
+    async def send_payload(self, events):
+        await self.send_text(json.dumps({'type': 'batch', 'events': events}))
@@ -31,7 +31,8 @@
 ###############################################################################
 
 
-# import django_filters
+import django_filters
+from .models import ProcessingResponseModel
 # from .models import WorldBorder
 
 # class WorldPopulationFilter(django_filters.FilterSet):
@@ -44,4 +45,17 @@
 #     class Meta:
 #         model = WorldBorder
 #         ordering = ['name']
-#         fields = ['pop2005','area','name', 'region', 'subregion', 'un']
\ No newline at end of file
+#         fields = ['pop2005','area','name', 'region', 'subregion', 'un']
+
+
+class ProcessingResponseFilter(django_filters.FilterSet):
+    """
+    Filter actinia jobs by owner, resource, status and time
+    """
+    status = django_filters.BaseInFilter()
+    created = django_filters.IsoDateTimeFromToRangeFilter()
+    updated = django_filters.IsoDateTimeFromToRangeFilter()
+
+    class Meta:
+        model = ProcessingResponseModel
+        fields = ['status', 'user_id', 'resource_id', 'owner', 'model', 'created', 'updated']
@@ -0,0 +1,166 @@
+###############################################################################
+# Filename: benchmark_actinia.py                                               #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import asyncio
+import contextlib
+import io
+import json
+import time
+import uuid
+
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, override_settings
+from django.test.utils import setup_databases, teardown_databases, setup_test_environment, teardown_test_environment
+
+from savana import routing, tasks
+from savana.benchmarks.fake_actinia import FakeActinia, process_log
+from savana.benchmarks.stats import summarize
+from savana.utils import actinia as acp
+
+# Views are requested under /savana/ with the fake actinia behind them
+VIEW_ROUTES = {
+    'gLocations': '/savana/g/locations/',
+    'gMapsets': '/savana/g/locations/nc_spm_08/mapsets',
+    'gListRasters': '/savana/g/locations/nc_spm_08/mapsets/PERMANENT/raster_layers',
+    'rInfo': '/savana/r/locations/nc_spm_08/mapsets/PERMANENT/raster_layers/elevation/no_cache',
+    'rRenderImage': '/savana/r/locations/nc_spm_08/mapsets/PERMANENT/raster_layers/elevation/render',
+    'gModules': '/savana/g/modules',
+}
+
+BENCHMARK_SETTINGS = dict(
+    ALLOWED_HOSTS=['*'],
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+    CELERY_TASK_ALWAYS_EAGER=True,
+)
+
+
+class Command(BaseCommand):
+    help = "Benchmark savana views, Celery tasks and consumers against a local fake actinia"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Requests per benchmark")
+        parser.add_argument('--concurrency', type=int, default=10, help="Concurrent view requests")
+        parser.add_argument('--latency', type=float, default=50, help="Fake actinia latency in ms")
+        parser.add_argument('--log-entries', type=int, default=20, help="process_log entries per fake resource")
+        parser.add_argument('--only', choices=['views', 'tasks', 'consumers'], action='append', help="Only run these benchmarks")
+        parser.add_argument('--json', action='store_true', help="Print results as JSON")
+
+    def handle(self, *args, **options):
+        only = options['only'] or ['views', 'tasks', 'consumers']
+        fake = FakeActinia(latency=options['latency'] / 1000, log_entries=options['log_entries'])
+        baseurl = acp.ACTINIA_SETTINGS['ACTINIA_BASEURL']
+        results = []
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            # The views and consumers print every request, keep that out of the report
+            with fake, override_settings(**BENCHMARK_SETTINGS), contextlib.redirect_stdout(io.StringIO()):
+                acp.ACTINIA_SETTINGS['ACTINIA_BASEURL'] = fake.baseurl
+                tasks.asyncResourceStatus.app.conf.task_always_eager = True
+                if 'views' in only:
+                    results += asyncio.run(self.bench_views(options['requests'], options['concurrency']))
+                if 'tasks' in only:
+                    results += self.bench_tasks(options['requests'])
+                if 'consumers' in only:
+                    results += asyncio.run(self.bench_consumers(options['requests'], options['log_entries']))
+        finally:
+            acp.ACTINIA_SETTINGS['ACTINIA_BASEURL'] = baseurl
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'benchmark':<36}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+        for row in results:
+            self.stdout.write(
+                f"{row['name']:<36}{row['requests']:>6}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+                f"{row['p99_ms']:>10.1f}{row['throughput']:>10.1f}"
+            )
+
+    async def bench_views(self, requests, concurrency):
+        client = AsyncClient()
+        results = []
+        for name, url in VIEW_ROUTES.items():
+            samples = []
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def timed():
+                async with semaphore:
+                    start = time.perf_counter()
+                    response = await client.get(url)
+                    samples.append(time.perf_counter() - start)
+                    assert response.status_code == 200, f"{url} returned {response.status_code}"
+
+            start = time.perf_counter()
+            await asyncio.gather(*(timed() for _ in range(requests)))
+            results.append(summarize(f"view:{name}", samples, time.perf_counter() - start))
+        return results
+
+    def bench_tasks(self, requests):
+        samples = []
+        user_id = acp.currentUser()
+        start = time.perf_counter()
+        for _ in range(requests):
+            resource_id = f"resource_id-{uuid.uuid4()}"
+            task_start = time.perf_counter()
+            tasks.asyncResourceStatus.apply(args=(user_id, resource_id)).get()
+            samples.append(time.perf_counter() - task_start)
+        return [summarize('task:asyncResourceStatus', samples, time.perf_counter() - start)]
+
+    async def bench_consumers(self, requests, log_entries):
+        application = URLRouter(routing.websocket_urlpatterns)
+        communicator = WebsocketCommunicator(application, '/ws/savana/resource/benchmark/?throttle=0')
+        connected, _ = await communicator.connect()
+        assert connected, "Consumer refused the benchmark connection"
+        channel_layer = get_channel_layer()
+        samples = []
+        start = time.perf_counter()
+        for i in range(requests):
+            event_start = time.perf_counter()
+            await channel_layer.group_send('savana_benchmark', {
+                'type': 'resource_message',
+                'message': 'finished',
+                'resource_id': f"resource_id-{i}",
+                'resources': [],
+                'process_log': process_log(log_entries)
+            })
+            await communicator.receive_from(timeout=5)
+            samples.append(time.perf_counter() - event_start)
+        elapsed = time.perf_counter() - start
+        await communicator.disconnect()
+        return [summarize('consumer:ActiniaResourceConsumer', samples, elapsed)]
@@ -0,0 +1,139 @@
+###############################################################################
+# Filename: benchmark_startup.py                                               #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import json
+import os
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from savana.benchmarks.stats import summarize
+
+# Each phase runs in a fresh interpreter so nothing is already imported,
+# the script prints the seconds the phase took on its last line
+PHASES = {
+    'django.setup': """
+import django
+django.setup()
+""",
+    'urlconf': """
+import django
+django.setup()
+from django.conf import settings
+from django.urls import get_resolver
+get_resolver(settings.ROOT_URLCONF).url_patterns
+""",
+    'asgi': """
+import api.asgi
+""",
+    'celery.worker': """
+from api.celery import app
+app.loader.import_default_modules()
+app.finalize()
+app.tasks
+""",
+}
+
+TIMER = """
+import time
+start = time.perf_counter()
+{body}
+print(time.perf_counter() - start)
+"""
+
+IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (.*)$')
+
+
+class Command(BaseCommand):
+    help = "Benchmark cold start of django.setup(), the URLconf, the ASGI app and a Celery worker"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=10, help="Fresh interpreters per phase")
+        parser.add_argument('--only', choices=list(PHASES), action='append', help="Only run these phases")
+        parser.add_argument('--importtime', type=int, default=0, metavar='N',
+                            help="Also list the N slowest imports (cumulative) of each phase")
+        parser.add_argument('--json', action='store_true', help="Print results as JSON")
+
+    def handle(self, *args, **options):
+        only = options['only'] or list(PHASES)
+        results = []
+        slowest = {}
+        for phase in only:
+            samples = [self.run(PHASES[phase])[0] for _ in range(options['runs'])]
+            results.append(summarize(f"startup:{phase}", samples, sum(samples)))
+            if options['importtime']:
+                slowest[phase] = self.importtime(PHASES[phase], options['importtime'])
+
+        if options['json']:
+            self.stdout.write(json.dumps({'results': results, 'imports': slowest}, indent=2))
+            return
+        self.stdout.write(f"{'benchmark':<36}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+        for row in results:
+            self.stdout.write(
+                f"{row['name']:<36}{row['requests']:>6}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+                f"{row['p99_ms']:>10.1f}{row['mean_ms']:>10.1f}"
+            )
+        for phase, imports in slowest.items():
+            self.stdout.write(f"\nSlowest imports for {phase}")
+            for module, cumulative in imports:
+                self.stdout.write(f"  {cumulative / 1000:>10.1f} ms  {module}")
+
+    def environment(self):
+        env = dict(os.environ)
+        env.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(settings.BASE_DIR), env.get('PYTHONPATH')]))
+        env.pop('PYTHONPROFILEIMPORTTIME', None)
+        return env
+
+    def run(self, body, *flags):
+        """Seconds a phase took in a fresh interpreter, and its stderr"""
+        proc = subprocess.run(
+            [sys.executable, *flags, '-c', TIMER.format(body=body)],
+            capture_output=True, text=True, env=self.environment(), cwd=settings.BASE_DIR
+        )
+        if proc.returncode != 0:
+            raise CommandError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "Startup failed")
+        return float(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+    def importtime(self, body, count):
+        """Slowest top level imports by cumulative microseconds from -X importtime"""
+        _, stderr = self.run(body, '-X', 'importtime')
+        imports = []
+        for line in stderr.splitlines():
+            match = IMPORTTIME.match(line)
+            # Nested imports are indented, their time is already in their parent's
+            if match and not match.group(3).startswith(' '):
+                imports.append((match.group(3).strip(), int(match.group(2))))
+        return sorted(imports, key=lambda item: item[1], reverse=True)[:count]
@@ -0,0 +1,92 @@
+###############################################################################
+# Filename: loadtest_websockets.py                                             #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import asyncio
+import json
+
+import redis
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from savana.benchmarks.websocket_load import WebsocketLoad
+
+
+def redisCpu():
+    """Seconds of CPU used by the channel layer Redis server so far"""
+    host = settings.CHANNEL_LAYERS['default'].get('CONFIG', {}).get('hosts', [None])[0]
+    if not isinstance(host, str):
+        return None
+    info = redis.Redis.from_url(host).info('cpu')
+    return info['used_cpu_sys'] + info['used_cpu_user']
+
+
+class Command(BaseCommand):
+    help = "Load test websocket job status fan-out through Daphne and the channel layer"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='ws://localhost:8005', help="Daphne websocket base url")
+        parser.add_argument('--clients', type=int, default=1000, help="Number of websocket clients")
+        parser.add_argument('--groups', type=int, default=50, help="Number of resource groups the clients are spread over")
+        parser.add_argument('--rate', type=float, default=100, help="Status events sent per second")
+        parser.add_argument('--duration', type=float, default=30, help="Seconds to send events for")
+        parser.add_argument('--ramp', type=int, default=200, help="Client connections opened per second")
+        parser.add_argument('--drain', type=float, default=5, help="Seconds to wait for late deliveries")
+        parser.add_argument('--query', default='throttle=0', help="Stream options passed to the consumer")
+        parser.add_argument('--json', action='store_true', help="Print results as JSON")
+
+    def handle(self, *args, **options):
+        load = WebsocketLoad(
+            get_channel_layer(), options['url'], options['clients'], options['groups'],
+            options['rate'], options['duration'], options['query']
+        )
+        result = asyncio.run(self.run(load, options['ramp'], options['drain']))
+
+        if options['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        for key, value in result.items():
+            self.stdout.write(f"{key:<24}{value:.3f}" if isinstance(value, float) else f"{key:<24}{value}")
+
+    async def run(self, load, ramp, drain):
+        failed = await load.connect(ramp)
+        self.stdout.write(f"Connected {load.clients - failed}/{load.clients} clients")
+        cpu_start = redisCpu()
+        sent, elapsed = await load.drive()
+        await load.close(drain)
+        cpu_end = redisCpu()
+
+        result = load.report(sent, elapsed, failed)
+        if cpu_start is not None:
+            result['redis_cpu_seconds'] = cpu_end - cpu_start
+            result['redis_cpu_percent'] = (cpu_end - cpu_start) / (elapsed + drain) * 100
+        return result
@@ -0,0 +1,63 @@
+###############################################################################
+# Filename: module_profile.py                                                  #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from savana.models import ModuleTiming, ProcessingResponseModel
+
+
+class Command(BaseCommand):
+    help = "Report which GRASS modules dominate actinia job wall time"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help="Rebuild the profile from all finished jobs")
+        parser.add_argument('--limit', type=int, default=20, help="Number of modules to show")
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            with transaction.atomic():
+                ModuleTiming.objects.all().delete()
+                finished = ProcessingResponseModel.objects.filter(status='finished')
+                for process_log in finished.values_list('process_log', flat=True).iterator():
+                    ModuleTiming.objects.record_process_log(process_log)
+
+        report = ModuleTiming.objects.report()[:options['limit']]
+        if not report:
+            self.stdout.write("No finished jobs have been profiled yet.")
+            return
+
+        self.stdout.write(f"{'module':<30}{'runs':>8}{'total s':>12}{'share':>8}{'mean s':>10}{'p50 s':>8}{'p95 s':>8}{'max s':>10}")
+        for row in report:
+            self.stdout.write(
+                f"{row['module']:<30}{row['count']:>8}{row['total_seconds']:>12.1f}{row['share']:>8.1%}"
+                f"{row['mean_seconds']:>10.2f}{row['p50_seconds']:>8g}{row['p95_seconds']:>8g}{row['max_seconds']:>10.2f}"
+            )
@@ -0,0 +1,64 @@
+###############################################################################
+# Filename: sync_stac.py                                                       #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from savana.models import ProcessingResponseModel, StacItem
+from savana.utils.stac import walkCatalog
+from savana import tasks
+
+
+class Command(BaseCommand):
+    help = "Index the items of a static STAC catalog and finished actinia exports for /stac/search"
+
+    def add_arguments(self, parser):
+        parser.add_argument('catalog', nargs='?', help="Path or URL of a static STAC catalog.json")
+        parser.add_argument('--source-srid', type=int, default=4326, help="SRID of the catalog geometries, e.g. 5070 for the NLCD catalog")
+        parser.add_argument('--actinia', action='store_true', help="Also index GeoTIFFs of all finished actinia jobs")
+
+    def handle(self, *args, **options):
+        if options['catalog']:
+            count = 0
+            with transaction.atomic():
+                for collection, item in walkCatalog(options['catalog']):
+                    StacItem.objects.upsert(collection, item, srid=options['source_srid'])
+                    count += 1
+            self.stdout.write(f"Indexed {count} items from {options['catalog']}")
+
+        if options['actinia']:
+            finished = ProcessingResponseModel.objects.filter(status='finished').exclude(urls__resources=[])
+            for user_id, resource_id in finished.values_list('user_id', 'resource_id'):
+                try:
+                    items = tasks.stacIndexResource(user_id, resource_id)
+                    self.stdout.write(f"{resource_id}: {len(items)} items")
+                except Exception as e:
+                    self.stderr.write(f"{resource_id}: {e}")
@@ -0,0 +1,136 @@
+###############################################################################
+# Filename: middleware.py                                                      #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import asyncio
+import time
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.utils.deprecation import MiddlewareMixin
+from .utils.breaker import ActiniaUnavailable
+from .utils import metrics
+from .utils import sampler
+
+
+class MetricsMiddleware:
+    """
+    Record request latency per url route. Works in both sync and async mode so
+    the async actinia views are not pushed through a thread for this.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Mark the instance as a coroutine function for the async handler, like MiddlewareMixin
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        metrics.observeRequest(request, response, start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        metrics.observeRequest(request, response, start)
+        return response
+
+
+class SamplingProfilerMiddleware:
+    """
+    Profile requests sent with the X-Profile header or matched by a ProfilingRule.
+    The response carries the id of the stored ProfileReport in X-Profile-Report.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if sampler.rulesStale():
+            sampler.refreshRules()
+        session = sampler.begin('request', request.path, request)
+        if session is None:
+            return self.get_response(request)
+        session.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            session.stop()
+        return self.tag(response, session.save())
+
+    async def __acall__(self, request):
+        if sampler.rulesStale():
+            await sync_to_async(sampler.refreshRules)()
+        session = sampler.begin('request', request.path, request, async_mode='enabled')
+        if session is None:
+            return await self.get_response(request)
+        session.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            session.stop()
+        return self.tag(response, await sync_to_async(session.save)())
+
+    @staticmethod
+    def tag(response, report):
+        if report is not None:
+            response['X-Profile-Report'] = str(report.pk)
+        return response
+
+
+class ActiniaUnavailableMiddleware(MiddlewareMixin):
+    """Turn ActiniaUnavailable raised by a view into a structured 503 response"""
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, ActiniaUnavailable):
+            return None
+        response = JsonResponse({
+            "error": "actinia_unavailable",
+            "message": str(exception),
+            "node": exception.node,
+            "route": exception.route,
+            "retry_after": exception.retry_after,
+        }, status=503)
+        response['Retry-After'] = str(exception.retry_after)
+        return response
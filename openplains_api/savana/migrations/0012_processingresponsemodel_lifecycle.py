@@ -0,0 +1,132 @@
+# Generated by Django 4.1.3 on 2026-10-19 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('savana', '0011_openplainsmodel_location'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='processingresponsemodel',
+            options={'ordering': ['-updated']},
+        ),
+        migrations.AddField(
+            model_name='processingresponsemodel',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='processingresponsemodel',
+            name='model',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='processing_responses', to='savana.openplainsmodel'),
+        ),
+        migrations.AddField(
+            model_name='processingresponsemodel',
+            name='owner',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='processing_responses', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='processingresponsemodel',
+            name='process_log',
+            field=models.JSONField(default=list, verbose_name='process_log'),
+        ),
+        migrations.AddField(
+            model_name='processingresponsemodel',
+            name='progress',
+            field=models.JSONField(null=True, verbose_name='progress'),
+        ),
+        migrations.AddField(
+            model_name='processingresponsemodel',
+            name='updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='processingresponsemodel',
+            name='urls',
+            field=models.JSONField(default=dict, verbose_name='urls'),
+        ),
+        migrations.AlterField(
+            model_name='processingresponsemodel',
+            name='accept_datetime',
+            field=models.CharField(blank=True, default='', max_length=250),
+        ),
+        migrations.AlterField(
+            model_name='processingresponsemodel',
+            name='accept_timestamp',
+            field=models.DecimalField(decimal_places=6, max_digits=19, null=True),
+        ),
+        migrations.AlterField(
+            model_name='processingresponsemodel',
+            name='datetime',
+            field=models.CharField(blank=True, default='', max_length=250),
+        ),
+        migrations.AlterField(
+            model_name='processingresponsemodel',
+            name='message',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AlterField(
+            model_name='processingresponsemodel',
+            name='process_results',
+            field=models.JSONField(default=dict, null=True, verbose_name='process_results'),
+        ),
+        migrations.AlterField(
+            model_name='processingresponsemodel',
+            name='resource_id',
+            field=models.CharField(max_length=250, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='processingresponsemodel',
+            name='status',
+            field=models.CharField(db_index=True, max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='processingresponsemodel',
+            name='time_delta',
+            field=models.DecimalField(decimal_places=6, max_digits=19, null=True),
+        ),
+        migrations.AlterField(
+            model_name='processingresponsemodel',
+            name='timestamp',
+            field=models.DecimalField(decimal_places=6, max_digits=19, null=True),
+        ),
+        migrations.AlterField(
+            model_name='processingresponsemodel',
+            name='user_id',
+            field=models.CharField(db_index=True, max_length=250),
+        ),
+        migrations.CreateModel(
+            name='ProcessingStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=50)),
+                ('timestamp', models.DecimalField(decimal_places=6, max_digits=19, null=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('response', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='savana.processingresponsemodel')),
+            ],
+            options={
+                'ordering': ['created'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='processingresponsemodel',
+            index=models.Index(fields=['user_id', '-updated'], name='savana_proc_user_id_7a1644_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processingresponsemodel',
+            index=models.Index(fields=['status', '-updated'], name='savana_proc_status_1e6bb8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processingstatusevent',
+            index=models.Index(fields=['status', 'created'], name='savana_proc_status_dfeecd_idx'),
+        ),
+    ]
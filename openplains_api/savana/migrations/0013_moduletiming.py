@@ -0,0 +1,27 @@
+# Generated by Django 4.1.3 on 2026-10-19 12:00
+
+from django.db import migrations, models
+import savana.utils.profiler
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('savana', '0012_processingresponsemodel_lifecycle'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModuleTiming',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('module', models.CharField(max_length=250, unique=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total_seconds', models.FloatField(default=0)),
+                ('min_seconds', models.FloatField(null=True)),
+                ('max_seconds', models.FloatField(null=True)),
+                ('buckets', models.JSONField(default=savana.utils.profiler.empty_histogram)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
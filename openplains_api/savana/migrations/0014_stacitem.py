@@ -0,0 +1,48 @@
+# Generated by Django 4.1.3 on 2026-10-19 12:00
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('savana', '0013_moduletiming'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StacItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('collection', models.CharField(max_length=250)),
+                ('item_id', models.CharField(max_length=250)),
+                ('geometry', django.contrib.gis.db.models.fields.GeometryField(srid=4326)),
+                ('datetime', models.DateTimeField(null=True)),
+                ('start_datetime', models.DateTimeField(null=True)),
+                ('end_datetime', models.DateTimeField(null=True)),
+                ('properties', models.JSONField(default=dict)),
+                ('assets', models.JSONField(default=dict)),
+                ('stac_extensions', models.JSONField(default=list)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('resource', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stac_items', to='savana.processingresponsemodel')),
+            ],
+            options={
+                'ordering': ['collection', 'start_datetime', 'item_id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='stacitem',
+            index=models.Index(fields=['collection', 'start_datetime', 'end_datetime'], name='savana_stac_collect_3117ca_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stacitem',
+            index=models.Index(fields=['start_datetime', 'end_datetime'], name='savana_stac_start_d_dbdd99_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='stacitem',
+            constraint=models.UniqueConstraint(fields=('collection', 'item_id'), name='unique_stac_collection_item'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.1.3 on 2026-10-19 12:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('savana', '0014_stacitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64, unique=True)),
+                ('size', models.BigIntegerField()),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ResultReference',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=1024, unique=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('blob', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='references', to='savana.resultblob')),
+                ('response', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='result_references', to='savana.processingresponsemodel')),
+            ],
+        ),
+    ]
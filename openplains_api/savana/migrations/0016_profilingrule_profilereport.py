@@ -0,0 +1,43 @@
+# Generated by Django 4.1.3 on 2026-10-19 12:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('savana', '0015_resultblob_resultreference'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfilingRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('kind', models.CharField(choices=[('request', 'Request'), ('task', 'Celery task')], default='request', max_length=10)),
+                ('pattern', models.CharField(max_length=255)),
+                ('sample_rate', models.FloatField(default=0.01)),
+                ('enabled', models.BooleanField(default=True)),
+                ('expires', models.DateTimeField(blank=True, null=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProfileReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('request', 'Request'), ('task', 'Celery task')], max_length=10)),
+                ('target', models.CharField(max_length=255)),
+                ('trigger', models.CharField(max_length=10)),
+                ('duration', models.FloatField()),
+                ('file', models.FileField(upload_to='profiles/%Y/%m/%d/')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('rule', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reports', to='savana.profilingrule')),
+            ],
+            options={
+                'ordering': ['-created'],
+            },
+        ),
+    ]
@@ -37,7 +37,6 @@ from django.urls import reverse
 from django.template.defaultfilters import slugify  # new
 from .OPEnums import PrivacyEnum, StatusEnum
 from .OPModelGoal import ModelGoal
-from savana.utils import actinia as acp
 
 # class GoalsEnum(models.TextChoices):
 #     PROTECT = "PNR", "Protect Natural Reasources"
@@ -0,0 +1,99 @@
+###############################################################################
+# Filename: ModuleTiming.py                                                    #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+from django.db import models, transaction
+from savana.utils.profiler import empty_histogram, bucket_index, histogram_quantile, parse_process_log
+
+
+class ModuleTimingManager(models.Manager):
+
+    def record_process_log(self, process_log):
+        """Add the step run times of a finished actinia job to the profile"""
+        by_module = {}
+        for module, run_time in parse_process_log(process_log):
+            by_module.setdefault(module, []).append(run_time)
+        if not by_module:
+            return
+
+        with transaction.atomic():
+            for module in sorted(by_module):
+                timing, _ = self.select_for_update().get_or_create(module=module)
+                timing.add(by_module[module])
+                timing.save()
+
+    def report(self):
+        """Modules ordered by the share of wall time they take"""
+        timings = list(self.all())
+        total = sum(t.total_seconds for t in timings) or 1
+        return [
+            {
+                'module': t.module,
+                'count': t.count,
+                'total_seconds': t.total_seconds,
+                'share': t.total_seconds / total,
+                'mean_seconds': t.mean_seconds(),
+                'min_seconds': t.min_seconds,
+                'max_seconds': t.max_seconds,
+                'p50_seconds': histogram_quantile(t.buckets, 0.5, overflow=t.max_seconds),
+                'p95_seconds': histogram_quantile(t.buckets, 0.95, overflow=t.max_seconds),
+                'buckets': t.buckets
+            }
+            for t in sorted(timings, key=lambda t: t.total_seconds, reverse=True)
+        ]
+
+
+class ModuleTiming(models.Model):
+    """Aggregated run times of a GRASS module across finished actinia jobs"""
+
+    module = models.CharField(max_length=250, unique=True)  # GRASS executable e.g. r.watershed
+    count = models.PositiveIntegerField(default=0)
+    total_seconds = models.FloatField(default=0)
+    min_seconds = models.FloatField(null=True)
+    max_seconds = models.FloatField(null=True)
+    buckets = models.JSONField(default=empty_histogram)  # Counts per savana.utils.profiler.BUCKET_BOUNDS
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = ModuleTimingManager()
+
+    def __str__(self):
+        return self.module
+
+    def add(self, run_times):
+        for run_time in run_times:
+            self.count += 1
+            self.total_seconds += run_time
+            self.min_seconds = run_time if self.min_seconds is None else min(self.min_seconds, run_time)
+            self.max_seconds = run_time if self.max_seconds is None else max(self.max_seconds, run_time)
+            self.buckets[bucket_index(run_time)] += 1
+
+    def mean_seconds(self):
+        return self.total_seconds / self.count if self.count else None
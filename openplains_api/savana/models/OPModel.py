@@ -39,7 +39,6 @@ from world.models.County import County  # new
 from .OPEnums import PrivacyEnum, StatusEnum
 from .OPModelGoal import ModelGoal
 from .OpenModelExtent import ModelExtent
-from savana.utils import actinia as acp
 import requests
 
 # class GoalsEnum(models.TextChoices):
@@ -83,6 +82,8 @@ class OpenPlainsModel(models.Model):
         return reverse("opmodel_detail", kwargs={"slug": self.slug})
 
     def _create_location(self):
+        # Imported here so loading the models doesn't load the actinia client
+        from savana.utils import actinia as acp
         print("Creating Mapset: ", self.slug)
         client = acp.initActiniaClient()  # Add the users credentials
         location_name = self.slug.replace('-', '_')
@@ -29,7 +29,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
 #                                                                              #
 ###############################################################################
-from django.db import models
+from django.db import models, transaction
 from django.core.files.storage import default_storage
 # Create your models here.
 
@@ -38,6 +38,71 @@ def status_default():
     return {}
 
 
+# Columns refreshed every time actinia reports on a resource
+RESPONSE_UPDATE_FIELDS = [
+    'status', 'user_id', 'message', 'process_log', 'process_results', 'progress', 'urls',
+    'accept_timestamp', 'accept_datetime', 'timestamp', 'time_delta', 'datetime', 'updated'
+]
+
+
+class ProcessingResponseManager(models.Manager):
+
+    def record(self, responses, owner=None, model_id=None):
+        """
+        Bulk upsert actinia responses and log their status transitions.
+        Args:
+            responses: List of actinia response dicts
+            owner: User that submitted the jobs, only set on insert
+            model_id: Id of the OpenPlainsModel the jobs belong to, only set on insert
+        Returns:
+            List of (resource_id, previous_status, status) for every
+            resource whose status changed
+        """
+        responses = {r['resource_id']: r for r in responses if r.get('resource_id')}
+        if not responses:
+            return []
+        # Sorted so concurrent recorders lock rows in the same order
+        resource_ids = sorted(responses)
+
+        with transaction.atomic():
+            # Insert unseen resources as placeholder rows first, so every row can be locked.
+            # A concurrent recorder of the same update waits on the lock and then sees the
+            # new status, only one of them reports (and fans out) the transition.
+            placeholders = [self.model.from_actinia(responses[i], owner=owner, model_id=model_id) for i in resource_ids]
+            for placeholder in placeholders:
+                placeholder.status = ''
+            self.bulk_create(placeholders, ignore_conflicts=True)
+            previous = {
+                resource_id: status or None
+                for resource_id, status in self.select_for_update()
+                .filter(resource_id__in=resource_ids).order_by('resource_id').values_list('resource_id', 'status')
+            }
+            self.bulk_create(
+                [self.model.from_actinia(responses[i], owner=owner, model_id=model_id) for i in resource_ids],
+                update_conflicts=True,
+                unique_fields=['resource_id'],
+                update_fields=RESPONSE_UPDATE_FIELDS
+            )
+
+            transitions = [
+                (resource_id, previous.get(resource_id), responses[resource_id].get('status'))
+                for resource_id in resource_ids
+                if previous.get(resource_id) != responses[resource_id].get('status')
+            ]
+            if transitions:
+                changed = [t[0] for t in transitions]
+                ids = dict(self.filter(resource_id__in=changed).values_list('resource_id', 'pk'))
+                ProcessingStatusEvent.objects.bulk_create([
+                    ProcessingStatusEvent(
+                        response_id=ids[resource_id],
+                        status=status,
+                        timestamp=responses[resource_id].get('timestamp')
+                    )
+                    for resource_id, _, status in transitions
+                ])
+        return transitions
+
+
 class ProcessingResponseModel(models.Model):
     """This is the base class for ALL response models.
     This class or its derivatives must be used in all responses that run
@@ -47,20 +112,72 @@ class ProcessingResponseModel(models.Model):
     required = ['status', 'user_id', 'resource_id', 'timestamp', 'datetime',
                 'accept_timestamp', 'accept_datetime', 'message']
     """
-    
-    status = models.CharField(max_length=50)  # The status of the response (Probably and Enum)
-    user_id = models.CharField(max_length=250)  # The id of the user that issued a request
-    resource_id = models.CharField(max_length=250)  # The unique resource id
-    # process_log = []  ProcessLogModel  # A list of ProcessLogModels
+
+    status = models.CharField(max_length=50, db_index=True)  # The status of the response (Probably and Enum)
+    user_id = models.CharField(max_length=250, db_index=True)  # The id of the user that issued a request
+    resource_id = models.CharField(max_length=250, unique=True)  # The unique resource id
+    process_log = models.JSONField("process_log", default=list)  # A list of ProcessLogModels
     # process_chain_list [] GrassModule # The list of GRASS modules that were used in the processing
-    process_results = models.JSONField("process_results", default=dict)  # An arbitrary class that stores the processing results
-    # progress =  ProgressInfoModel
-    message = models.CharField(max_length=50)  # Message for the user, maybe status, finished or error message
-    accept_timestamp = models.DecimalField(max_digits=19, decimal_places=6)  # The acceptance timestamp of the response in human readable format
+    process_results = models.JSONField("process_results", default=dict, null=True)  # An arbitrary class that stores the processing results
+    progress = models.JSONField("progress", null=True)  # ProgressInfoModel
+    message = models.TextField(blank=True, default='')  # Message for the user, maybe status, finished or error message
+    accept_timestamp = models.DecimalField(max_digits=19, decimal_places=6, null=True)  # The acceptance timestamp of the response in human readable format
     # 'exception': ExceptionTracebackModel,
-    accept_datetime = models.CharField(max_length=250)  # The acceptance timestamp of the response in human readable format
-    timestamp = models.DecimalField(max_digits=19, decimal_places=6)  # The current timestamp in seconds of the response
-    time_delta = models.DecimalField(max_digits=19, decimal_places=6)  # The delta of the processing in seconds
-    datetime = models.CharField(max_length=250)  # The current timestamp of the response in human readable format
-    # urls = UrlModel,
+    accept_datetime = models.CharField(max_length=250, blank=True, default='')  # The acceptance timestamp of the response in human readable format
+    timestamp = models.DecimalField(max_digits=19, decimal_places=6, null=True)  # The current timestamp in seconds of the response
+    time_delta = models.DecimalField(max_digits=19, decimal_places=6, null=True)  # The delta of the processing in seconds
+    datetime = models.CharField(max_length=250, blank=True, default='')  # The current timestamp of the response in human readable format
+    urls = models.JSONField("urls", default=dict)  # UrlModel
     # api_info = ApiInfoModel
+    owner = models.ForeignKey('auth.User', on_delete=models.SET_NULL, related_name='processing_responses', null=True)
+    model = models.ForeignKey('savana.OpenPlainsModel', on_delete=models.SET_NULL, related_name='processing_responses', null=True)
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = ProcessingResponseManager()
+
+    class Meta:
+        ordering = ['-updated']
+        indexes = [
+            models.Index(fields=['user_id', '-updated']),
+            models.Index(fields=['status', '-updated']),
+        ]
+
+    def __str__(self):
+        return f"{self.resource_id} ({self.status})"
+
+    @classmethod
+    def from_actinia(cls, response, owner=None, model_id=None):
+        """Build an unsaved instance from an actinia response dict"""
+        return cls(
+            status=response.get('status', ''),
+            user_id=response.get('user_id', ''),
+            resource_id=response['resource_id'],
+            process_log=response.get('process_log') or [],
+            process_results=response.get('process_results'),
+            progress=response.get('progress'),
+            message=response.get('message') or '',
+            accept_timestamp=response.get('accept_timestamp'),
+            accept_datetime=response.get('accept_datetime') or '',
+            timestamp=response.get('timestamp'),
+            time_delta=response.get('time_delta'),
+            datetime=response.get('datetime') or '',
+            urls=response.get('urls') or {},
+            owner=owner,
+            model_id=model_id
+        )
+
+
+class ProcessingStatusEvent(models.Model):
+    """A status transition of an actinia job"""
+
+    response = models.ForeignKey(ProcessingResponseModel, on_delete=models.CASCADE, related_name='status_events')
+    status = models.CharField(max_length=50)
+    timestamp = models.DecimalField(max_digits=19, decimal_places=6, null=True)  # actinia timestamp of the transition
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created']
+        indexes = [
+            models.Index(fields=['status', 'created']),
+        ]
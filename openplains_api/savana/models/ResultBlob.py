@@ -0,0 +1,96 @@
+###############################################################################
+# Filename: ResultBlob.py                                                      #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+from django.db import models, transaction
+from django.utils import timezone
+import datetime
+import os
+from savana.utils import cas
+
+
+class ResultBlobManager(models.Manager):
+
+    def store(self, path, response=None):
+        """Deduplicate a result file into the store and reference it from its job"""
+        digest, size, deduplicated = cas.ingest(path)
+        with transaction.atomic():
+            blob, _ = self.get_or_create(digest=digest, defaults={'size': size})
+            ResultReference.objects.update_or_create(
+                path=path,
+                defaults={'blob': blob, 'response': response}
+            )
+        return blob, deduplicated
+
+    def collect(self, grace_seconds=3600):
+        """
+        Drop references to result files that no longer exist and delete the
+        blobs nothing references anymore. Returns (references, blobs) removed.
+        """
+        missing = [ref.pk for ref in ResultReference.objects.only('pk', 'path').iterator() if not os.path.exists(ref.path)]
+        references, _ = ResultReference.objects.filter(pk__in=missing).delete()
+
+        cutoff = timezone.now() - datetime.timedelta(seconds=grace_seconds)
+        removed = 0
+        for blob in self.filter(references__isnull=True, created__lt=cutoff).iterator():
+            if cas.remove(blob.digest):
+                blob.delete()
+                removed += 1
+        return references, removed
+
+
+class ResultBlob(models.Model):
+    """A distinct exported result file, stored once by the SHA-256 of its bytes"""
+
+    digest = models.CharField(max_length=64, unique=True)  # SHA-256 hex digest
+    size = models.BigIntegerField()  # Bytes
+    created = models.DateTimeField(auto_now_add=True)
+
+    objects = ResultBlobManager()
+
+    def __str__(self):
+        return self.digest
+
+    @property
+    def path(self):
+        return cas.blobPath(self.digest)
+
+
+class ResultReference(models.Model):
+    """A result file of a job that is a hard link to a stored blob"""
+
+    blob = models.ForeignKey(ResultBlob, on_delete=models.PROTECT, related_name='references')
+    path = models.CharField(max_length=1024, unique=True)  # File under /actinia_core/resources
+    response = models.ForeignKey('savana.ProcessingResponseModel', on_delete=models.SET_NULL, related_name='result_references', null=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.path
@@ -0,0 +1,86 @@
+###############################################################################
+# Filename: SamplingProfile.py                                                 #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class ProfileKindEnum(models.TextChoices):
+    REQUEST = 'request', _('Request')
+    TASK = 'task', _('Celery task')
+
+
+class ProfilingRuleManager(models.Manager):
+
+    def active(self):
+        return self.filter(enabled=True).filter(Q(expires__isnull=True) | Q(expires__gt=timezone.now()))
+
+
+class ProfilingRule(models.Model):
+    """
+    Admin toggle that samples matching requests or Celery tasks with the
+    profiler. Matches request paths or task names with a shell style pattern,
+    e.g. /savana/models/* or savana.tasks.ingestData.
+    """
+
+    name = models.CharField(max_length=100)
+    kind = models.CharField(max_length=10, choices=ProfileKindEnum.choices, default=ProfileKindEnum.REQUEST)
+    pattern = models.CharField(max_length=255)
+    sample_rate = models.FloatField(default=0.01)  # Share of matching requests or tasks profiled, 0-1
+    enabled = models.BooleanField(default=True)
+    expires = models.DateTimeField(null=True, blank=True)  # Switches the rule off, so it can't be forgotten on
+    created = models.DateTimeField(auto_now_add=True)
+
+    objects = ProfilingRuleManager()
+
+    def __str__(self):
+        return self.name
+
+
+class ProfileReport(models.Model):
+    """Sampled profile of one request or task, stored as a speedscope flame graph"""
+
+    kind = models.CharField(max_length=10, choices=ProfileKindEnum.choices)
+    target = models.CharField(max_length=255)  # Request path or task name
+    trigger = models.CharField(max_length=10)  # header or rule
+    rule = models.ForeignKey(ProfilingRule, on_delete=models.SET_NULL, related_name='reports', null=True, blank=True)
+    duration = models.FloatField()  # Seconds
+    file = models.FileField(upload_to='profiles/%Y/%m/%d/')
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created']
+
+    def __str__(self):
+        return f"{self.target} {self.created:%Y-%m-%d %H:%M:%S}"
@@ -0,0 +1,119 @@
+###############################################################################
+# Filename: StacItem.py                                                        #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+from django.contrib.gis.db import models
+from django.contrib.gis.geos import GEOSGeometry, Polygon
+from django.utils.dateparse import parse_datetime
+from savana.utils.stac import parseBbox
+import json
+
+
+class StacItemManager(models.Manager):
+
+    def upsert(self, collection, item, srid=4326, resource=None):
+        """Insert or update a STAC item, reprojecting its geometry to EPSG:4326"""
+        if item.get('geometry'):
+            geometry = GEOSGeometry(json.dumps(item['geometry']), srid=srid)
+        else:
+            geometry = Polygon.from_bbox(parseBbox(item['bbox']))
+            geometry.srid = srid
+        if srid != 4326:
+            geometry.transform(4326)
+
+        properties = item.get('properties', {})
+
+        def when(key):
+            return parse_datetime(properties[key]) if properties.get(key) else None
+
+        defaults = {
+            'geometry': geometry,
+            'datetime': when('datetime'),
+            'start_datetime': when('start_datetime') or when('datetime'),
+            'end_datetime': when('end_datetime') or when('datetime'),
+            'properties': properties,
+            'assets': item.get('assets', {}),
+            'stac_extensions': item.get('stac_extensions', []),
+        }
+        if resource is not None:
+            defaults['resource'] = resource
+        obj, _ = self.update_or_create(collection=collection, item_id=item['id'], defaults=defaults)
+        return obj
+
+
+class StacItem(models.Model):
+    """STAC item of a project raster, indexed for bbox, datetime and collection search"""
+
+    collection = models.CharField(max_length=250)
+    item_id = models.CharField(max_length=250)
+    geometry = models.GeometryField(srid=4326)  # Footprint in EPSG:4326, GiST indexed
+    datetime = models.DateTimeField(null=True)
+    start_datetime = models.DateTimeField(null=True)  # Same as datetime for single time items
+    end_datetime = models.DateTimeField(null=True)
+    properties = models.JSONField(default=dict)
+    assets = models.JSONField(default=dict)
+    stac_extensions = models.JSONField(default=list)
+    resource = models.ForeignKey('savana.ProcessingResponseModel', on_delete=models.SET_NULL, related_name='stac_items', null=True)
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = StacItemManager()
+
+    class Meta:
+        ordering = ['collection', 'start_datetime', 'item_id']
+        constraints = [
+            models.UniqueConstraint(fields=['collection', 'item_id'], name='unique_stac_collection_item'),
+        ]
+        indexes = [
+            models.Index(fields=['collection', 'start_datetime', 'end_datetime']),
+            models.Index(fields=['start_datetime', 'end_datetime']),
+        ]
+
+    def __str__(self):
+        return f"{self.collection}/{self.item_id}"
+
+    def to_stac(self, base_url=''):
+        """STAC Item document"""
+        return {
+            'type': 'Feature',
+            'stac_version': '1.0.0',
+            'stac_extensions': self.stac_extensions,
+            'id': self.item_id,
+            'collection': self.collection,
+            'geometry': json.loads(self.geometry.geojson),
+            'bbox': list(self.geometry.extent),
+            'properties': self.properties,
+            'assets': self.assets,
+            'links': [
+                {'rel': 'self', 'href': f"{base_url}collections/{self.collection}/items/{self.item_id}", 'type': 'application/geo+json'},
+                {'rel': 'parent', 'href': f"{base_url}collections", 'type': 'application/json'},
+            ]
+        }
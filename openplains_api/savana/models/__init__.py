@@ -31,7 +31,7 @@
 ###############################################################################
 
 
-from .ProcessingResponseModel import ProcessingResponseModel
+from .ProcessingResponseModel import ProcessingResponseModel, ProcessingStatusEvent
 from .TestGCSResourceModel import TestGCSResourceModel
 from .DrainRequest import DrainRequest
 from .OPEnums import StatusEnum, PrivacyEnum, InteractionTypeEnum, InteractionScaleEnum, SpatialInteractionEnum
@@ -39,3 +39,7 @@ from .OPGoal import Goal
 from .OPModel import OpenPlainsModel
 from .OPModelGoal import ModelGoal
 from .OpenModelExtent import ModelExtent
+from .ModuleTiming import ModuleTiming
+from .StacItem import StacItem
+from .ResultBlob import ResultBlob, ResultReference
+from .SamplingProfile import ProfilingRule, ProfileReport
@@ -37,11 +37,12 @@ from django.urls import re_path, path
 
 
 # from . import consumers
-from .consumers import ActiniaResourceConsumer
+from .consumers import ActiniaResourceConsumer, ActiniaMultiplexConsumer
 
 websocket_urlpatterns = [
     # re_path(r'ws/savana/resource/(?P<resource_id>\w+)/$', consumers.ActiniaResourceConsumer.as_asgi()),
-    re_path(r'ws/savana/resource/(?P<resource_name>\w+)/$', ActiniaResourceConsumer.as_asgi())
+    re_path(r'ws/savana/resource/(?P<resource_name>\w+)/$', ActiniaResourceConsumer.as_asgi()),
+    re_path(r'ws/savana/resources/$', ActiniaMultiplexConsumer.as_asgi())
     # re_path(r'ws/savana/resource/(?P<resource_id>\w+)/$', consumers.ActiniaResourceConsumer.as_asgi()),
 
     # url(r"^chat/admin/$", AdminChatConsumer.as_asgi()),
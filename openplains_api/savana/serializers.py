@@ -36,6 +36,7 @@ from rest_framework_gis.serializers import GeoFeatureModelSerializer, GeometrySe
 from django.contrib.auth.models import User
 from rest_framework.authtoken.serializers import AuthTokenSerializer
 from .models import DrainRequest, OpenPlainsModel, ModelGoal, Goal, ModelExtent, OPEnums
+from .models import ProcessingResponseModel, ProcessingStatusEvent
 from .models.OPEnums import StatusEnum
 from world.serializers import CountyGeoidSerializer
 from world.models import County
@@ -100,6 +101,30 @@ class OPModelSerializer(GeoFeatureModelSerializer):
         fields = ['id', 'name', 'description', 'privacy', 'mapset', 'location', 'owner', 'slug', 'status', 'goals', 'counties']
 
 
+class ProcessingStatusEventSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = ProcessingStatusEvent
+        fields = ['status', 'timestamp', 'created']
+
+
+class ProcessingResponseSerializer(serializers.ModelSerializer):
+    owner = serializers.ReadOnlyField(source='owner.username')
+
+    class Meta:
+        model = ProcessingResponseModel
+        exclude = ['process_log', 'process_results']
+
+
+class ProcessingResponseDetailSerializer(serializers.ModelSerializer):
+    owner = serializers.ReadOnlyField(source='owner.username')
+    status_events = ProcessingStatusEventSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ProcessingResponseModel
+        fields = '__all__'
+
+
 class UserSerializer(serializers.ModelSerializer):
     opmodels = serializers.PrimaryKeyRelatedField(many=True, queryset=OpenPlainsModel.objects.all())
 
@@ -31,21 +31,101 @@
 ###############################################################################
 
 
+import os
 from celery import shared_task
+from django.contrib.gis.gdal import GDALRaster, SpatialReference, CoordTransform
+from django.contrib.gis.geos import Polygon
+from datetime import datetime, timezone
+import json
+from .models import ProcessingResponseModel, ModuleTiming, StacItem, ResultBlob
 from .utils import actinia as acp
+from .utils import terracotta as tcp
+from .utils import gcs
+from .utils import cog
+from .utils import nodes
+from .utils import tracing
+from .utils.breaker import ActiniaUnavailable
+from .models.TestGCSResourceModel import COG_CONTENT_TYPE
+from django.conf import settings
+from django.core.cache import cache
 # from actinia import *
-import requests
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
 
-@shared_task()
-def asyncResourceStatus(user_id, resource_id, message_type="resource_message"):
+def recordResponses(responses, **kwargs):
+    """Persist actinia responses and profile the jobs that just finished"""
+    transitions = ProcessingResponseModel.objects.record(responses, **kwargs)
+    finished = {resource_id for resource_id, _, status in transitions if status == 'finished'}
+    for response in responses:
+        if response.get('resource_id') in finished:
+            ModuleTiming.objects.record_process_log(response.get('process_log'))
+            exports = (response.get('urls') or {}).get('resources') or []
+            if any(cog.isGeoTiff(url) for url in exports):
+                # The other stages read the rewritten files, so they are queued once it is done
+                cogPostprocess.delay(response['user_id'], response['resource_id'])
+            elif exports:
+                processResults(response['user_id'], response['resource_id'], geotiffs=False)
+    return transitions
+
+
+def processResults(user_id, resource_id, geotiffs=True):
+    """Queue the post-processing stages of the results of a finished job"""
+    deduplicateResource.delay(user_id, resource_id)
+    if geotiffs:
+        terracottaIngest.delay(user_id, resource_id)
+        stacIndexResource.delay(user_id, resource_id)
+        if settings.GCS_UPLOAD['UPLOAD_EXPORTS']:
+            uploadResourceToGCS.delay(user_id, resource_id)
+
+
+# Seconds a queued status poll holds its lease, in case the task dies before releasing it
+POLL_LEASE_SECONDS = 30
+
+# Retries of a task rejected by an open actinia circuit, each waits for the circuit's Retry-After
+ACTINIA_UNAVAILABLE_RETRIES = 10
+
+
+def pollLease(message_type, resource_id):
+    return f"poll_lease_{message_type}_{resource_id}"
+
+
+def pollResourceStatus(user_id, resource_id, message_type="resource_message"):
+    """
+    Queue a status poll of a resource unless one is already queued.
+    Every consumer watching the resource asks after each update, the one that
+    takes the lease in the shared cache queues the task and the rest do nothing,
+    so polling cost doesn't grow with the number of viewers.
+    """
+    if not cache.add(pollLease(message_type, resource_id), 1, POLL_LEASE_SECONDS):
+        return False
+    asyncResourceStatus.delay(user_id, resource_id, message_type)
+    return True
+
+
+def pollModelResourceStatus(model_id, user_id, resource_id, message_type="model_setup"):
+    """Queue a status poll of a model's resource unless one is already queued"""
+    if not cache.add(pollLease(message_type, resource_id), 1, POLL_LEASE_SECONDS):
+        return False
+    asyncModelUpdateResourceStatus.delay(model_id, user_id, resource_id, message_type)
+    return True
+
+
+@shared_task(bind=True, max_retries=ACTINIA_UNAVAILABLE_RETRIES)
+def asyncResourceStatus(self, user_id, resource_id, message_type="resource_message"):
     print(f"asyncResourceStatus: starting task {user_id}, {resource_id}")
     url = f"{acp.baseUrl()}/resources/{user_id}/{resource_id}"
-    r = requests.get(url, auth=acp.auth())
-    data = r.json()
-    print(f"asyncResourceStatus: {r.status_code}")
+    try:
+        r = acp.session().get(url)
+        data = r.json()
+        print(f"asyncResourceStatus: {r.status_code}")
+        recordResponses([data])
+    except ActiniaUnavailable as e:
+        # Keep the poll chain alive, the consumers only poll again after an update
+        raise self.retry(exc=e, countdown=e.retry_after)
+    finally:
+        # Release before notifying, the consumers' next poll request must be able to take it
+        cache.delete(pollLease(message_type, resource_id))
     print(r)
     channel_layer = get_channel_layer()
     resource_name = resource_id.replace('-', '_')
@@ -73,7 +153,7 @@ def asyncResourceStatus(user_id, resource_id, message_type="resource_message"):
             "process_log": process_log
         }
 
-        return async_to_sync(channel_layer.group_send)(resource_group, response_message)
+        return async_to_sync(channel_layer.group_send)(resource_group, tracing.stamp(response_message))
 
     if r.status_code == 400:
 
@@ -83,16 +163,22 @@ def asyncResourceStatus(user_id, resource_id, message_type="resource_message"):
             "resource_id": resource_id
         }
 
-        return async_to_sync(channel_layer.group_send)(resource_group, response_message)
+        return async_to_sync(channel_layer.group_send)(resource_group, tracing.stamp(response_message))
 
 
-@shared_task()
-def asyncModelUpdateResourceStatus(model_id, user_id, resource_id, message_type="model_setup"):
+@shared_task(bind=True, max_retries=ACTINIA_UNAVAILABLE_RETRIES)
+def asyncModelUpdateResourceStatus(self, model_id, user_id, resource_id, message_type="model_setup"):
     print(f"asyncModelUpdateResourceStatus: starting task {user_id}, {resource_id}, {message_type}")
     url = f"{acp.baseUrl()}/resources/{user_id}/{resource_id}"
-    r = requests.get(url, auth=acp.auth())
-    data = r.json()
-    print(f"asyncModelUpdateResourceStatus: {r.status_code}")
+    try:
+        r = acp.session().get(url)
+        data = r.json()
+        print(f"asyncModelUpdateResourceStatus: {r.status_code}")
+        recordResponses([data])
+    except ActiniaUnavailable as e:
+        raise self.retry(exc=e, countdown=e.retry_after)
+    finally:
+        cache.delete(pollLease(message_type, resource_id))
     if r.status_code == 200:
         channel_layer = get_channel_layer()
         resource_name = resource_id.replace('-', '_')
@@ -116,6 +202,7 @@ def asyncModelUpdateResourceStatus(model_id, user_id, resource_id, message_type=
             message = data['message']
 
         resource_group = f"savana_{resource_name}"
+        model_group = f"savana_model_{model_id}"
 
         response_message = {
             "model_id": model_id,
@@ -129,35 +216,199 @@ def asyncModelUpdateResourceStatus(model_id, user_id, resource_id, message_type=
             "active_message": message
         }
 
-        return async_to_sync(channel_layer.group_send)(resource_group, response_message)
+        # Multiplexed sockets can follow a model without knowing its resource id
+        async_to_sync(channel_layer.group_send)(model_group, tracing.stamp(response_message))
+        return async_to_sync(channel_layer.group_send)(resource_group, tracing.stamp(response_message))
 
 
-@shared_task()
-def ingestData(modelId, location, geoids):
+@shared_task(bind=True, max_retries=ACTINIA_UNAVAILABLE_RETRIES)
+def ingestData(self, modelId, location, geoids):
     print("Starting Ingest")
     url = f"{acp.baseUrl()}/locations/{location}/mapsets/PERMANENT/processing_async"
     # mapset = location
 
-    # Get Process Chain Template for FUTURES
-    r = requests.get(
-        f"{acp.baseUrl()}/actinia_templates/b9514dee-253e-47d9-bb5c-c65bc1a035ac",
-        auth=acp.auth(),
-        headers={"content-type": "application/json; charset=utf-8"}
-    )
-
-    # Set the geoids in the process chain
-    template_pc = r.json()['template']
-    template_pc['list'][1]['inputs'][2]['value'] = geoids
-    pc = template_pc
-
-    # Run the process chain
-    r = requests.post(
-        url,
-        auth=acp.auth(),
-        json=pc,
-        headers={"content-type": "application/json; charset=utf-8"}
-    )
+    try:
+        # Get Process Chain Template for FUTURES
+        r = acp.session().get(
+            f"{acp.baseUrl()}/actinia_templates/b9514dee-253e-47d9-bb5c-c65bc1a035ac",
+            headers={"content-type": "application/json; charset=utf-8"}
+        )
+
+        # Set the geoids in the process chain
+        template_pc = r.json()['template']
+        template_pc['list'][1]['inputs'][2]['value'] = geoids
+        pc = template_pc
+
+        # Run the process chain
+        r = acp.session().post(
+            url,
+            json=pc,
+            headers={"content-type": "application/json; charset=utf-8"}
+        )
+    except ActiniaUnavailable as e:
+        raise self.retry(exc=e, countdown=e.retry_after)
 
     jsonResponse = r.json()
     print(jsonResponse)
-    asyncModelUpdateResourceStatus.delay(modelId, jsonResponse['user_id'], jsonResponse['resource_id'], message_type="model_setup")
+    recordResponses([jsonResponse], model_id=modelId)
+    tracing.rememberJob(jsonResponse['resource_id'])
+    pollModelResourceStatus(modelId, jsonResponse['user_id'], jsonResponse['resource_id'], message_type="model_setup")
+
+
+@shared_task()
+def syncActiveResources():
+    """Refresh all unfinished jobs with a single actinia request per user"""
+    active = ProcessingResponseModel.objects.filter(status__in=['accepted', 'running'])
+    user_ids = set(active.values_list('user_id', flat=True))
+    for user_id in user_ids:
+        resource_ids = set(active.filter(user_id=user_id).values_list('resource_id', flat=True))
+        try:
+            r = acp.session().get(f"{acp.baseUrl()}/resources/{user_id}")
+        except ActiniaUnavailable as e:
+            # The next beat picks these jobs up again
+            print(f"syncActiveResources: {user_id} skipped, {e}")
+            continue
+        print(f"syncActiveResources: {user_id} {r.status_code}")
+        if r.status_code == 200:
+            responses = [
+                response for response in r.json().get('resource_list', [])
+                if response.get('resource_id') in resource_ids
+            ]
+            recordResponses(responses)
+
+
+@shared_task()
+def checkActiniaNodes():
+    """Health check the actinia node pool so requests are only routed to live nodes"""
+    if nodes.isPool():
+        nodes.checkHealth()
+
+
+@shared_task()
+def terracottaIngest(user_id, resource_id, scenario='base'):
+    """
+    Optimize the GeoTIFFs exported by a finished actinia job to COGs and
+    ingest them into terracotta under (model, scenario, layer, time, resource)
+    """
+    response = ProcessingResponseModel.objects.get(resource_id=resource_id)
+    model = str(response.model_id) if response.model_id is not None else 'none'
+    accepted = response.accept_datetime[:10].replace('-', '') or response.created.strftime('%Y%m%d')
+    ingested = []
+    for url in response.urls.get('resources', []):
+        if not cog.isGeoTiff(url):
+            continue
+        path = acp.resourcePath(user_id, resource_id, url)
+        print(f"terracottaIngest: optimizing {path}")
+        cog_path = tcp.optimizeRaster(user_id, resource_id, path)
+        layer = os.path.splitext(os.path.basename(cog_path))[0]
+        keys = [model, scenario, layer, accepted, resource_id]
+        metadata = tcp.ingestRaster(keys, cog_path)
+        print(f"terracottaIngest: ingested {keys} range {metadata['range']}")
+        ingested.append(keys)
+    return ingested
+
+
+@shared_task()
+def stacIndexResource(user_id, resource_id):
+    """Index the GeoTIFFs exported by a finished actinia job as STAC items"""
+    response = ProcessingResponseModel.objects.get(resource_id=resource_id)
+    accepted = datetime.fromtimestamp(float(response.accept_timestamp), tz=timezone.utc) \
+        if response.accept_timestamp is not None else response.created
+    items = []
+    for url in response.urls.get('resources', []):
+        if not cog.isGeoTiff(url):
+            continue
+        path = acp.resourcePath(user_id, resource_id, url)
+        rst = GDALRaster(path, write=False)
+        footprint = Polygon.from_bbox(rst.extent)
+        footprint.transform(CoordTransform(rst.srs, SpatialReference(4326)))
+        footprint.srid = 4326
+        layer = os.path.splitext(os.path.basename(path))[0]
+        item = {
+            'id': f"{resource_id}_{layer}",
+            'geometry': json.loads(footprint.geojson),
+            'properties': {
+                'datetime': accepted.isoformat(),
+                'user_id': user_id,
+                'resource_id': resource_id,
+                'model_id': response.model_id,
+                'proj:epsg': rst.srs.srid,
+                'proj:shape': [rst.height, rst.width],
+            },
+            'assets': {
+                'data': {
+                    'href': url,
+                    'type': 'image/tiff; application=geotiff',
+                    'title': os.path.basename(path),
+                    'roles': ['data']
+                }
+            }
+        }
+        StacItem.objects.upsert('actinia-exports', item, resource=response)
+        items.append(item['id'])
+    print(f"stacIndexResource: indexed {items}")
+    return items
+
+
+@shared_task()
+def uploadResourceToGCS(user_id, resource_id):
+    """Upload the GeoTIFFs exported by a finished actinia job to the project bucket"""
+    response = ProcessingResponseModel.objects.get(resource_id=resource_id)
+    uploaded = []
+    for url in response.urls.get('resources', []):
+        if not cog.isGeoTiff(url):
+            continue
+        path = acp.resourcePath(user_id, resource_id, url)
+        blob = gcs.uploadFile(path, f"actinia_results/{user_id}/{resource_id}/{os.path.basename(path)}", content_type=COG_CONTENT_TYPE)
+        uploaded.append(blob.public_url)
+    return uploaded
+
+
+@shared_task()
+def deduplicateResource(user_id, resource_id):
+    """Replace result files identical to already stored ones with hard links"""
+    response = ProcessingResponseModel.objects.get(resource_id=resource_id)
+    saved = 0
+    for url in response.urls.get('resources', []):
+        path = acp.resourcePath(user_id, resource_id, url)
+        if not os.path.isfile(path):
+            continue
+        blob, deduplicated = ResultBlob.objects.store(path, response=response)
+        if deduplicated:
+            saved += blob.size
+    print(f"deduplicateResource: {resource_id} saved {saved} bytes")
+    return saved
+
+
+@shared_task()
+def collectResultBlobs():
+    """Remove stored results that no job references anymore"""
+    references, blobs = ResultBlob.objects.collect(settings.RESULT_STORE['GC_GRACE_SECONDS'])
+    print(f"collectResultBlobs: dropped {references} references, removed {blobs} blobs")
+    return references, blobs
+
+
+@shared_task()
+def cogPostprocess(user_id, resource_id):
+    """
+    Rewrite exported GeoTIFFs that actinia returned stripped, untiled or
+    without overviews as COGs, then queue the remaining result processing.
+    A file that can't be rewritten is logged and left as it is, it doesn't
+    hold back the results of the others.
+    """
+    rewritten = []
+    try:
+        response = ProcessingResponseModel.objects.get(resource_id=resource_id)
+        for url in response.urls.get('resources', []):
+            if not cog.isGeoTiff(url):
+                continue
+            path = acp.resourcePath(user_id, resource_id, url)
+            try:
+                if cog.ensureCog(path):
+                    rewritten.append(os.path.basename(path))
+            except Exception as e:
+                print(f"cogPostprocess: {resource_id} could not rewrite {path}: {e}")
+        print(f"cogPostprocess: {resource_id} rewrote {rewritten}")
+    finally:
+        processResults(user_id, resource_id)
+    return rewritten
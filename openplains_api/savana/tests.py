@@ -1,3 +1,806 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
 
-# Create your tests here.
+from .utils.events import diff_event
+from .utils.profiler import bucket_index, empty_histogram, histogram_quantile, parse_process_log
+from .utils.stac import parseBbox, parseDatetimeInterval
+from .utils import gcs
+from .utils import cas
+from .utils import actinia as acp
+from .utils import nodes
+from .utils import breaker
+from .middleware import ActiniaUnavailableMiddleware, MetricsMiddleware
+from .utils import metrics
+from .utils import tracing
+from .utils import sampler
+from .utils import terracotta as tcp
+from .utils import cog
+from opentelemetry.sdk.trace import TracerProvider
+from prometheus_client import REGISTRY
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.http import Http404
+from .views import exportMetrics
+from . import views
+from django.urls import resolve, reverse
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+from .models import OpenPlainsModel, ProcessingResponseModel
+from .utils.zonal import rasterizeRings, ZoneStats
+from . import tasks
+from celery.exceptions import Retry
+from . import consumers
+from asgiref.sync import async_to_sync
+import threading
+import numpy as np
+import httpx
+import requests
+
+
+class DiffEventTests(SimpleTestCase):
+
+    def setUp(self):
+        self.event = {
+            'type': 'model_setup',
+            'resource_id': 'resource_id-1',
+            'status': 'running',
+            'progress': {'step': 1, 'num_of_steps': 3},
+            'process_log': [{'id': 'r.import'}]
+        }
+
+    def test_first_event_is_sent_in_full(self):
+        delta = diff_event(None, self.event)
+        self.assertFalse(delta['delta'])
+        self.assertEqual(delta['process_log'], self.event['process_log'])
+
+    def test_unchanged_event_is_dropped(self):
+        self.assertIsNone(diff_event(self.event, dict(self.event)))
+
+    def test_only_new_log_entries_and_changed_fields_are_sent(self):
+        current = dict(
+            self.event,
+            progress={'step': 2, 'num_of_steps': 3},
+            process_log=[{'id': 'r.import'}, {'id': 'r.watershed'}]
+        )
+        delta = diff_event(self.event, current)
+        self.assertTrue(delta['delta'])
+        self.assertEqual(delta['progress'], {'step': 2, 'num_of_steps': 3})
+        self.assertEqual(delta['process_log'], [{'id': 'r.watershed'}])
+        self.assertEqual(delta['process_log_offset'], 1)
+        self.assertNotIn('status', delta)
+
+    def test_rewritten_log_is_resent(self):
+        current = dict(self.event, process_log=[{'id': 'g.region'}])
+        delta = diff_event(self.event, current)
+        self.assertEqual(delta['process_log'], [{'id': 'g.region'}])
+        self.assertEqual(delta['process_log_offset'], 0)
+
+    def test_event_without_a_log_keeps_the_clients_log(self):
+        current = {'type': 'model_setup', 'resource_id': 'resource_id-1', 'status': 'finished'}
+        delta = diff_event(self.event, current)
+        self.assertEqual(delta['status'], 'finished')
+        self.assertNotIn('process_log', delta)
+        self.assertNotIn('process_log_offset', delta)
+
+
+class ProfilerTests(SimpleTestCase):
+
+    def test_parse_process_log_skips_entries_without_run_time(self):
+        process_log = [
+            {'executable': 'r.import', 'id': 'r.import_nlcd_2001_cog', 'run_time': 4.5},
+            {'executable': 'r.watershed', 'id': 'r.watershed_usgs_3dep_30', 'run_time': 61},
+            {'executable': 'r.mask', 'id': 'r.mask'}
+        ]
+        self.assertEqual(parse_process_log(process_log), [('r.import', 4.5), ('r.watershed', 61.0)])
+
+    def test_histogram_quantile(self):
+        buckets = empty_histogram()
+        for run_time in [0.05, 0.3, 2, 2, 45]:
+            buckets[bucket_index(run_time)] += 1
+        self.assertEqual(histogram_quantile(buckets, 0.5), 5)
+        self.assertEqual(histogram_quantile(buckets, 1), 60)
+        self.assertIsNone(histogram_quantile(empty_histogram(), 0.5))
+
+    def test_histogram_quantile_overflow_is_json_safe(self):
+        buckets = empty_histogram()
+        buckets[bucket_index(7200)] = 3
+        self.assertIsNone(histogram_quantile(buckets, 0.95))
+        self.assertEqual(histogram_quantile(buckets, 0.95, overflow=7200.0), 7200.0)
+
+
+class StacParamTests(SimpleTestCase):
+
+    def test_parse_bbox(self):
+        self.assertEqual(parseBbox('-79,35.5,-78.5,36'), (-79, 35.5, -78.5, 36))
+        self.assertEqual(parseBbox([-79, 35.5, 0, -78.5, 36, 100]), (-79, 35.5, -78.5, 36))
+        with self.assertRaises(ValueError):
+            parseBbox('-78.5,35.5,-79,36')
+
+    def test_parse_datetime_interval(self):
+        start, end = parseDatetimeInterval('2004-01-01T00:00:00Z')
+        self.assertEqual(start, end)
+        start, end = parseDatetimeInterval('../2011-01-01T00:00:00Z')
+        self.assertIsNone(start)
+        self.assertEqual(end.year, 2011)
+        with self.assertRaises(ValueError):
+            parseDatetimeInterval('../..')
+        with self.assertRaises(ValueError):
+            parseDatetimeInterval('2019-01-01T00:00:00Z/2001-01-01T00:00:00Z')
+
+
+class StacSearchTests(APITestCase):
+
+    def test_invalid_intersects_geometry_is_a_bad_request(self):
+        response = self.client.post(
+            reverse('savana:stac-search'), {'intersects': {'type': 'Polygon', 'coordinates': [[[0, 0], [1, 1]]]}}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class ZonalStatsRasterTests(SimpleTestCase):
+
+    def get_raster(self, url):
+        return views.ModelZonalStats().get_raster({'url': url})
+
+    def test_project_cogs_are_read_over_vsicurl(self):
+        self.assertEqual(
+            self.get_raster('https://storage.googleapis.com/tomorrownow-actinia-dev/dem/dem_10m.tif'),
+            '/vsicurl/https://storage.googleapis.com/tomorrownow-actinia-dev/dem/dem_10m.tif'
+        )
+
+    def test_urls_leaving_the_bucket_are_rejected(self):
+        for url in (
+            'https://storage.googleapis.com/tomorrownow-actinia-dev/../other-bucket/secret.tif',
+            'https://storage.googleapis.com/tomorrownow-actinia-dev/%2e%2e/other-bucket/secret.tif',
+            'https://storage.googleapis.com/tomorrownow-actinia-dev-other/dem.tif',
+            'https://storage.googleapis.com.evil.example/tomorrownow-actinia-dev/dem.tif',
+            'http://storage.googleapis.com/tomorrownow-actinia-dev/dem.tif',
+        ):
+            self.assertIsNone(self.get_raster(url), url)
+
+
+class GCSUploadTests(SimpleTestCase):
+
+    def test_part_ranges_cover_file(self):
+        ranges = gcs.partRanges(10, 4)
+        self.assertEqual(ranges, [(0, 4), (4, 4), (8, 2)])
+        self.assertEqual(gcs.partRanges(0, 4), [(0, 0)])
+
+    def test_part_ranges_grow_to_max_parts(self):
+        ranges = gcs.partRanges(1000, 1, max_parts=10)
+        self.assertEqual(len(ranges), 10)
+        self.assertEqual(sum(length for _, length in ranges), 1000)
+
+    @unittest.skipUnless(os.environ.get('STORAGE_EMULATOR_HOST'), "Needs a fake GCS server, see the fake-gcs compose service")
+    def test_parallel_upload_matches_local_checksum(self):
+        upload_settings = {'CHUNK_SIZE': 256 * 1024, 'PART_SIZE': 256 * 1024, 'PARALLEL_THRESHOLD': 512 * 1024, 'CONCURRENCY': 4}
+        with tempfile.NamedTemporaryFile(suffix='.tif') as f, mock.patch.dict(gcs.GCS_UPLOAD_SETTINGS, upload_settings):
+            f.write(os.urandom(3 * 1024 * 1024 + 17))
+            f.flush()
+            bucket = gcs.client().bucket('savana-test')
+            if not bucket.exists():
+                bucket.create()
+            blob = gcs.uploadFile(f.name, 'actinia_results/test.tif', bucket_name='savana-test')
+            self.assertEqual(blob.size, os.path.getsize(f.name))
+            self.assertEqual(blob.crc32c, gcs.fileCrc32c(f.name))
+            self.assertEqual(list(bucket.list_blobs(prefix='actinia_results/test.tif.parts/')), [])
+
+
+class ResultStoreTests(SimpleTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, '.cas')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_identical_results_share_one_copy(self):
+        first = self.write('first.tif', b'raster bytes')
+        second = self.write('second.tif', b'raster bytes')
+        digest, size, deduplicated = cas.ingest(first, self.root)
+        self.assertFalse(deduplicated)
+        self.assertEqual(cas.ingest(second, self.root), (digest, size, True))
+        self.assertTrue(os.path.samefile(first, second))
+        self.assertEqual(os.stat(cas.blobPath(digest, self.root)).st_nlink, 3)
+
+    def test_remove_keeps_linked_blobs(self):
+        path = self.write('result.tif', b'raster bytes')
+        digest, _, _ = cas.ingest(path, self.root)
+        self.assertFalse(cas.remove(digest, self.root))
+        os.remove(path)
+        self.assertTrue(cas.remove(digest, self.root))
+        self.assertFalse(os.path.exists(cas.blobPath(digest, self.root)))
+
+
+class ZonalStatsTests(SimpleTestCase):
+
+    def square(self, x0, y0, x1, y1):
+        return np.array([[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]], dtype=float)
+
+    def test_rasterize_square_with_hole(self):
+        mask = rasterizeRings([self.square(0, 0, 6, 6), self.square(2, 2, 4, 4)], 6, 6)
+        self.assertEqual(mask.sum(), 32)
+        self.assertFalse(mask[2:4, 2:4].any())
+
+    def test_rasterize_strips_match_whole_window(self):
+        triangle = np.array([[0.2, 0.1], [9.7, 2.3], [4.1, 8.8], [0.2, 0.1]])
+        whole = rasterizeRings([triangle], 10, 10)
+        strips = np.vstack([rasterizeRings([triangle], min(3, 10 - row), 10, row) for row in range(0, 10, 3)])
+        np.testing.assert_array_equal(whole, strips)
+
+    def test_zone_stats(self):
+        stats = ZoneStats(categorical=True)
+        stats.add(np.array([41, 41, 82]))
+        stats.add(np.array([], dtype=int))
+        stats.add(np.array([82]))
+        result = stats.result(pixel_area=900)
+        self.assertEqual(result['count'], 4)
+        self.assertEqual(result['area'], 3600)
+        self.assertEqual(result['mean'], 61.5)
+        self.assertEqual(result['std'], 20.5)
+        self.assertEqual(result['classes'], {'41': 2, '82': 2})
+
+    def test_export_path_rejects_traversal(self):
+        resource_id = 'resource_id-0b0f1f4e-7a51-4c39-9d63-3b6c9d1e2f40'
+        self.assertEqual(
+            acp.exportPath('actinia-gdi', resource_id, 'elevation.tif'),
+            f"/actinia_core/resources/actinia-gdi/{resource_id}/elevation.tif"
+        )
+        self.assertIsNone(acp.exportPath('actinia-gdi', '../../..', 'passwd'))
+        self.assertIsNone(acp.exportPath('actinia-gdi', resource_id, '..'))
+
+
+class TerracottaIngestTests(TestCase):
+
+    def test_same_layer_from_two_jobs_is_kept_apart(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        data = mock.patch.dict(tcp.TERRACOTTA_SETTINGS, {'TERRACOTTA_DATA': tmp.name})
+        data.start()
+        self.addCleanup(data.stop)
+        ingested = []
+        for resource_id in ('resource_id-1', 'resource_id-2'):
+            ProcessingResponseModel.objects.create(
+                resource_id=resource_id, status='finished', user_id='actinia-gdi',
+                accept_datetime='2026-10-19 12:00:00', urls={'resources': [f"http://actinia/{resource_id}/elevation.tif"]}
+            )
+            with mock.patch.object(tcp.subprocess, 'run'), \
+                    mock.patch.object(tcp, 'ingestRaster', return_value={'range': [0, 1]}) as ingest:
+                tasks.terracottaIngest('actinia-gdi', resource_id)
+            ingested.append(ingest.call_args[0])
+        (keys_1, path_1), (keys_2, path_2) = ingested
+        self.assertNotEqual(keys_1, keys_2)
+        self.assertNotEqual(path_1, path_2)
+        self.assertEqual(path_2, os.path.join(tmp.name, 'actinia-gdi', 'resource_id-2', 'elevation.tif'))
+
+
+class CogPostprocessTests(TestCase):
+
+    def test_a_broken_geotiff_does_not_hold_back_the_others(self):
+        ProcessingResponseModel.objects.create(
+            resource_id='resource_id-1', status='finished', user_id='actinia-gdi',
+            urls={'resources': ['http://actinia/broken.tif', 'http://actinia/elevation.tif']}
+        )
+        with mock.patch.object(cog, 'ensureCog', side_effect=[RuntimeError('corrupt'), True]), \
+                mock.patch.object(tasks, 'processResults') as process:
+            rewritten = tasks.cogPostprocess('actinia-gdi', 'resource_id-1')
+        self.assertEqual(rewritten, ['elevation.tif'])
+        process.assert_called_once_with('actinia-gdi', 'resource_id-1')
+
+
+class TerracottaLockTests(SimpleTestCase):
+
+    def test_ingests_take_turns_on_the_database(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        db = mock.patch.dict(tcp.TERRACOTTA_SETTINGS, {'TERRACOTTA_DB': os.path.join(tmp.name, 'tc', 'terracotta.sqlite')})
+        db.start()
+        self.addCleanup(db.stop)
+        order = []
+
+        def ingest():
+            with tcp.databaseLock():
+                order.append('second')
+
+        with tcp.databaseLock():
+            waiting = threading.Thread(target=ingest)
+            waiting.start()
+            waiting.join(0.2)
+            order.append('first')
+        waiting.join()
+        self.assertEqual(order, ['first', 'second'])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PollLeaseTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_one_poll_per_round_for_many_viewers(self):
+        with mock.patch.object(tasks.asyncResourceStatus, 'delay') as delay:
+            queued = [tasks.pollResourceStatus('actinia-gdi', 'resource_id-1') for _ in range(30)]
+        self.assertEqual(queued.count(True), 1)
+        delay.assert_called_once_with('actinia-gdi', 'resource_id-1', 'resource_message')
+
+    def test_released_lease_allows_next_poll(self):
+        with mock.patch.object(tasks.asyncResourceStatus, 'delay') as delay:
+            tasks.pollResourceStatus('actinia-gdi', 'resource_id-1')
+            cache.delete(tasks.pollLease('resource_message', 'resource_id-1'))
+            tasks.pollResourceStatus('actinia-gdi', 'resource_id-1')
+            tasks.pollResourceStatus('actinia-gdi', 'resource_id-2')
+        self.assertEqual(delay.call_count, 3)
+
+    def test_open_circuit_retries_and_releases_lease(self):
+        with mock.patch.object(tasks.asyncResourceStatus, 'delay'):
+            tasks.pollResourceStatus('actinia-gdi', 'resource_id-1')
+        unavailable = breaker.ActiniaUnavailable('actinia:8088', 'GET /resources/*/*', 7)
+        with mock.patch.object(acp, 'session') as session, \
+                mock.patch.object(tasks.asyncResourceStatus, 'retry', side_effect=Retry()) as retry:
+            session.return_value.get.side_effect = unavailable
+            with self.assertRaises(Retry):
+                tasks.asyncResourceStatus('actinia-gdi', 'resource_id-1')
+        retry.assert_called_once_with(exc=unavailable, countdown=7)
+        self.assertIsNone(cache.get(tasks.pollLease('resource_message', 'resource_id-1')))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ActiniaTokenAuthTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        acp._local_token.clear()
+
+    def token_response(self, token='abc.def'):
+        return mock.Mock(status_code=200, json=mock.Mock(return_value={'status': 'success', 'token': token}))
+
+    def prepared(self):
+        return requests.Request('GET', 'http://actinia/api/v3/locations').prepare()
+
+    def test_token_is_requested_once_and_sent_as_basic_username(self):
+        with mock.patch.object(acp.requests, 'get', return_value=self.token_response()) as get:
+            for _ in range(3):
+                r = acp.auth()(self.prepared())
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(r.headers['Authorization'], acp.basicHeader('abc.def'))
+
+    def test_token_is_refreshed_before_expiry(self):
+        margin = acp.ACTINIA_SETTINGS['ACTINIA_TOKEN_REFRESH_MARGIN']
+        cache.set(acp.TOKEN_CACHE_KEY, ('old', time.time() + margin - 1), 60)
+        with mock.patch.object(acp.requests, 'get', return_value=self.token_response('new')):
+            r = acp.auth()(self.prepared())
+        self.assertEqual(r.headers['Authorization'], acp.basicHeader('new'))
+
+    def test_failed_token_request_falls_back_to_password(self):
+        failed = mock.Mock(status_code=401, json=mock.Mock(return_value={'status': 'error'}))
+        with mock.patch.object(acp.requests, 'get', return_value=failed) as get:
+            acp.auth()(self.prepared())
+            r = acp.auth()(self.prepared())
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(r.headers['Authorization'], acp.passwordHeader())
+
+    def test_async_flow_fetches_token_and_retries_rejected_token_with_password(self):
+        flow = acp.asyncAuth().auth_flow(httpx.Request('GET', 'http://actinia/api/v3/locations'))
+        token_request = next(flow)
+        self.assertTrue(token_request.url.path.endswith('/token'))
+        request = flow.send(httpx.Response(200, json={'status': 'success', 'token': 'abc.def'}))
+        self.assertEqual(request.headers['Authorization'], acp.basicHeader('abc.def'))
+        request = flow.send(httpx.Response(401))
+        self.assertEqual(request.headers['Authorization'], acp.passwordHeader())
+        self.assertIsNone(cache.get(acp.TOKEN_CACHE_KEY))
+
+    def test_token_is_served_from_process_memory(self):
+        acp.storeToken(200, {'token': 'abc.def'})
+        with mock.patch.object(acp.cache, 'get') as get:
+            flow = acp.asyncAuth().auth_flow(httpx.Request('GET', 'http://actinia/api/v3/locations'))
+            request = next(flow)
+        self.assertEqual(request.headers['Authorization'], acp.basicHeader('abc.def'))
+        get.assert_not_called()
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class NodeRoutingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        nodes.forgetState()
+        pool = mock.patch.dict(nodes.ACTINIA_SETTINGS, {
+            'ACTINIA_BASEURL': 'actinia:8088',
+            'ACTINIA_NODES': ['actinia-1:8088', 'actinia-2:8088', 'actinia-3:8088'],
+            'ACTINIA_LOCATION_NODES': {'CONUS': 'actinia-2:8088'},
+        })
+        pool.start()
+        self.addCleanup(pool.stop)
+        self.base = nodes.nodeUrl('actinia:8088')
+
+    def test_mapset_work_sticks_to_one_node(self):
+        routed = {nodes.route(f"{self.base}/locations/nc_spm_08/mapsets/user1/raster_layers") for _ in range(10)}
+        self.assertEqual(len(routed), 1)
+        self.assertEqual(
+            nodes.route(f"{self.base}/locations/CONUS/mapsets/user1/info"),
+            f"{nodes.nodeUrl('actinia-2:8088')}/locations/CONUS/mapsets/user1/info"
+        )
+
+    def test_ephemeral_jobs_go_to_least_loaded_healthy_node(self):
+        cache.set(nodes.loadKey('actinia-1:8088'), 5)
+        cache.set(nodes.HEALTH_KEY, {'actinia-2:8088': False})
+        url = nodes.route(f"{self.base}/locations/CONUS/processing_async_export")
+        self.assertTrue(url.startswith(nodes.nodeUrl('actinia-3:8088')))
+
+    def test_resource_status_follows_job_and_releases_load(self):
+        node = 'actinia-3:8088'
+        nodes.observe(f"{nodes.nodeUrl(node)}/locations/CONUS/processing_async_export", 200, 'POST',
+                      lambda: {'resource_id': 'resource_id-1', 'status': 'accepted'})
+        self.assertEqual(nodes.nodeLoads([node])[node], 1)
+        url = nodes.route(f"{self.base}/resources/actinia-gdi/resource_id-1")
+        self.assertEqual(url, f"{nodes.nodeUrl(node)}/resources/actinia-gdi/resource_id-1")
+        finished = {'resource_id': 'resource_id-1', 'status': 'finished'}
+        for _ in range(2):
+            nodes.observe(url, 200, 'GET', lambda: finished)
+        self.assertEqual(nodes.nodeLoads([node])[node], 0)
+
+    def test_routing_reads_node_state_from_process_memory(self):
+        nodes.route(f"{self.base}/locations/CONUS/processing_async_export")
+        with mock.patch.object(nodes, 'cache') as shared:
+            for _ in range(10):
+                nodes.route(f"{self.base}/locations/CONUS/processing_async_export")
+        shared.get.assert_not_called()
+        shared.get_many.assert_not_called()
+
+    def test_single_node_urls_are_unchanged(self):
+        with mock.patch.dict(nodes.ACTINIA_SETTINGS, {'ACTINIA_NODES': ['actinia:8088']}):
+            url = f"{self.base}/locations/CONUS/processing_async_export"
+            self.assertEqual(nodes.route(url), url)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        tuning = mock.patch.dict(breaker.ACTINIA_SETTINGS, {
+            'ACTINIA_TIMEOUT': 30.0,
+            'ACTINIA_TIMEOUT_MIN': 2.0,
+            'ACTINIA_TIMEOUT_MAX': 120.0,
+            'ACTINIA_TIMEOUT_PERCENTILE': 0.99,
+            'ACTINIA_TIMEOUT_MULTIPLIER': 3.0,
+            'ACTINIA_BREAKER_THRESHOLD': 3,
+            'ACTINIA_BREAKER_RESET': 30,
+        })
+        tuning.start()
+        self.addCleanup(tuning.stop)
+
+    def test_route_key_groups_names_and_ids(self):
+        self.assertEqual(
+            breaker.routeKey('GET', 'http://actinia:8088/api/v3/locations/CONUS/mapsets/user1/raster_layers/dem/info'),
+            'GET /locations/*/mapsets/*/raster_layers/*/info'
+        )
+        self.assertEqual(
+            breaker.routeKey('GET', 'http://actinia:8088/api/v3/resources/actinia-gdi/resource_id-1'),
+            'GET /resources/*/*'
+        )
+
+    def test_timeout_adapts_to_latency_percentile(self):
+        latency = breaker.RouteLatency()
+        self.assertEqual(latency.timeout(), 30.0)
+        for _ in range(breaker.MIN_SAMPLES):
+            latency.record(1.5)
+        self.assertEqual(latency.timeout(), 4.5)
+        latency.record(100.0)
+        self.assertEqual(latency.timeout(), 120.0)
+
+    def test_circuit_opens_fails_fast_and_probes_half_open(self):
+        circuit = breaker.CircuitBreaker('actinia:8088')
+        for _ in range(3):
+            circuit.admit('GET /locations')
+            circuit.failure()
+        with self.assertRaises(breaker.ActiniaUnavailable):
+            circuit.admit('GET /locations')
+        with mock.patch.object(breaker.time, 'monotonic', return_value=time.monotonic() + 31):
+            circuit.admit('GET /locations')
+            with self.assertRaises(breaker.ActiniaUnavailable):
+                circuit.admit('GET /locations')
+            circuit.success()
+            circuit.admit('GET /locations')
+        self.assertEqual(circuit.state, breaker.CircuitBreaker.CLOSED)
+
+    def test_failed_probe_reopens_circuit(self):
+        circuit = breaker.CircuitBreaker('actinia:8088')
+        circuit.state = breaker.CircuitBreaker.HALF_OPEN
+        circuit.admit('GET /locations')
+        circuit.failure()
+        self.assertEqual(circuit.state, breaker.CircuitBreaker.OPEN)
+
+    def test_interrupted_probe_does_not_block_the_circuit(self):
+        circuit = breaker.breakerFor('actinia-probe:8088')
+        self.addCleanup(breaker._breakers.pop, 'actinia-probe:8088')
+        circuit.state = breaker.CircuitBreaker.HALF_OPEN
+        request = requests.Request('GET', 'http://actinia-probe:8088/api/v3/locations').prepare()
+        with mock.patch.object(breaker.HTTPAdapter, 'send', side_effect=ValueError('bad json')):
+            with self.assertRaises(ValueError):
+                breaker.BreakerAdapter().send(request)
+        circuit.admit('GET /locations')
+        self.assertTrue(circuit.probing)
+
+    def test_middleware_returns_structured_503(self):
+        middleware = ActiniaUnavailableMiddleware(lambda request: None)
+        error = breaker.ActiniaUnavailable('actinia:8088', 'GET /locations', 12)
+        response = middleware.process_exception(None, error)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '12')
+        self.assertEqual(json.loads(response.content)['error'], 'actinia_unavailable')
+
+
+class MetricsTests(SimpleTestCase):
+    def sample(self, name, labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_cache_results_are_counted(self):
+        before = self.sample('savana_cache_requests_total', {'cache': 'test', 'result': 'hit'})
+        metrics.cacheResult('test', True)
+        self.assertEqual(self.sample('savana_cache_requests_total', {'cache': 'test', 'result': 'hit'}), before + 1)
+
+    def test_group_kind_hides_ids(self):
+        self.assertEqual(metrics.groupKind('savana_model_12'), 'model')
+        self.assertEqual(metrics.groupKind('savana_resource_id_1234'), 'resource')
+
+    def test_middleware_records_latency_per_route(self):
+        request = RequestFactory().get('/savana/ping/')
+        request.resolver_match = mock.Mock(route='savana/ping/')
+        labels = {'method': 'GET', 'route': 'savana/ping/', 'status': '200'}
+        before = self.sample('savana_request_duration_seconds_count', labels)
+        MetricsMiddleware(lambda request: HttpResponse('OK'))(request)
+        self.assertEqual(self.sample('savana_request_duration_seconds_count', labels), before + 1)
+
+    def test_celery_queue_wait_and_run_time(self):
+        headers = {}
+        metrics.stampPublished(headers=headers)
+        task = mock.Mock()
+        task.name = 'savana.tasks.test'
+        task.request.published_at = headers['published_at'] - 2
+        metrics.taskStarted(task_id='task-1', task=task)
+        metrics.taskFinished(task_id='task-1', task=task, state='SUCCESS')
+        self.assertGreaterEqual(self.sample('savana_celery_queue_wait_seconds_sum', {'task': task.name}), 2)
+        self.assertEqual(self.sample('savana_celery_task_duration_seconds_count', {'task': task.name, 'state': 'SUCCESS'}), 1)
+
+
+class RootUrlconfTests(SimpleTestCase):
+
+    def test_root_urlconf_resolves(self):
+        self.assertEqual(reverse('metrics'), '/metrics')
+        self.assertEqual(resolve('/metrics').url_name, 'metrics')
+
+    @override_settings(PROMETHEUS_METRICS_TOKEN='scrape-secret')
+    def test_metrics_need_the_scrape_token(self):
+        factory = RequestFactory()
+        for headers in ({}, {'HTTP_AUTHORIZATION': 'Bearer wrong'}):
+            with self.assertRaises(Http404):
+                exportMetrics(factory.get('/metrics', **headers))
+        response = exportMetrics(factory.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret'))
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, OTEL_ENABLED=True)
+class TracingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.tracer = TracerProvider().get_tracer('savana-tests')
+
+    def test_job_trace_is_continued_by_pollers(self):
+        with self.tracer.start_as_current_span('rDrain') as request_span:
+            tracing.rememberJob('resource_id-1')
+        with mock.patch.object(tracing, 'tracer', self.tracer):
+            with tracing.jobSpan('poll', 'resource_id-1') as span:
+                parent = tracing.traceparent()
+        self.assertEqual(span.context.trace_id, request_span.context.trace_id)
+        self.assertEqual(span.parent.span_id, request_span.context.span_id)
+        self.assertIn(format(request_span.context.trace_id, '032x'), parent)
+
+    def test_event_traceparent_wins_over_job_trace(self):
+        with self.tracer.start_as_current_span('task') as task_span:
+            parent = tracing.traceparent()
+        with mock.patch.object(tracing, 'tracer', self.tracer):
+            with tracing.jobSpan('websocket resource_message', 'resource_id-2', parent) as span:
+                pass
+        self.assertEqual(span.parent.span_id, task_span.context.span_id)
+
+    def test_nothing_is_remembered_without_a_trace(self):
+        tracing.rememberJob('resource_id-3')
+        self.assertIsNone(cache.get(tracing.jobKey('resource_id-3')))
+        self.assertIsNone(tracing.traceparent())
+
+    @override_settings(OTEL_ENABLED=False)
+    def test_disabled_tracing_skips_the_job_lookup(self):
+        with mock.patch.object(tracing, 'cache') as shared:
+            with tracing.jobSpan('websocket resource_message', 'resource_id-4'):
+                pass
+        shared.get.assert_not_called()
+        self.assertNotIn('traceparent', tracing.stamp({'type': 'resource_message'}))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SamplingProfilerTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        tuning = mock.patch.dict(sampler.PROFILER_SETTINGS, {'TOKEN': 'secret', 'MAX_PER_MINUTE': 2})
+        tuning.start()
+        self.addCleanup(tuning.stop)
+        rules = mock.patch.dict(sampler._rules, {'loaded': time.monotonic(), 'rules': [
+            (1, 'request', '/savana/models/*', 1.0),
+            (2, 'task', 'savana.tasks.ingestData', 0.0),
+        ]})
+        rules.start()
+        self.addCleanup(rules.stop)
+        self.factory = RequestFactory()
+
+    def finish(self, session):
+        self.assertIsNotNone(session)
+        session.start()
+        session.stop()
+
+    def test_rules_match_pattern_and_sample_rate(self):
+        self.assertEqual(sampler.pickRule('request', '/savana/models/'), 1)
+        self.assertIsNone(sampler.pickRule('request', '/savana/jobs/'))
+        self.assertIsNone(sampler.pickRule('task', 'savana.tasks.ingestData'))
+
+    def test_header_needs_the_token(self):
+        self.assertTrue(sampler.headerRequested(self.factory.get('/', HTTP_X_PROFILE='secret')))
+        self.assertFalse(sampler.headerRequested(self.factory.get('/', HTTP_X_PROFILE='guess')))
+        with mock.patch.dict(sampler.PROFILER_SETTINGS, {'TOKEN': ''}):
+            self.assertFalse(sampler.headerRequested(self.factory.get('/', HTTP_X_PROFILE='')))
+
+    def test_rate_cap_and_one_profile_per_process(self):
+        request = self.factory.get('/savana/models/')
+        session = sampler.begin('request', request.path, request)
+        self.assertEqual(session.trigger, 'rule')
+        self.assertIsNone(sampler.begin('request', request.path, request))
+        self.finish(session)
+        self.finish(sampler.begin('request', request.path, request))
+        self.assertIsNone(sampler.begin('request', request.path, request))
+
+
+class StreamOptionsTests(SimpleTestCase):
+
+    def configured(self, query_string):
+        consumer = consumers.ActiniaResourceConsumer()
+        consumer.scope = {'query_string': query_string}
+        consumer.configure_stream()
+        return consumer
+
+    def test_throttle_is_read_in_milliseconds(self):
+        self.assertEqual(self.configured(b'throttle=250').throttle_window, 0.25)
+
+    def test_malformed_throttle_keeps_the_default(self):
+        default = consumers.ActiniaResourceConsumer.throttle_window
+        self.assertEqual(self.configured(b'throttle=fast&delta=1').throttle_window, default)
+
+    def test_events_of_different_types_for_a_resource_are_not_merged(self):
+        consumer = self.configured(b'throttle=250')
+        consumer.send_payload = mock.AsyncMock()
+        # A flush is already scheduled
+        consumer.flush_task = mock.Mock()
+
+        async def send():
+            await consumer.send_event({'type': 'resource_message', 'message': 'running', 'resource_id': 'resource_id-1'})
+            await consumer.send_event({'type': 'model_setup', 'message': 'finished', 'resource_id': 'resource_id-1'})
+            await consumer.flush_events()
+
+        async_to_sync(send)()
+        events = consumer.send_payload.await_args[0][0]
+        self.assertEqual([event['type'] for event in events], ['resource_message', 'model_setup'])
+
+
+class MultiplexReceiveTests(SimpleTestCase):
+
+    resource_id = 'resource_id-0f8fad5b-d9cb-469f-a165-70867728950e'
+
+    def setUp(self):
+        self.consumer = consumers.ActiniaMultiplexConsumer()
+        self.consumer.channel_name = 'specific.channel'
+        self.consumer.channel_layer = mock.AsyncMock()
+        self.consumer.subscriptions = set()
+        self.consumer.send_text = mock.AsyncMock()
+
+    def receive(self, message):
+        text = message if isinstance(message, str) else json.dumps(message)
+        async_to_sync(self.consumer.receive)(text)
+        if self.consumer.send_text.await_count:
+            return json.loads(self.consumer.send_text.await_args[0][0])
+
+    def test_invalid_json_is_answered_with_an_error(self):
+        self.assertEqual(self.receive('{"action": ')['type'], 'error')
+        self.assertEqual(self.receive(['subscribe'])['type'], 'error')
+
+    def test_only_consumer_handlers_can_be_triggered(self):
+        frame = self.receive({'resource_id': self.resource_id, 'message': 'accepted', 'message_type': 'websocket.disconnect'})
+        self.assertEqual(frame['type'], 'error')
+        self.consumer.channel_layer.group_add.assert_not_awaited()
+        self.consumer.channel_layer.group_send.assert_not_awaited()
+        self.assertIsNone(self.receive({'resource_id': self.resource_id, 'message': 'accepted', 'message_type': 'model_setup'}))
+        self.assertEqual(self.consumer.channel_layer.group_send.await_args[0][1]['type'], 'model_setup')
+
+    def test_subscriptions_per_socket_are_capped(self):
+        self.consumer.max_subscriptions = 2
+        self.assertIsNone(self.receive({'resource_id': self.resource_id, 'model_id': 7}))
+        self.assertEqual(self.receive({'model_id': 8})['type'], 'error')
+        self.assertEqual(len(self.consumer.subscriptions), 2)
+
+
+class ConsumerOffloadTests(SimpleTestCase):
+
+    def consumer(self):
+        consumer = consumers.ActiniaResourceConsumer()
+        consumer.send_event = mock.AsyncMock()
+        return consumer
+
+    def test_finished_model_setup_updates_the_model_through_the_db_thread(self):
+        event = {
+            'type': 'model_setup', 'status': 'finished', 'resource_id': 'resource_id-1',
+            'model_id': 7, 'resources': [], 'process_log': []
+        }
+        with mock.patch.object(consumers, 'markModelReady', new=mock.AsyncMock(return_value=1)) as ready:
+            async_to_sync(self.consumer().model_setup)(event)
+        ready.assert_awaited_once_with(7)
+
+    def test_status_polling_does_not_run_on_the_event_loop(self):
+        threads = []
+
+        async def handle():
+            loop_thread = threading.get_ident()
+            await self.consumer().resource_message({'message': 'accepted', 'resource_id': 'resource_id-1'})
+            return loop_thread
+
+        with mock.patch.object(tasks, 'pollResourceStatus', side_effect=lambda *args: threads.append(threading.get_ident())):
+            loop_thread = async_to_sync(handle)()
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], loop_thread)
+
+
+class JobVisibilityTests(APITestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user('owner', 'owner@example.com', 'testpassword')
+        self.other = User.objects.create_user('other', 'other@example.com', 'testpassword')
+        ProcessingResponseModel.objects.create(resource_id='resource_id-1', status='finished', user_id='actinia-gdi', owner=self.owner)
+
+    def test_anonymous_users_cannot_list_jobs(self):
+        response = self.client.get(reverse('savana:jobs'))
+        self.assertIn(response.status_code, (401, 403))
+
+    def test_users_only_see_their_own_jobs(self):
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(reverse('savana:jobs')).data['count'], 0)
+        self.assertEqual(self.client.get(reverse('savana:job-detail', args=['resource_id-1'])).status_code, 404)
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.client.get(reverse('savana:jobs')).data['count'], 1)
+
+    def test_model_setup_jobs_belong_to_the_model_owner(self):
+        model = OpenPlainsModel.objects.create(
+            name='Test model', description='', location='test_model', mapset='owner', owner=self.owner
+        )
+        ProcessingResponseModel.objects.record(
+            [{'resource_id': 'resource_id-2', 'user_id': 'actinia-gdi', 'status': 'accepted'}], model_id=model.pk
+        )
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.client.get(reverse('savana:jobs')).data['count'], 2)
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(reverse('savana:jobs')).data['count'], 0)
+
+
+class RecordResponsesTests(TestCase):
+
+    def test_each_transition_is_reported_once(self):
+        accepted = {'resource_id': 'resource_id-1', 'user_id': 'actinia-gdi', 'status': 'accepted'}
+        finished = dict(accepted, status='finished')
+        self.assertEqual(ProcessingResponseModel.objects.record([accepted]), [('resource_id-1', None, 'accepted')])
+        self.assertEqual(ProcessingResponseModel.objects.record([finished]), [('resource_id-1', 'accepted', 'finished')])
+        self.assertEqual(ProcessingResponseModel.objects.record([finished]), [])
+        self.assertEqual(ProcessingResponseModel.objects.get(resource_id='resource_id-1').status_events.count(), 2)
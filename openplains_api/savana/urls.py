@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework import routers  
-from django.views.decorators.cache import cache_page
+from .utils.cache import async_cache_page
 
 
 from . import views
@@ -14,30 +14,37 @@ urlpatterns = [
     path('users/<int:pk>/', views.UserDetail.as_view()),
     path('models/', views.OpModelList.as_view(), name="op-models"),
     path('models/<str:model_id>/', views.OpModelDetails.as_view(), name="op-model-detail"),
+    path('models/<str:model_id>/zonal_stats/', views.ModelZonalStats.as_view(), name="op-model-zonal-stats"),
+    path('jobs/', views.ProcessingResponseList.as_view(), name="jobs"),
+    path('jobs/<str:resource_id>/', views.ProcessingResponseDetail.as_view(), name="job-detail"),
+    path('profile/modules/', views.ModuleProfileReport.as_view(), name="module-profile"),
+    path('stac/search', views.StacSearch.as_view(), name="stac-search"),
+    path('stac/collections', views.StacCollections.as_view(), name="stac-collections"),
+    path('stac/collections/<str:collection>/items/<str:item_id>', views.StacItemDetail.as_view(), name="stac-item"),
     path('g/locations/', views.gLocations, name="ListLocations"),
     path('g/locations/<str:location_name>', views.gLocation, name="Location"),
-    path('g/locations/<str:location_name>/info', cache_page(60 * 15)(views.gLocationInfo), name="LocationInfo"),
+    path('g/locations/<str:location_name>/info', async_cache_page(60 * 15)(views.gLocationInfo), name="LocationInfo"),
     path('g/locations/<str:location_name>/mapsets', views.gMapsets, name="Mapsets"),
     path('g/locations/<str:location_name>/mapsets/<str:mapset_name>', views.gMapset, name="Mapset"),
-    path('g/locations/<str:location_name>/mapsets/<str:mapset_name>/info', cache_page(60 * 15)(views.gMapsetInfo), name="MapsetInfo"),
-    path('g/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers', cache_page(60 * 15)(views.gListRasters), name="ListRaster"),
-    path('g/locations/<str:location_name>/mapsets/<str:mapset_name>/vector_layers', cache_page(60 * 15)(views.gListVectors), name="ListVector"),
+    path('g/locations/<str:location_name>/mapsets/<str:mapset_name>/info', async_cache_page(60 * 15)(views.gMapsetInfo), name="MapsetInfo"),
+    path('g/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers', async_cache_page(60 * 15)(views.gListRasters), name="ListRaster"),
+    path('g/locations/<str:location_name>/mapsets/<str:mapset_name>/vector_layers', async_cache_page(60 * 15)(views.gListVectors), name="ListVector"),
     path('g/locations/<str:location_name>/mapsets/<str:mapset_name>/lock', views.gMapsetLock, name="mapset-lock"),
-    path('g/modules', cache_page(60 * 15)(views.gModules), name="gModules"),
-    path('g/modules/<str:grassmodule>', cache_page(60 * 15)(views.gModule), name="gModule"),
+    path('g/modules', async_cache_page(60 * 15)(views.gModules), name="gModules"),
+    path('g/modules/<str:grassmodule>', async_cache_page(60 * 15)(views.gModule), name="gModule"),
 
 
-    path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>', cache_page(60 * 15)(views.rInfo), name="rInfo"),
+    path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>', async_cache_page(60 * 15)(views.rInfo), name="rInfo"),
     path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>/no_cache', views.rInfo, name="rInfo"),
-    path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>/render', cache_page(60 * 15)(views.rRenderImage), name="renderRaster"),
-    path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>/colors', cache_page(60 * 15)(views.rColors), name="rColors"),
+    path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>/render', async_cache_page(60 * 15)(views.rRenderImage), name="renderRaster"),
+    path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>/colors', async_cache_page(60 * 15)(views.rColors), name="rColors"),
     path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>/geotiff_async_orig', views.rGeoTiff, name="rGeoTiff"),
 
     ## Raster Stats
-    path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>/area_stats_async', cache_page(60 * 15)(views.rRenderImage), name="area_stats_async"),
-    path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>/area_stats_sync', cache_page(60 * 15)(views.rRenderImage), name="area_stats_sync"),
-    path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>/area_stats_univar_async', cache_page(60 * 15)(views.rRenderImage), name="area_stats_univar_async"),
-    path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>/area_stats_univar_sync', cache_page(60 * 15)(views.rRenderImage), name="area_stats_univar_sync"),
+    path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>/area_stats_async', async_cache_page(60 * 15)(views.rRenderImage), name="area_stats_async"),
+    path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>/area_stats_sync', async_cache_page(60 * 15)(views.rRenderImage), name="area_stats_sync"),
+    path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>/area_stats_univar_async', async_cache_page(60 * 15)(views.rRenderImage), name="area_stats_univar_async"),
+    path('r/locations/<str:location_name>/mapsets/<str:mapset_name>/raster_layers/<str:raster_name>/area_stats_univar_sync', async_cache_page(60 * 15)(views.rRenderImage), name="area_stats_univar_sync"),
     path('r/resource/<str:raster_name>/stream/<str:resource_id>', views.streamCOG, name="rStreamOCG"),
     path('r/drain/', views.rDrain, name="rDrain"),
     
@@ -45,9 +52,9 @@ urlpatterns = [
     path('r3', views.ping, name='r3'),
 
     path('v', views.ping, name='v'),
-    path('v/locations/<str:location_name>/mapsets/<str:mapset_name>/vector_layers/<str:vector_name>', cache_page(60 * 15)(views.vInfo), name="vInfo"),
-    path('v/locations/<str:location_name>/mapsets/<str:mapset_name>/vector_layers/<str:vector_name>/render', cache_page(60 * 15)(views.vRenderImage), name="renderVector"),
-    # path('v/locations/<str:location_name>/mapsets/<str:mapset_name>/vector_layers/<str:vector_name>/sampling_async', cache_page(60 * 15)(views.rColors), name="vSamplingAsync"),
+    path('v/locations/<str:location_name>/mapsets/<str:mapset_name>/vector_layers/<str:vector_name>', async_cache_page(60 * 15)(views.vInfo), name="vInfo"),
+    path('v/locations/<str:location_name>/mapsets/<str:mapset_name>/vector_layers/<str:vector_name>/render', async_cache_page(60 * 15)(views.vRenderImage), name="renderVector"),
+    # path('v/locations/<str:location_name>/mapsets/<str:mapset_name>/vector_layers/<str:vector_name>/sampling_async', async_cache_page(60 * 15)(views.rColors), name="vSamplingAsync"),
     # path('v/locations/<str:location_name>/mapsets/<str:mapset_name>/vector_layers/<str:vector_name>/sampling_sync', views.rGeoTiff, name="vSamplingSync"),
     # path('model', views.rGeoTiff, name="vSamplingSync"),
     # path('model/<str:model_id>', views.rGeoTiff, name="vSamplingSync"),
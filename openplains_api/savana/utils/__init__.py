@@ -31,6 +31,15 @@
 ###############################################################################
 
 
-from .actinia import *
+# The actinia helpers used to be star-imported here, which loaded the whole
+# actinia client for every `from savana.utils import ...`. Resolve them on use.
+def __getattr__(name):
+    if name.startswith('__'):
+        raise AttributeError(name)
+    from . import actinia
+    try:
+        return getattr(actinia, name)
+    except AttributeError:
+        raise AttributeError(f"module 'savana.utils' has no attribute '{name}'") from None
 # from actinia import Actinia
 # from .validate_cloud_optimized_geotiff import *
@@ -32,29 +32,36 @@
 
 
 from django.conf import settings
-from requests.auth import HTTPBasicAuth
+from django.core.cache import cache
+from requests.auth import AuthBase, HTTPBasicAuth
+import asyncio
+import base64
+import threading
 import json
 import os
-from django.contrib.gis.gdal import DataSource
 import time
 import requests
-from functools import reduce
+from functools import partial
+import weakref
+import httpx
 # from channels.layers import get_channel_layer
-from actinia import Actinia
 
 
 import re
 # import simplejson # should we load
-import sys
 # import grass.script as grass # should we load
-import subprocess
 # from pprint import pprint
 from typing import List, Optional
+from . import metrics
+from . import nodes
+from .breaker import ActiniaUnavailable, AsyncBreakerTransport, BreakerAdapter
 
 ACTINIA_SETTINGS = settings.ACTINIA
 
 
 def initActiniaClient():
+    # The actinia client library is only needed here, keep it out of every process start
+    from actinia import Actinia
     actinia_con = Actinia(os.path.join('http://', ACTINIA_SETTINGS['ACTINIA_BASEURL']), ACTINIA_SETTINGS['ACTINIA_VERSION'])
     # print(actinia_con.get_version())
     actinia_con.set_authentication(ACTINIA_SETTINGS['ACTINIA_USER'], ACTINIA_SETTINGS['ACTINIA_PASSWORD'])
@@ -65,6 +72,24 @@ def currentUser():
     return ACTINIA_SETTINGS['ACTINIA_USER']
 
 
+def resourcePath(user_id, resource_id, url):
+    """Local path of an actinia resource url on the shared resources volume"""
+    file_name = url.split('/')[-1]
+    return os.path.join('/actinia_core', 'resources', user_id, resource_id, file_name)
+
+
+# actinia resource ids are "resource_id-" followed by a uuid4
+RESOURCE_ID = re.compile(r'resource_id-[0-9a-f]{8}(-[0-9a-f]{4}){3}-[0-9a-f]{12}')
+
+
+def exportPath(user_id, resource_id, url):
+    """resourcePath of a resource id and file name sent by a client, None unless it stays inside that resource"""
+    if not RESOURCE_ID.fullmatch(resource_id or ''):
+        return None
+    path = resourcePath(user_id, resource_id, url)
+    return path if os.path.normpath(path) == path else None
+
+
 # def authorizeUser():
 #     actinia_con.set_authentication(ACTINIA_SETTINGS['ACTINIA_USER'], ACTINIA_SETTINGS['ACTINIA_PASSWORD'])
 #     return actinia_con
@@ -74,10 +99,246 @@ def print_as_json(data):
     return json.dumps(data)
 
 
+TOKEN_CACHE_KEY = 'actinia_api_token'
+TOKEN_BACKOFF_KEY = 'actinia_api_token_backoff'
+_token_lock = threading.Lock()
+# Process local copy of the shared token and backoff, so the async proxy views
+# only make a blocking cache round-trip when the token changes
+_local_token = {}
+
+
+def basicHeader(username, password=''):
+    credentials = base64.b64encode(f"{username}:{password}".encode('utf-8')).decode('ascii')
+    return f"Basic {credentials}"
+
+
+def passwordHeader():
+    return basicHeader(ACTINIA_SETTINGS['ACTINIA_USER'], ACTINIA_SETTINGS['ACTINIA_PASSWORD'])
+
+
+def tokenUrl():
+    # Any node can issue the token, the pool must share one secret key so every node accepts it
+    return nodes.route(f"{baseUrl()}/token")
+
+
+def tokenParams():
+    return {'expiration_time': ACTINIA_SETTINGS['ACTINIA_TOKEN_LIFETIME']}
+
+
+def freshToken(entry):
+    return entry is not None and entry[1] - ACTINIA_SETTINGS['ACTINIA_TOKEN_REFRESH_MARGIN'] > time.time()
+
+
+def cachedToken():
+    """
+    Actinia API token shared by every worker through the Django cache, kept in
+    process memory until it expires. Returns None once the token is inside the
+    refresh margin so it is renewed before actinia rejects it.
+    """
+    entry = _local_token.get('token')
+    if not freshToken(entry):
+        entry = cache.get(TOKEN_CACHE_KEY)
+        if not freshToken(entry):
+            metrics.cacheResult('actinia_token', False)
+            return None
+        _local_token['token'] = entry
+    metrics.cacheResult('actinia_token', True)
+    return entry[0]
+
+
+def backOff():
+    _local_token['backoff_until'] = time.time() + ACTINIA_SETTINGS['ACTINIA_TOKEN_RETRY']
+    cache.set(TOKEN_BACKOFF_KEY, True, ACTINIA_SETTINGS['ACTINIA_TOKEN_RETRY'])
+
+
+def storeToken(status_code, data):
+    """Cache the token from a /token response, or back off to Basic auth for a while if there is none"""
+    token = data.get('token') if status_code == 200 and isinstance(data, dict) else None
+    if not token:
+        print(f"actinia token request failed ({status_code}), using Basic auth")
+        backOff()
+        return None
+    lifetime = ACTINIA_SETTINGS['ACTINIA_TOKEN_LIFETIME']
+    entry = (token, time.time() + lifetime)
+    _local_token['token'] = entry
+    cache.set(TOKEN_CACHE_KEY, entry, lifetime)
+    return token
+
+
+def invalidateToken(token=None):
+    """Drop the cached token, unless another worker already replaced it"""
+    local = _local_token.get('token')
+    if local is not None and (token is None or local[0] == token):
+        _local_token.pop('token', None)
+    entry = cache.get(TOKEN_CACHE_KEY)
+    if entry is not None and (token is None or entry[0] == token):
+        cache.delete(TOKEN_CACHE_KEY)
+
+
+def tokenBackoff():
+    if _local_token.get('backoff_until', 0) > time.time():
+        return True
+    if cache.get(TOKEN_BACKOFF_KEY, False):
+        # Another worker's token request failed, wait out the rest of its backoff locally
+        _local_token['backoff_until'] = time.time() + ACTINIA_SETTINGS['ACTINIA_TOKEN_RETRY']
+        return True
+    return False
+
+
+def fetchToken():
+    """
+    Get a valid actinia API token, requesting a new one with the configured
+    credentials when needed. Returns None when tokens are unavailable.
+    """
+    token = cachedToken()
+    if token is not None or tokenBackoff():
+        return token
+    with _token_lock:
+        # Another thread may have refreshed it while we waited
+        token = cachedToken()
+        if token is not None:
+            return token
+        try:
+            r = requests.get(tokenUrl(), params=tokenParams(), headers={'Authorization': passwordHeader()}, timeout=10)
+            data = r.json()
+        except (requests.RequestException, ValueError) as e:
+            print(f"actinia token request failed: {e}")
+            backOff()
+            return None
+        return storeToken(r.status_code, data)
+
+
+def replayable(body):
+    return body is None or isinstance(body, (bytes, str))
+
+
+class ActiniaTokenAuth(AuthBase):
+    """
+    requests auth sending a cached actinia API token as the Basic username.
+    Actinia checks tokens with a signature instead of the password hash, so status
+    polls get much cheaper. Falls back to the password when tokens are unavailable
+    or actinia rejects the token. Also routes the request to an actinia node, see nodes.route.
+    """
+
+    def __call__(self, r):
+        r.url = nodes.route(r.url)
+        token = fetchToken()
+        if token is None:
+            r.headers['Authorization'] = passwordHeader()
+        else:
+            r.headers['Authorization'] = basicHeader(token)
+            r.register_hook('response', partial(self.handle_401, token))
+        # Registered last so it sees the response of a password retry
+        r.register_hook('response', self.observe)
+        return r
+
+    def observe(self, r, **kwargs):
+        nodes.observe(r.url, r.status_code, r.request.method, r.json)
+        return r
+
+    def handle_401(self, token, r, **kwargs):
+        if r.status_code != 401 or not replayable(r.request.body):
+            return r
+        invalidateToken(token)
+        # Consume content and release the original connection
+        r.content
+        r.close()
+        prep = r.request.copy()
+        prep.headers['Authorization'] = passwordHeader()
+        _r = r.connection.send(prep, **kwargs)
+        _r.history.append(r)
+        _r.request = prep
+        return _r
+
+
+class AsyncActiniaTokenAuth(httpx.Auth):
+    """
+    httpx counterpart of ActiniaTokenAuth. The token request is yielded from the
+    auth flow so the async client fetches it without blocking the event loop.
+    Also routes the request to an actinia node, see nodes.route.
+    """
+    requires_response_body = True
+
+    def auth_flow(self, request):
+        routed = nodes.route(str(request.url))
+        if routed != str(request.url):
+            request.url = httpx.URL(routed)
+            request.headers['Host'] = request.url.netloc.decode('ascii')
+        response = yield from self.authenticated(request)
+        nodes.observe(str(request.url), response.status_code, request.method, response.json)
+
+    def authenticated(self, request):
+        token = cachedToken()
+        if token is None and not tokenBackoff():
+            token_request = httpx.Request('GET', tokenUrl(), params=tokenParams(), headers={'Authorization': passwordHeader()})
+            response = yield token_request
+            try:
+                data = response.json()
+            except ValueError:
+                data = None
+            token = storeToken(response.status_code, data)
+        if token is None:
+            request.headers['Authorization'] = passwordHeader()
+            return (yield request)
+        request.headers['Authorization'] = basicHeader(token)
+        response = yield request
+        if response.status_code == 401:
+            invalidateToken(token)
+            request.headers['Authorization'] = passwordHeader()
+            response = yield request
+        return response
+
+
 def auth():
-    # print(ACTINIA_SETTINGS)
-    auth = HTTPBasicAuth(ACTINIA_SETTINGS['ACTINIA_USER'], ACTINIA_SETTINGS['ACTINIA_PASSWORD'])
-    return auth
+    return ActiniaTokenAuth()
+
+
+def asyncAuth():
+    return AsyncActiniaTokenAuth()
+
+
+# One pooled client per event loop. Daphne runs a single loop per process so
+# every async view shares the same keep-alive connections to actinia.
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def asyncClient():
+    """
+    Get the pooled async HTTP client for the running event loop.
+    Returns:
+        An httpx.AsyncClient authenticated against actinia, with adaptive timeouts
+        and failing fast with ActiniaUnavailable while actinia is down
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        limits = httpx.Limits(
+            max_connections=ACTINIA_SETTINGS['ACTINIA_MAX_CONNECTIONS'],
+            max_keepalive_connections=ACTINIA_SETTINGS['ACTINIA_MAX_KEEPALIVE_CONNECTIONS']
+        )
+        transport = AsyncBreakerTransport(httpx.AsyncHTTPTransport(limits=limits))
+        client = httpx.AsyncClient(auth=asyncAuth(), transport=transport, timeout=None)
+        _async_clients[loop] = client
+    return client
+
+
+_sessions = threading.local()
+
+
+def session():
+    """
+    Get this thread's requests session for actinia. Calls get adaptive
+    timeouts and fail fast with ActiniaUnavailable while actinia is down.
+    """
+    s = getattr(_sessions, 'session', None)
+    if s is None:
+        s = requests.Session()
+        s.auth = auth()
+        adapter = BreakerAdapter()
+        s.mount('http://', adapter)
+        s.mount('https://', adapter)
+        _sessions.session = s
+    return s
 
 
 def baseUrl():
@@ -108,7 +369,7 @@ def location():
 
 def resourceStatus(user_id, resource_id):
     url = f"{baseUrl()}/resources/{user_id}/{resource_id}"
-    r = requests.get(url, auth=auth())
+    r = session().get(url)
     data = r.json()
     print(f"resourceStatus: {r.status_code}")
     if r.status_code == 200:
@@ -0,0 +1,251 @@
+###############################################################################
+# Filename: breaker.py                                                         #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import math
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from . import metrics
+
+ACTINIA_SETTINGS = settings.ACTINIA
+
+# Path segments kept when grouping urls into routes, everything else is a name or id
+STATIC_SEGMENTS = {
+    'api', 'locations', 'mapsets', 'raster_layers', 'vector_layers', 'strds', 'resources',
+    'processing_async', 'processing_async_export', 'geotiff_async_orig', 'info', 'lock',
+    'render', 'grass_modules', 'actinia_templates', 'token', 'version',
+}
+# Responses meaning actinia itself is in trouble, not the request
+FAILURE_STATUS = {502, 503, 504}
+MIN_SAMPLES = 20
+
+
+class ActiniaUnavailable(Exception):
+    """Raised instead of calling actinia while its circuit is open, or when a call times out"""
+
+    def __init__(self, node, route, retry_after):
+        self.node = node
+        self.route = route
+        self.retry_after = retry_after
+        super().__init__(f"actinia at {node} is unavailable ({route}), retry in {retry_after}s")
+
+
+def routeKey(method, url):
+    """Group a url with others of the same actinia route, e.g. GET /locations/*/mapsets"""
+    segments = urlsplit(url).path.strip('/').split('/')
+    # Drop /api/<version>
+    if segments[:1] == ['api']:
+        segments = segments[2:]
+    return f"{method} /" + '/'.join(s if s in STATIC_SEGMENTS else '*' for s in segments)
+
+
+class RouteLatency:
+    """
+    Sliding window of response times of one route. The read timeout is a
+    multiple of the window's high percentile, clamped to the configured bounds.
+    """
+
+    def __init__(self, window=200):
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+
+    def percentile(self, q):
+        ordered = sorted(self.samples)
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+    def timeout(self):
+        if len(self.samples) < MIN_SAMPLES:
+            return ACTINIA_SETTINGS['ACTINIA_TIMEOUT']
+        adaptive = self.percentile(ACTINIA_SETTINGS['ACTINIA_TIMEOUT_PERCENTILE']) * ACTINIA_SETTINGS['ACTINIA_TIMEOUT_MULTIPLIER']
+        return min(max(adaptive, ACTINIA_SETTINGS['ACTINIA_TIMEOUT_MIN']), ACTINIA_SETTINGS['ACTINIA_TIMEOUT_MAX'])
+
+
+class CircuitBreaker:
+    """
+    Circuit of one actinia node. Opens after ACTINIA_BREAKER_THRESHOLD failures
+    in a row and fails fast for ACTINIA_BREAKER_RESET seconds, then lets a single
+    probe through (half open). The probe closes the circuit again or reopens it.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, node):
+        self.node = node
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def retryAfter(self):
+        return max(1, math.ceil(self.opened_at + ACTINIA_SETTINGS['ACTINIA_BREAKER_RESET'] - time.monotonic()))
+
+    def admit(self, route):
+        with self.lock:
+            if self.state == self.OPEN:
+                if time.monotonic() < self.opened_at + ACTINIA_SETTINGS['ACTINIA_BREAKER_RESET']:
+                    raise ActiniaUnavailable(self.node, route, self.retryAfter())
+                self.state = self.HALF_OPEN
+                self.probing = False
+            if self.state == self.HALF_OPEN:
+                if self.probing:
+                    raise ActiniaUnavailable(self.node, route, 1)
+                self.probing = True
+
+    def release(self):
+        """A probe ended without an answer from actinia (cancelled, SSL or decoding error), let another one through"""
+        with self.lock:
+            self.probing = False
+
+    def success(self):
+        with self.lock:
+            if self.state != self.CLOSED:
+                print(f"actinia circuit for {self.node} closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probing = False
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= ACTINIA_SETTINGS['ACTINIA_BREAKER_THRESHOLD']:
+                if self.state != self.OPEN:
+                    print(f"actinia circuit for {self.node} opened after {self.failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.probing = False
+
+
+# Per process state, each worker trips on its own failures
+_breakers = {}
+_latencies = {}
+_registry_lock = threading.Lock()
+
+
+def breakerFor(node):
+    with _registry_lock:
+        return _breakers.setdefault(node, CircuitBreaker(node))
+
+
+def latencyFor(route):
+    with _registry_lock:
+        return _latencies.setdefault(route, RouteLatency())
+
+
+class Call:
+    """Bookkeeping of one actinia call shared by the sync adapter and the async transport"""
+
+    def __init__(self, method, url):
+        self.node = urlsplit(url).netloc
+        self.route = routeKey(method, url)
+        self.breaker = breakerFor(self.node)
+        self.latency = latencyFor(self.route)
+        try:
+            self.breaker.admit(self.route)
+        except ActiniaUnavailable:
+            metrics.ACTINIA_REJECTED.labels(self.node).inc()
+            raise
+        self.read_timeout = self.latency.timeout()
+        self.start = time.monotonic()
+        self.settled = False
+
+    def failed(self):
+        self.settled = True
+        self.breaker.failure()
+        metrics.ACTINIA_LATENCY.labels(self.route, 'error').observe(time.monotonic() - self.start)
+        return ActiniaUnavailable(self.node, self.route, self.breaker.retryAfter())
+
+    def finished(self, status_code):
+        self.settled = True
+        elapsed = time.monotonic() - self.start
+        metrics.ACTINIA_LATENCY.labels(self.route, status_code).observe(elapsed)
+        if status_code in FAILURE_STATUS:
+            self.breaker.failure()
+        else:
+            self.breaker.success()
+            self.latency.record(elapsed)
+
+    def release(self):
+        """Called when the request is over, whichever way it ended"""
+        if not self.settled:
+            self.breaker.release()
+
+
+class BreakerAdapter(HTTPAdapter):
+    """requests transport adapter applying the circuit breaker and adaptive timeouts"""
+
+    def send(self, request, timeout=None, **kwargs):
+        call = Call(request.method, request.url)
+        if timeout is None:
+            timeout = (ACTINIA_SETTINGS['ACTINIA_CONNECT_TIMEOUT'], call.read_timeout)
+        try:
+            response = super().send(request, timeout=timeout, **kwargs)
+        except (requests.Timeout, requests.ConnectionError) as e:
+            raise call.failed() from e
+        else:
+            call.finished(response.status_code)
+        finally:
+            call.release()
+        return response
+
+
+class AsyncBreakerTransport(httpx.AsyncBaseTransport):
+    """httpx transport applying the circuit breaker and adaptive timeouts"""
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    async def handle_async_request(self, request):
+        call = Call(request.method, str(request.url))
+        request.extensions['timeout'] = httpx.Timeout(
+            call.read_timeout, connect=ACTINIA_SETTINGS['ACTINIA_CONNECT_TIMEOUT']
+        ).as_dict()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except httpx.TransportError as e:
+            raise call.failed() from e
+        else:
+            call.finished(response.status_code)
+        finally:
+            call.release()
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
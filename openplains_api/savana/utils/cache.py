@@ -0,0 +1,72 @@
+###############################################################################
+# Filename: cache.py                                                           #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import functools
+import hashlib
+from django.core.cache import cache
+from django.http import HttpResponse
+from . import metrics
+
+
+def async_cache_page(timeout):
+    """
+    Cache the response of an async view.
+    Django's cache_page decorator only wraps sync views, so the async actinia
+    proxy views use this instead.
+    Args:
+        timeout: Number of seconds to keep the response in the cache
+    Returns:
+        The view decorator
+    """
+
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        async def _wrapped_view(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await view_func(request, *args, **kwargs)
+
+            url = request.build_absolute_uri().encode('utf-8')
+            key = f"savana.async_cache_page.{hashlib.md5(url).hexdigest()}"
+            cached = await cache.aget(key)
+            metrics.cacheResult('page', cached is not None)
+            if cached is not None:
+                content, content_type, status_code = cached
+                return HttpResponse(content, content_type=content_type, status=status_code)
+
+            response = await view_func(request, *args, **kwargs)
+            if response is not None and response.status_code == 200 and not response.streaming:
+                await cache.aset(key, (response.content, response['Content-Type'], response.status_code), timeout)
+            return response
+
+        return _wrapped_view
+
+    return decorator
@@ -0,0 +1,100 @@
+###############################################################################
+# Filename: cas.py                                                             #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+from django.conf import settings
+import hashlib
+import os
+import uuid
+
+RESULT_STORE_SETTINGS = settings.RESULT_STORE
+
+
+def hashFile(path, block_size=8 * 1024 * 1024):
+    """SHA-256 hex digest and size of a file"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+            size += len(block)
+    return digest.hexdigest(), size
+
+
+def blobPath(digest, root=None):
+    """Location of a blob in the store, fanned out by the first bytes of its digest"""
+    root = root or RESULT_STORE_SETTINGS['ROOT']
+    return os.path.join(root, digest[:2], digest[2:4], digest)
+
+
+def _replaceWithLink(source, target):
+    """Atomically replace target with a hard link to source"""
+    tmp = f"{target}.{uuid.uuid4().hex}.tmp"
+    os.link(source, tmp)
+    os.replace(tmp, target)
+
+
+def ingest(path, root=None):
+    """
+    Add a file to the content-addressed store. The store must be on the same
+    filesystem as the actinia resources: the first copy of some content is hard
+    linked into the store, later identical files are replaced by hard links to
+    the stored blob so the bytes are kept on disk once.
+    Returns (digest, size, deduplicated).
+    """
+    digest, size = hashFile(path)
+    blob = blobPath(digest, root)
+    os.makedirs(os.path.dirname(blob), exist_ok=True)
+    try:
+        os.link(path, blob)
+        return digest, size, False
+    except FileExistsError:
+        pass
+
+    if os.path.samefile(path, blob):
+        return digest, size, False
+    _replaceWithLink(blob, path)
+    return digest, size, True
+
+
+def remove(digest, root=None):
+    """
+    Delete a blob from the store if no file outside the store links to it.
+    Returns True if it was removed.
+    """
+    blob = blobPath(digest, root)
+    try:
+        if os.stat(blob).st_nlink > 1:
+            return False
+        os.remove(blob)
+    except FileNotFoundError:
+        pass
+    return True
@@ -0,0 +1,100 @@
+###############################################################################
+# Filename: cog.py                                                             #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import os
+from .lazy import lazyImport
+
+gdal = lazyImport('osgeo.gdal')
+cogValidator = lazyImport('savana.utils.validate_cloud_optimized_geotiff')
+
+
+def isGeoTiff(url):
+    return url.lower().endswith(('.tif', '.tiff'))
+
+
+def cogErrors(path):
+    """COG validator errors of a GeoTIFF, empty for a valid COG"""
+    gdal.UseExceptions()
+    warnings, errors, details = cogValidator.validate(path)
+    return errors
+
+
+def creationOptions(ds):
+    """
+    COG driver options, keeping class values intact in the overviews of categorical rasters.
+    Integer data alone isn't categorical (e.g. elevation or counts), only bands with a
+    color table or category names are.
+    """
+    band = ds.GetRasterBand(1)
+    categorical = band.GetColorTable() is not None or bool(band.GetCategoryNames())
+    return [
+        'BLOCKSIZE=512',
+        'COMPRESS=DEFLATE',
+        'PREDICTOR=YES',
+        'OVERVIEWS=AUTO',
+        f"RESAMPLING={'NEAREST' if categorical else 'AVERAGE'}",
+        'BIGTIFF=IF_SAFER',
+        'NUM_THREADS=ALL_CPUS',
+    ]
+
+
+def rewriteCog(path):
+    """
+    Rewrite a GeoTIFF in place as a tiled, compressed COG with internal overviews.
+    The new file is validated before it atomically replaces the original.
+    """
+    tmp = f"{path}.cog.tmp"
+    gdal.UseExceptions()
+    ds = gdal.Open(path)
+    try:
+        try:
+            gdal.Translate(tmp, ds, format='COG', creationOptions=creationOptions(ds))
+        finally:
+            ds = None
+        errors = cogErrors(tmp)
+        if errors:
+            raise cogValidator.ValidateCloudOptimizedGeoTIFFException(f"Rewritten {path} is not a valid COG: {errors}")
+        os.replace(tmp, path)
+    finally:
+        # Left behind only when the rewrite failed
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def ensureCog(path):
+    """Rewrite a GeoTIFF as a COG unless it already is one. Returns True if it was rewritten."""
+    errors = cogErrors(path)
+    if not errors:
+        return False
+    print(f"ensureCog: rewriting {path}: {errors}")
+    rewriteCog(path)
+    return True
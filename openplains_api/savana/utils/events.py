@@ -0,0 +1,74 @@
+###############################################################################
+# Filename: events.py                                                          #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+
+def diff_event(previous, current):
+    """Delta encode a resource event against the last event sent to a client.
+    process_log is treated as append-only, so only entries after the ones the
+    client already has are sent along with a process_log_offset.
+    Args:
+        previous: The last event sent to the client for the resource or None
+        current: The new event
+    Returns:
+        The full event if previous is None, the changed fields if something
+        changed, otherwise None
+    """
+    if previous is None:
+        return dict(current, delta=False)
+
+    delta = {}
+    for key, value in current.items():
+        if key != 'process_log' and previous.get(key) != value:
+            delta[key] = value
+    for key in previous:
+        if key != 'process_log' and key not in current:
+            delta[key] = None
+
+    # An event without a log (e.g. "running") leaves the client's log alone
+    if 'process_log' in current:
+        previous_log = previous.get('process_log') or []
+        process_log = current['process_log'] or []
+        offset = len(previous_log)
+        if len(process_log) >= offset and (offset == 0 or process_log[offset - 1] == previous_log[-1]):
+            if len(process_log) > offset:
+                delta['process_log'] = process_log[offset:]
+                delta['process_log_offset'] = offset
+        else:
+            # The log was rewritten, send all of it again
+            delta['process_log'] = process_log
+            delta['process_log_offset'] = 0
+
+    if not delta:
+        return None
+
+    delta.update(type=current.get('type'), resource_id=current.get('resource_id'), delta=True)
+    return delta
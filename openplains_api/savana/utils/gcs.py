@@ -0,0 +1,150 @@
+###############################################################################
+# Filename: gcs.py                                                             #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+from django.conf import settings
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import os
+import threading
+import uuid
+from .lazy import lazyImport
+
+google_crc32c = lazyImport('google_crc32c')
+credentials = lazyImport('google.auth.credentials')
+storage = lazyImport('google.cloud.storage')
+
+GCS_UPLOAD_SETTINGS = settings.GCS_UPLOAD
+
+# GCS composes at most 32 objects per request
+MAX_COMPOSE_SOURCES = 32
+
+# Limits part uploads running at once across every upload in this process
+_upload_slots = threading.BoundedSemaphore(GCS_UPLOAD_SETTINGS['CONCURRENCY'])
+
+
+def client():
+    """Storage client, talking to a local fake GCS server when STORAGE_EMULATOR_HOST is set"""
+    if os.environ.get('STORAGE_EMULATOR_HOST'):
+        return storage.Client(project=settings.GS_PROJECT_ID, credentials=credentials.AnonymousCredentials())
+    return storage.Client(project=settings.GS_PROJECT_ID)
+
+
+def fileCrc32c(path, block_size=8 * 1024 * 1024):
+    """Base64 CRC32C of a local file, as reported by GCS for an object"""
+    checksum = google_crc32c.Checksum()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            checksum.update(block)
+    return base64.b64encode(checksum.digest()).decode('utf-8')
+
+
+def partRanges(size, part_size, max_parts=MAX_COMPOSE_SOURCES * MAX_COMPOSE_SOURCES):
+    """(offset, length) of the parts a file of `size` bytes is uploaded in"""
+    if size == 0:
+        return [(0, 0)]
+    # Grow the parts rather than exceed what two levels of compose can join
+    part_size = max(part_size, -(-size // max_parts))
+    return [(offset, min(part_size, size - offset)) for offset in range(0, size, part_size)]
+
+
+def _uploadPart(bucket, path, blob_name, offset, length, content_type):
+    blob = bucket.blob(blob_name, chunk_size=GCS_UPLOAD_SETTINGS['CHUNK_SIZE'])
+    with _upload_slots, open(path, 'rb') as f:
+        f.seek(offset)
+        # Resumable chunked upload, each part is verified by GCS against its CRC32C
+        blob.upload_from_file(f, size=length, content_type=content_type, checksum='crc32c')
+    return blob
+
+
+def _compose(bucket, blob_name, sources, content_type, temporary):
+    """Compose any number of sources into blob_name, 32 at a time"""
+    while len(sources) > MAX_COMPOSE_SOURCES:
+        groups = [sources[i:i + MAX_COMPOSE_SOURCES] for i in range(0, len(sources), MAX_COMPOSE_SOURCES)]
+        sources = []
+        for group in groups:
+            intermediate = bucket.blob(f"{blob_name}.parts/{uuid.uuid4().hex}")
+            intermediate.content_type = content_type
+            intermediate.compose(group)
+            temporary.append(intermediate)
+            sources.append(intermediate)
+    blob = bucket.blob(blob_name)
+    blob.content_type = content_type
+    blob.compose(sources)
+    return blob
+
+
+def uploadFile(path, blob_name, bucket_name=None, content_type='application/octet-stream'):
+    """
+    Upload a local file to GCS and verify it against the local CRC32C.
+    Files above GCS_UPLOAD['PARALLEL_THRESHOLD'] are split into parts that are
+    uploaded in parallel and composed into a single object.
+    Returns the uploaded blob.
+    """
+    bucket = client().bucket(bucket_name or settings.GS_BUCKET_NAME)
+    size = os.path.getsize(path)
+    expected = fileCrc32c(path)
+
+    if size <= GCS_UPLOAD_SETTINGS['PARALLEL_THRESHOLD']:
+        blob = _uploadPart(bucket, path, blob_name, 0, size, content_type)
+    else:
+        ranges = partRanges(size, GCS_UPLOAD_SETTINGS['PART_SIZE'])
+        prefix = f"{blob_name}.parts/{uuid.uuid4().hex}"
+        temporary = []
+        try:
+            with ThreadPoolExecutor(max_workers=GCS_UPLOAD_SETTINGS['CONCURRENCY']) as executor:
+                futures = [
+                    executor.submit(_uploadPart, bucket, path, f"{prefix}/{i:05d}", offset, length, content_type)
+                    for i, (offset, length) in enumerate(ranges)
+                ]
+            errors = []
+            for future in futures:
+                try:
+                    temporary.append(future.result())
+                except Exception as e:
+                    errors.append(e)
+            if errors:
+                raise errors[0]
+            blob = _compose(bucket, blob_name, list(temporary), content_type, temporary)
+        finally:
+            # Best effort, a part left behind must not hide the upload's own error
+            for part in temporary:
+                try:
+                    part.delete()
+                except Exception as e:
+                    print(f"uploadFile: could not delete part {part.name}: {e}")
+
+    blob.reload()
+    if blob.crc32c != expected:
+        blob.delete()
+        raise IOError(f"CRC32C mismatch uploading {path} to {blob_name}: {blob.crc32c} != {expected}")
+    print(f"uploadFile: {path} -> gs://{bucket.name}/{blob_name} ({size} bytes)")
+    return blob
@@ -0,0 +1,144 @@
+###############################################################################
+# Filename: metrics.py                                                         #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import hmac
+import os
+import time
+from celery.signals import before_task_publish, task_prerun, task_postrun, worker_init, worker_process_shutdown
+from django.conf import settings
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess, start_http_server
+)
+
+# Buckets in seconds, actinia calls and tasks range from milliseconds to many minutes
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+TASK_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 600, 1800, 3600)
+
+REQUEST_LATENCY = Histogram(
+    'savana_request_duration_seconds', 'Django request latency per url route',
+    ['method', 'route', 'status'], buckets=LATENCY_BUCKETS
+)
+ACTINIA_LATENCY = Histogram(
+    'savana_actinia_request_duration_seconds', 'Actinia upstream latency per route',
+    ['route', 'status'], buckets=LATENCY_BUCKETS
+)
+ACTINIA_REJECTED = Counter(
+    'savana_actinia_circuit_rejections_total', 'Actinia calls failed fast by an open circuit', ['node']
+)
+TASK_QUEUE_WAIT = Histogram(
+    'savana_celery_queue_wait_seconds', 'Time between publishing a Celery task and a worker starting it',
+    ['task'], buckets=TASK_BUCKETS
+)
+TASK_RUNTIME = Histogram(
+    'savana_celery_task_duration_seconds', 'Celery task run time', ['task', 'state'], buckets=TASK_BUCKETS
+)
+WEBSOCKET_CONNECTIONS = Gauge(
+    'savana_websocket_connections', 'Open websocket connections', ['consumer'], multiprocess_mode='livesum'
+)
+WEBSOCKET_SUBSCRIPTIONS = Gauge(
+    'savana_websocket_group_subscriptions', 'Websocket channel group memberships per group kind',
+    ['group'], multiprocess_mode='livesum'
+)
+CACHE_REQUESTS = Counter('savana_cache_requests_total', 'Cache lookups by cache and result', ['cache', 'result'])
+
+
+def registry():
+    """Registry to export, merged across processes when PROMETHEUS_MULTIPROC_DIR is set"""
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    merged = CollectorRegistry()
+    multiprocess.MultiProcessCollector(merged)
+    return merged
+
+
+def exposition():
+    return generate_latest(registry())
+
+
+def scrapeAllowed(request):
+    """Whether a request carries the PROMETHEUS_METRICS_TOKEN bearer token"""
+    token = settings.PROMETHEUS_METRICS_TOKEN
+    return bool(token) and hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}")
+
+
+def cacheResult(cache_name, hit):
+    CACHE_REQUESTS.labels(cache_name, 'hit' if hit else 'miss').inc()
+
+
+def groupKind(group_name):
+    """Label for a channel group, per resource and per model groups would be unbounded"""
+    return 'model' if group_name.startswith('savana_model_') else 'resource'
+
+
+def observeRequest(request, response, start):
+    match = getattr(request, 'resolver_match', None)
+    route = match.route if match is not None else 'unmatched'
+    REQUEST_LATENCY.labels(request.method, route, response.status_code).observe(time.perf_counter() - start)
+
+
+# Start times of the tasks running in this worker process
+_task_started = {}
+
+
+@before_task_publish.connect
+def stampPublished(headers=None, **kwargs):
+    if headers is not None:
+        headers['published_at'] = time.time()
+
+
+@task_prerun.connect
+def taskStarted(task_id=None, task=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+    published_at = getattr(task.request, 'published_at', None)
+    if published_at is not None:
+        TASK_QUEUE_WAIT.labels(task.name).observe(max(0.0, time.time() - published_at))
+
+
+@task_postrun.connect
+def taskFinished(task_id=None, task=None, state=None, **kwargs):
+    start = _task_started.pop(task_id, None)
+    if start is not None:
+        TASK_RUNTIME.labels(task.name, state or 'UNKNOWN').observe(time.perf_counter() - start)
+
+
+@worker_init.connect
+def serveWorkerMetrics(**kwargs):
+    """Export the worker's metrics on PROMETHEUS_CELERY_PORT, Celery workers don't serve Django urls"""
+    port = settings.PROMETHEUS_CELERY_PORT
+    if port:
+        start_http_server(port, registry=registry())
+
+
+@worker_process_shutdown.connect
+def markProcessDead(pid=None, **kwargs):
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -0,0 +1,256 @@
+###############################################################################
+# Filename: nodes.py                                                           #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import hashlib
+import os
+import random
+import re
+import time
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+ACTINIA_SETTINGS = settings.ACTINIA
+
+HEALTH_KEY = 'actinia_node_health'
+TERMINAL_STATUS = ('finished', 'error', 'terminated')
+
+MAPSET_PATH = re.compile(r'/locations/([^/]+)/mapsets/([^/]+)')
+JOB_PATH = re.compile(r'/locations/.+/(processing_async|processing_async_export|geotiff_async_orig)')
+RESOURCE_PATH = re.compile(r'/resources/([^/]+)/([^/]+)')
+RESOURCE_LIST_PATH = re.compile(r'/resources/([^/]+)')
+
+# Routing runs inside the async auth flow, so the router works from a process
+# local snapshot of node health and load, refreshed from the shared cache at most
+# every ACTINIA_NODE_STATE_TTL seconds, instead of a cache round-trip per request
+_state = {'refreshed': None, 'health': None, 'loads': {}}
+_resource_nodes = {}
+RESOURCE_NODES_MAX = 10000
+
+
+def pool():
+    return ACTINIA_SETTINGS['ACTINIA_NODES']
+
+
+def isPool():
+    return len(pool()) > 1
+
+
+def nodeUrl(node):
+    return os.path.join('http://', node, 'api', ACTINIA_SETTINGS['ACTINIA_VERSION'])
+
+
+def loadKey(node):
+    return f"actinia_node_load_{node}"
+
+
+def resourceKey(resource_id):
+    return f"actinia_resource_node_{resource_id}"
+
+
+def activeKey(resource_id):
+    return f"actinia_resource_active_{resource_id}"
+
+
+def forgetState():
+    _state['refreshed'] = None
+    _resource_nodes.clear()
+
+
+def nodeState():
+    refreshed = _state['refreshed']
+    if refreshed is None or time.monotonic() - refreshed >= ACTINIA_SETTINGS['ACTINIA_NODE_STATE_TTL']:
+        _state['health'] = cache.get(HEALTH_KEY)
+        _state['loads'] = nodeLoads(pool())
+        _state['refreshed'] = time.monotonic()
+    return _state
+
+
+def healthyNodes():
+    """Nodes that passed the last health check, all nodes if none did or none were checked yet"""
+    health = nodeState()['health']
+    if health is None:
+        return pool()
+    healthy = [node for node in pool() if health.get(node, True)]
+    return healthy or pool()
+
+
+def nodeLoads(nodes):
+    loads = cache.get_many([loadKey(node) for node in nodes])
+    return {node: loads.get(loadKey(node), 0) for node in nodes}
+
+
+def leastLoadedNode():
+    known = nodeState()['loads']
+    loads = {node: known.get(node, 0) for node in healthyNodes()}
+    lowest = min(loads.values())
+    return random.choice([node for node, load in loads.items() if load == lowest])
+
+
+def stickyNode(location, mapset):
+    """
+    Node holding a location/mapset. ACTINIA_LOCATION_NODES pins whole locations,
+    other mapsets are spread with rendezvous hashing so adding a node only moves
+    the mapsets that hash to it.
+    """
+    pinned = ACTINIA_SETTINGS['ACTINIA_LOCATION_NODES'].get(location)
+    if pinned:
+        return pinned
+
+    def weight(node):
+        return hashlib.sha1(f"{node}/{location}/{mapset}".encode('utf-8')).hexdigest()
+    return max(pool(), key=weight)
+
+
+def rememberResource(resource_id, node):
+    if len(_resource_nodes) >= RESOURCE_NODES_MAX:
+        _resource_nodes.clear()
+    _resource_nodes[resource_id] = node
+
+
+def resourceNode(resource_id):
+    """Node that ran a job, a job never moves so it is remembered once found"""
+    node = _resource_nodes.get(resource_id)
+    if node is None:
+        node = cache.get(resourceKey(resource_id))
+        if node is not None:
+            rememberResource(resource_id, node)
+    return node
+
+
+def selectNode(path):
+    """Node for an actinia api path relative to the version root"""
+    match = MAPSET_PATH.match(path)
+    if match:
+        return stickyNode(match[1], match[2])
+    match = RESOURCE_PATH.fullmatch(path)
+    if match:
+        node = resourceNode(match[2])
+        if node is not None:
+            return node
+    return leastLoadedNode()
+
+
+def route(url):
+    """
+    Rewrite a url built on acp.baseUrl() to the node that should serve it.
+    Persistent location/mapset work is pinned to the node holding that mapset,
+    resource status goes to the node that ran the job, and everything else
+    (ephemeral processing, listings) goes to the least loaded healthy node.
+    Returns the url unchanged for a single node or a url outside the actinia api.
+    """
+    if not isPool():
+        return url
+    base = nodeUrl(ACTINIA_SETTINGS['ACTINIA_BASEURL'])
+    if not url.startswith(base):
+        return url
+    path = url[len(base):]
+    return nodeUrl(selectNode(path.split('?')[0])) + path
+
+
+def adjustLoad(node, delta):
+    # Counted locally as well so this process sees its own jobs before the next refresh
+    _state['loads'][node] = max(0, _state['loads'].get(node, 0) + delta)
+    key = loadKey(node)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        pass
+
+
+def recordJob(node, data):
+    """Remember which node accepted a job and count it against that node"""
+    resource_id = data.get('resource_id')
+    if not resource_id:
+        return
+    cache.set(resourceKey(resource_id), node, ACTINIA_SETTINGS['ACTINIA_RESOURCE_NODE_TTL'])
+    cache.set(activeKey(resource_id), node, ACTINIA_SETTINGS['ACTINIA_RESOURCE_NODE_TTL'])
+    rememberResource(resource_id, node)
+    adjustLoad(node, 1)
+
+
+def recordStatus(data):
+    """Release the load of a job once actinia reports it done"""
+    resource_id = data.get('resource_id')
+    if not resource_id or data.get('status') not in TERMINAL_STATUS:
+        return
+    node = cache.get(activeKey(resource_id))
+    # delete() is atomic, so concurrent pollers release the job once
+    if node is not None and cache.delete(activeKey(resource_id)):
+        adjustLoad(node, -1)
+
+
+def observe(url, status_code, method, json_body):
+    """
+    Update the routing state from an actinia response.
+    json_body is a callable so the body is only parsed for the routes that need it.
+    """
+    if not isPool() or status_code >= 400:
+        return
+    node = next((node for node in pool() if url.startswith(nodeUrl(node))), None)
+    if node is None:
+        return
+    path = url[len(nodeUrl(node)):].split('?')[0]
+    job = method == 'POST' and JOB_PATH.fullmatch(path)
+    status = method == 'GET' and (RESOURCE_PATH.fullmatch(path) or RESOURCE_LIST_PATH.fullmatch(path))
+    if not (job or status):
+        return
+    try:
+        data = json_body()
+    except ValueError:
+        return
+    if not isinstance(data, dict):
+        return
+    if job:
+        recordJob(node, data)
+    elif 'resource_list' in data:
+        for resource in data['resource_list']:
+            recordStatus(resource)
+    else:
+        recordStatus(data)
+
+
+def checkHealth():
+    """Probe every node's version endpoint and cache the result for the router"""
+    health = {}
+    for node in pool():
+        try:
+            r = requests.get(f"{nodeUrl(node)}/version", timeout=ACTINIA_SETTINGS['ACTINIA_HEALTH_TIMEOUT'])
+            health[node] = r.status_code == 200
+        except requests.RequestException:
+            health[node] = False
+        if not health[node]:
+            print(f"actinia node {node} is unhealthy")
+    cache.set(HEALTH_KEY, health, ACTINIA_SETTINGS['ACTINIA_HEALTH_TTL'])
+    _state['refreshed'] = None
+    return health
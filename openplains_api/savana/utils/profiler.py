@@ -0,0 +1,81 @@
+###############################################################################
+# Filename: profiler.py                                                        #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import bisect
+
+# Upper bounds in seconds of the module run time histogram buckets. The last
+# bucket collects everything slower than an hour.
+BUCKET_BOUNDS = [0.1, 0.5, 1, 5, 10, 30, 60, 300, 600, 1800, 3600]
+
+
+def empty_histogram():
+    return [0] * (len(BUCKET_BOUNDS) + 1)
+
+
+def bucket_index(seconds):
+    """Index of the histogram bucket a run time falls into"""
+    return bisect.bisect_left(BUCKET_BOUNDS, seconds)
+
+
+def parse_process_log(process_log):
+    """Extract module run times from an actinia process log.
+    Args:
+        process_log: The process_log list of an actinia response
+    Returns:
+        List of (module, run_time) tuples, one per executed step
+    """
+    timings = []
+    for entry in process_log or []:
+        module = entry.get('executable')
+        run_time = entry.get('run_time')
+        if module is None or run_time is None:
+            continue
+        timings.append((module, float(run_time)))
+    return timings
+
+
+def histogram_quantile(buckets, q, overflow=None):
+    """Estimate a quantile from histogram buckets.
+    Returns the upper bound of the bucket holding the quantile, None for an
+    empty histogram and overflow if it falls into the overflow bucket. Pass the
+    largest observed value as overflow, the result must stay JSON serializable.
+    """
+    count = sum(buckets)
+    if count == 0:
+        return None
+    rank = q * count
+    seen = 0
+    for i, n in enumerate(buckets):
+        seen += n
+        if seen >= rank:
+            return BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else overflow
+    return overflow
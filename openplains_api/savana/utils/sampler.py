@@ -0,0 +1,167 @@
+###############################################################################
+# Filename: sampler.py                                                         #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import hmac
+import random
+import threading
+import time
+from fnmatch import fnmatchcase
+from celery.signals import task_prerun, task_postrun
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.utils.text import slugify
+from savana.models import ProfilingRule, ProfileReport
+from .lazy import lazyImport
+
+# Loaded on the first profile, most processes never take one
+pyinstrument = lazyImport('pyinstrument')
+renderers = lazyImport('pyinstrument.renderers')
+
+PROFILER_SETTINGS = settings.PROFILER
+
+# pyinstrument runs one profiler per thread, so a process profiles one thing at a time
+_slot = threading.Semaphore(1)
+_rules = {'loaded': None, 'rules': []}
+
+
+def rulesStale():
+    loaded = _rules['loaded']
+    return loaded is None or time.monotonic() - loaded > PROFILER_SETTINGS['RULES_TTL']
+
+
+def refreshRules():
+    """Reload the active rules, admin changes apply within RULES_TTL seconds"""
+    _rules['rules'] = list(ProfilingRule.objects.active().values_list('id', 'kind', 'pattern', 'sample_rate'))
+    _rules['loaded'] = time.monotonic()
+
+
+def pickRule(kind, target):
+    for rule_id, rule_kind, pattern, sample_rate in _rules['rules']:
+        if rule_kind == kind and fnmatchcase(target, pattern) and random.random() < sample_rate:
+            return rule_id
+    return None
+
+
+def headerRequested(request):
+    token = PROFILER_SETTINGS['TOKEN']
+    return bool(token) and hmac.compare_digest(request.headers.get('X-Profile', ''), token)
+
+
+def withinBudget():
+    """Cap profiles across all processes to MAX_PER_MINUTE"""
+    key = f"profiler_budget_{int(time.time() // 60)}"
+    cache.add(key, 0, 120)
+    try:
+        return cache.incr(key) <= PROFILER_SETTINGS['MAX_PER_MINUTE']
+    except ValueError:
+        return False
+
+
+class Session:
+    """One sampled profile of a request or task"""
+
+    def __init__(self, kind, target, trigger, rule_id=None, async_mode='disabled'):
+        self.kind = kind
+        self.target = target
+        self.trigger = trigger
+        self.rule_id = rule_id
+        self.profiler = pyinstrument.Profiler(interval=PROFILER_SETTINGS['INTERVAL'], async_mode=async_mode)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.profiler.start()
+
+    def stop(self):
+        try:
+            self.profiler.stop()
+        finally:
+            self.duration = time.perf_counter() - self.started
+            _slot.release()
+
+    def save(self):
+        """Store the flame graph, a failure is only logged so the profiled request or task is unaffected"""
+        name = f"{self.kind}-{slugify(self.target)[:100]}.speedscope.json"
+        try:
+            output = self.profiler.output(renderers.SpeedscopeRenderer())
+            return ProfileReport.objects.create(
+                kind=self.kind, target=self.target[:255], trigger=self.trigger, rule_id=self.rule_id,
+                duration=self.duration, file=ContentFile(output.encode('utf-8'), name=name)
+            )
+        except Exception as e:
+            print(f"Saving profile of {self.target} failed: {e}")
+            return None
+
+
+def begin(kind, target, request=None, async_mode='disabled'):
+    """
+    Session when the profiler should sample this request or task, else None.
+    Triggered by the X-Profile header carrying PROFILER_TOKEN or by an active
+    ProfilingRule. Expects the rules to be refreshed already so async callers
+    can do that off the event loop.
+    """
+    rule_id = None
+    if request is not None and headerRequested(request):
+        trigger = 'header'
+    else:
+        rule_id = pickRule(kind, target)
+        if rule_id is None:
+            return None
+        trigger = 'rule'
+    if not _slot.acquire(blocking=False):
+        return None
+    if not withinBudget():
+        _slot.release()
+        return None
+    return Session(kind, target, trigger, rule_id, async_mode)
+
+
+# Sessions of the tasks running in this worker process
+_task_sessions = {}
+
+
+@task_prerun.connect
+def profileTask(task_id=None, task=None, **kwargs):
+    if rulesStale():
+        refreshRules()
+    session = begin('task', task.name)
+    if session is not None:
+        _task_sessions[task_id] = session
+        session.start()
+
+
+@task_postrun.connect
+def saveTaskProfile(task_id=None, **kwargs):
+    session = _task_sessions.pop(task_id, None)
+    if session is not None:
+        session.stop()
+        session.save()
@@ -0,0 +1,133 @@
+###############################################################################
+# Filename: stac.py                                                            #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import json
+import os
+from urllib.parse import urljoin
+import requests
+from django.utils.dateparse import parse_datetime
+
+
+def parseBbox(value):
+    """STAC bbox query parameter to (minx, miny, maxx, maxy)"""
+    if isinstance(value, str):
+        value = value.split(',')
+    bbox = [float(v) for v in value]
+    if len(bbox) == 6:
+        # 3D bbox, drop the elevation
+        bbox = [bbox[0], bbox[1], bbox[3], bbox[4]]
+    if len(bbox) != 4:
+        raise ValueError("bbox must have 4 or 6 numbers")
+    if bbox[0] > bbox[2] or bbox[1] > bbox[3]:
+        raise ValueError("bbox minimum is larger than its maximum")
+    return tuple(bbox)
+
+
+def parseDatetimeInterval(value):
+    """
+    STAC datetime query parameter to a (start, end) tuple.
+    A single datetime returns it as both ends, open ends ('..' or empty) are None.
+    """
+    parts = value.split('/')
+    if len(parts) > 2:
+        raise ValueError("datetime must be a datetime or an interval")
+
+    def parse(part):
+        if part in ('', '..'):
+            return None
+        parsed = parse_datetime(part)
+        if parsed is None:
+            raise ValueError(f"Invalid datetime {part}")
+        return parsed
+
+    if len(parts) == 1:
+        start = end = parse(parts[0])
+        if start is None:
+            raise ValueError("datetime must not be open")
+        return start, end
+    start, end = parse(parts[0]), parse(parts[1])
+    if start is None and end is None:
+        raise ValueError("datetime interval must not be open at both ends")
+    if start is not None and end is not None and start > end:
+        raise ValueError("datetime interval starts after it ends")
+    return start, end
+
+
+def readJson(href):
+    if href.startswith(('http://', 'https://')):
+        r = requests.get(href)
+        r.raise_for_status()
+        return r.json()
+    with open(href) as f:
+        return json.load(f)
+
+
+def walkCatalog(href):
+    """
+    Yield (collection_id, item) for every item below a static STAC catalog.
+    Absolute local links written on another machine are rebased onto the
+    directory the catalog was read from.
+    """
+    root = readJson(href)
+    root_dir = os.path.dirname(href)
+    written_at = next((link['href'] for link in root.get('links', []) if link['rel'] in ('self', 'root')), href)
+    written_dir = os.path.dirname(written_at)
+
+    def resolve(link_href, base):
+        if link_href.startswith(('http://', 'https://')):
+            return link_href
+        if base.startswith(('http://', 'https://')):
+            return urljoin(base, link_href)
+        if not os.path.isabs(link_href):
+            return os.path.normpath(os.path.join(os.path.dirname(base), link_href))
+        if not os.path.exists(link_href) and link_href.startswith(written_dir):
+            return root_dir + link_href[len(written_dir):]
+        return link_href
+
+    stack = [(href, root, None)]
+    seen = set()
+    while stack:
+        node_href, node, collection_id = stack.pop()
+        if node.get('type') == 'Collection':
+            collection_id = node['id']
+        for link in node.get('links', []):
+            if link['rel'] not in ('child', 'item'):
+                continue
+            link_href = resolve(link['href'], node_href)
+            if link_href in seen:
+                continue
+            seen.add(link_href)
+            child = readJson(link_href)
+            if link['rel'] == 'item':
+                yield child.get('collection', collection_id), child
+            else:
+                stack.append((link_href, child, collection_id))
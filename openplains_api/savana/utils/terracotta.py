@@ -0,0 +1,102 @@
+###############################################################################
+# Filename: terracotta.py                                                      #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+from django.conf import settings
+import contextlib
+import fcntl
+import os
+import subprocess
+from .lazy import lazyImport
+
+tc = lazyImport('terracotta')
+
+TERRACOTTA_SETTINGS = settings.TERRACOTTA
+
+# Every actinia export is ingested under these keys. resource is the actinia
+# resource id, so exports of the same layer by different jobs don't collide.
+KEYS = ['model', 'scenario', 'layer', 'time', 'resource']
+
+
+@contextlib.contextmanager
+def databaseLock():
+    """
+    Exclusive lock on the terracotta database across worker processes. SQLite takes
+    a single writer, concurrent terracottaIngest tasks would race to create the
+    database and fail their inserts with "database is locked".
+    """
+    db_path = TERRACOTTA_SETTINGS['TERRACOTTA_DB']
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    with open(f"{db_path}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def driver():
+    """Terracotta metadata database, created on first use. Call with databaseLock held."""
+    db_path = TERRACOTTA_SETTINGS['TERRACOTTA_DB']
+    tc_driver = tc.get_driver(db_path)
+    if not os.path.isfile(db_path):
+        tc_driver.create(KEYS, key_descriptions={
+            'model': 'OpenPlains model id',
+            'scenario': 'Model scenario',
+            'layer': 'Exported raster name',
+            'time': 'Date the actinia job was accepted (YYYYMMDD)',
+            'resource': 'actinia resource id of the job that exported the raster'
+        })
+    return tc_driver
+
+
+def optimizeRaster(user_id, resource_id, path):
+    """Convert an actinia export to a COG in the resource's own terracotta data directory"""
+    out_dir = os.path.join(TERRACOTTA_SETTINGS['TERRACOTTA_DATA'], user_id, resource_id)
+    os.makedirs(out_dir, exist_ok=True)
+    subprocess.run(
+        ['terracotta', 'optimize-rasters', path, '-o', out_dir, '--overwrite', '--quiet'],
+        check=True
+    )
+    return os.path.join(out_dir, os.path.basename(path))
+
+
+def ingestRaster(keys, path):
+    """
+    Insert a raster into the terracotta database. Inserting computes the
+    metadata, including the percentiles used for default stretches, so the
+    first tile request doesn't have to read the whole raster.
+    """
+    with databaseLock():
+        tc_driver = driver()
+        with tc_driver.connect():
+            tc_driver.insert(keys, path)
+        return tc_driver.get_metadata(keys)
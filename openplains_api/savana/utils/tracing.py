@@ -0,0 +1,121 @@
+###############################################################################
+# Filename: tracing.py                                                         #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import contextlib
+from django.conf import settings
+from django.core.cache import cache
+from opentelemetry import trace
+from opentelemetry.propagate import extract, inject
+
+tracer = trace.get_tracer('savana')
+
+# Actinia generates its own resource ids, so the trace of the request that
+# submitted a job is remembered per resource id for the pollers and websockets
+JOB_TRACE_TTL = 7 * 24 * 60 * 60
+
+
+def configure(service_name, celery=False):
+    """
+    Install the OTLP exporter and the Django, Celery, requests and httpx
+    instrumentation. Call once per process before the Django handler loads its
+    middleware, for Celery in each pool process because the batch exporter
+    thread doesn't survive the fork.
+    """
+    if not settings.OTEL_ENABLED:
+        return
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+    from opentelemetry.instrumentation.celery import CeleryInstrumentor
+    from opentelemetry.instrumentation.django import DjangoInstrumentor
+    from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+    from opentelemetry.instrumentation.requests import RequestsInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    provider = TracerProvider(resource=Resource.create({'service.name': service_name}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT, insecure=True)))
+    trace.set_tracer_provider(provider)
+    RequestsInstrumentor().instrument()
+    HTTPXClientInstrumentor().instrument()
+    # Also needed where tasks are published, it injects the context into the task headers
+    CeleryInstrumentor().instrument()
+    if not celery:
+        DjangoInstrumentor().instrument()
+
+
+def jobKey(resource_id):
+    return f"trace_job_{resource_id}"
+
+
+def carrier():
+    headers = {}
+    inject(headers)
+    return headers
+
+
+def traceparent():
+    """W3C traceparent of the current span, None when not tracing"""
+    return carrier().get('traceparent')
+
+
+def stamp(message):
+    """Add the traceparent of the current span to a channel message, only when tracing"""
+    parent = traceparent()
+    if parent is not None:
+        message['traceparent'] = parent
+    return message
+
+
+def rememberJob(resource_id):
+    """Tie an actinia job to the current trace"""
+    span = trace.get_current_span()
+    span.set_attribute('actinia.resource_id', resource_id)
+    headers = carrier()
+    if headers:
+        cache.set(jobKey(resource_id), headers, JOB_TRACE_TTL)
+
+
+def jobContext(resource_id, parent=None):
+    """Context of an event carrying a traceparent, or else of the request that submitted the job"""
+    if parent:
+        return extract({'traceparent': parent})
+    return extract(cache.get(jobKey(resource_id)) or {})
+
+
+def jobSpan(name, resource_id, parent=None):
+    """Span continuing the trace of an actinia job, nothing when tracing is off"""
+    if not settings.OTEL_ENABLED:
+        # Skips the cache lookup of the job's trace on every websocket event
+        return contextlib.nullcontext()
+    return tracer.start_as_current_span(
+        name, context=jobContext(resource_id, parent), attributes={'actinia.resource_id': resource_id}
+    )
@@ -0,0 +1,212 @@
+###############################################################################
+# Filename: zonal.py                                                           #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import hashlib
+import math
+import os
+import requests
+from django.contrib.gis.gdal import GDALRaster
+from .lazy import lazyImport
+
+np = lazyImport('numpy')
+
+# Rows read per strip in exact mode, a multiple of the 512px COG blocks
+STRIP_ROWS = 512
+
+# Upper bound of the rows x edges crossing matrix built per strip
+MAX_CROSSINGS = 4_000_000
+
+# Longest side of the window read for a zone in approximate mode
+APPROXIMATE_SIDE = 1024
+
+
+def rasterizeRings(rings, rows, cols, row_offset=0):
+    """
+    Boolean mask of the pixels whose centers fall inside polygon rings (even-odd
+    rule, so holes are excluded). Rings are (N, 2) arrays of pixel coordinates
+    relative to the window, row_offset selects the strip of the window to fill.
+    """
+    edges = np.concatenate([np.hstack([ring[:-1], ring[1:]]) for ring in rings])
+    x0, y0, x1, y1 = edges.T
+    ys = np.arange(row_offset, row_offset + rows)[:, None] + 0.5
+    crosses = (y0 <= ys) != (y1 <= ys)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        xs = np.where(crosses, x0 + (ys - y0) * (x1 - x0) / (y1 - y0), np.inf)
+    xs.sort(axis=1)
+    xs = xs[:, :max(int(crosses.sum(axis=1).max(initial=0)), 1)]
+    if xs.shape[1] % 2:
+        xs = np.hstack([xs, np.full((rows, 1), np.inf)])
+
+    # Fill between each pair of crossings with a running sum of +1/-1 markers
+    starts = np.clip(np.ceil(xs[:, 0::2] - 0.5), 0, cols).astype(np.int64)
+    ends = np.clip(np.ceil(xs[:, 1::2] - 0.5), 0, cols).astype(np.int64)
+    marks = np.zeros((rows, cols + 1), np.int32)
+    row_index = np.repeat(np.arange(rows), starts.shape[1])
+    np.add.at(marks, (row_index, starts.ravel()), 1)
+    np.add.at(marks, (row_index, ends.ravel()), -1)
+    return np.cumsum(marks[:, :cols], axis=1) > 0
+
+
+class ZoneStats:
+    """Running statistics of the pixel values of a zone"""
+
+    def __init__(self, categorical=False):
+        self.categorical = categorical
+        self.count = 0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.min = None
+        self.max = None
+        self.classes = {}
+
+    def add(self, values):
+        if values.size == 0:
+            return
+        values = values.astype(np.float64)
+        self.count += values.size
+        self.sum += values.sum()
+        self.sumsq += np.square(values).sum()
+        self.min = values.min() if self.min is None else min(self.min, values.min())
+        self.max = values.max() if self.max is None else max(self.max, values.max())
+        if self.categorical:
+            for value, count in zip(*np.unique(values, return_counts=True)):
+                key = str(int(value))
+                self.classes[key] = self.classes.get(key, 0) + int(count)
+
+    def result(self, pixel_area):
+        mean = self.sum / self.count if self.count else None
+        result = {
+            'count': self.count,
+            'area': self.count * pixel_area,
+            'min': float(self.min) if self.min is not None else None,
+            'max': float(self.max) if self.max is not None else None,
+            'mean': mean,
+            'std': math.sqrt(max(self.sumsq / self.count - mean * mean, 0)) if self.count else None,
+        }
+        if self.categorical:
+            result['classes'] = self.classes
+        return result
+
+
+def pixelRings(geom, geotransform, origin=(0, 0)):
+    """Rings of a (Multi)Polygon in pixel coordinates of a window starting at origin"""
+    x_origin, x_res, _, y_origin, _, y_res = geotransform
+    polygons = [geom] if geom.geom_type == 'Polygon' else list(geom)
+    rings = []
+    for polygon in polygons:
+        for ring in polygon:
+            coords = np.asarray(ring.coords, dtype=np.float64)
+            cols = (coords[:, 0] - x_origin) / x_res - origin[0]
+            rows = (coords[:, 1] - y_origin) / y_res - origin[1]
+            rings.append(np.column_stack([cols, rows]))
+    return rings
+
+
+def zoneWindow(geom, rst):
+    """Pixel window (xoff, yoff, width, height) of a geometry's extent, clipped to the raster"""
+    x_origin, x_res, _, y_origin, _, y_res = rst.geotransform
+    xmin, ymin, xmax, ymax = geom.extent
+    cols = sorted([(xmin - x_origin) / x_res, (xmax - x_origin) / x_res])
+    rows = sorted([(ymin - y_origin) / y_res, (ymax - y_origin) / y_res])
+    x0, x1 = max(int(math.floor(cols[0])), 0), min(int(math.ceil(cols[1])), rst.width)
+    y0, y1 = max(int(math.floor(rows[0])), 0), min(int(math.ceil(rows[1])), rst.height)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def zonalStats(path, zones, approximate=False, categorical=False):
+    """
+    Statistics of the first band of a raster for each zone.
+    Args:
+        path: Local path or /vsicurl/ url of the raster
+        zones: List of (zone_id, name, geometry) tuples, geometries must have an SRID
+        approximate: Read decimated windows, served from the COG overviews, instead of full resolution
+        categorical: Also count the pixels of each class value
+    """
+    rst = GDALRaster(path, write=False)
+    band = rst.bands[0]
+    nodata = band.nodata_value
+    base_area = abs(rst.geotransform[1] * rst.geotransform[5])
+    results = []
+
+    for zone_id, name, geom in zones:
+        geom = geom.transform(rst.srs, clone=True)
+        stats = ZoneStats(categorical)
+        pixel_area = base_area
+        window = zoneWindow(geom, rst)
+        if window is not None:
+            xoff, yoff, width, height = window
+            shape = (width, height)
+            if approximate and max(width, height) > APPROXIMATE_SIDE:
+                factor = max(width, height) / APPROXIMATE_SIDE
+                shape = (max(1, round(width / factor)), max(1, round(height / factor)))
+            x_scale, y_scale = width / shape[0], height / shape[1]
+            pixel_area = base_area * x_scale * y_scale
+            rings = [
+                np.column_stack([ring[:, 0] / x_scale, ring[:, 1] / y_scale])
+                for ring in pixelRings(geom, rst.geotransform, (xoff, yoff))
+            ]
+            # A smaller buffer than the window makes GDAL read from the overviews
+            decimated = band.data(offset=(xoff, yoff), size=(width, height), shape=shape) if shape != (width, height) else None
+            edges = sum(len(ring) for ring in rings)
+            strip_rows = max(1, min(STRIP_ROWS, MAX_CROSSINGS // max(edges, 1)))
+            for row in range(0, shape[1], strip_rows):
+                rows = min(strip_rows, shape[1] - row)
+                if decimated is not None:
+                    data = decimated[row:row + rows]
+                else:
+                    data = band.data(offset=(xoff, yoff + row), size=(width, rows))
+                mask = rasterizeRings(rings, rows, shape[0], row)
+                if nodata is not None:
+                    mask &= data != nodata
+                stats.add(data[mask])
+        results.append({'zone': zone_id, 'name': name, **stats.result(pixel_area)})
+    return results
+
+
+# Seconds to wait for the storage bucket when checking a COG for changes
+HEAD_TIMEOUT = 10
+
+
+def rasterVersion(path):
+    """Identifies the content of a raster so cached statistics are dropped when it changes"""
+    if path.startswith('/vsicurl/'):
+        headers = requests.head(path[len('/vsicurl/'):], allow_redirects=True, timeout=HEAD_TIMEOUT).headers
+        return headers.get('ETag') or headers.get('Last-Modified') or ''
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def cacheKey(path, version, zone_ids, approximate, categorical):
+    digest = hashlib.md5(f"{path}|{version}|{sorted(zone_ids)}|{approximate}|{categorical}".encode('utf-8')).hexdigest()
+    return f"zonal_stats_{digest}"
@@ -31,6 +31,9 @@
 ###############################################################################
 
 import os
+import json
+import posixpath
+from urllib.parse import quote, unquote, urlsplit
 from django.core.serializers import serialize
 from django.http.response import Http404
 from django.shortcuts import render
@@ -39,31 +42,47 @@ from django.http import FileResponse, HttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.views import APIView
 from django.views import generic
-from django.contrib.gis.geos import GEOSGeometry
+from django.contrib.gis.geos import GEOSGeometry, GEOSException
+from django.contrib.gis.gdal import GDALException
 from django.contrib.gis.db.models.functions import Distance
 from django.middleware.csrf import get_token
 
 from .models.OPModel import OpenPlainsModel
 from .models import TestGCSResourceModel
 from .models import DrainRequest
+from .models import ProcessingResponseModel
+from .models import ModuleTiming
+from .models import StacItem
 from .serializers import CreateModelSerializer, DrainRequestSerializer
+from .serializers import ProcessingResponseSerializer, ProcessingResponseDetailSerializer
+from .filters import ProcessingResponseFilter
+from .utils.stac import parseBbox, parseDatetimeInterval
+from .utils import zonal
+from .utils import metrics
+from .utils import tracing
+from .models import ModelExtent
+from world.models import County, Huc12
+from django.contrib.gis.db.models import Union
+from django.contrib.gis.db.models import Extent
+from django.db.models import Count, Min, Max, Q
+from asgiref.sync import sync_to_async
 from django.core.files.base import ContentFile
 from django.core.cache import cache
+from prometheus_client import CONTENT_TYPE_LATEST
 
 # from .serializers import WorldBorderSerializer
 from rest_framework import viewsets, generics
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.parsers import JSONParser
 from rest_framework import status
 from rest_framework.response import Response
-from knox.auth import TokenAuthentication
+from accounts.authentication import CachedTokenAuthentication
 from django.contrib.auth.models import User
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.gis.geos import Point, Polygon
 from .serializers import UserSerializer, OPModelSerializer
 
-import requests
 import base64
 
 from .utils import actinia as acp
@@ -77,6 +96,13 @@ def ping(request):
     return JsonResponse({'result': 'OK'})
 
 
+def exportMetrics(request):
+    """Prometheus scrape endpoint, only for scrapers with the metrics token"""
+    if not metrics.scrapeAllowed(request):
+        raise Http404
+    return HttpResponse(metrics.exposition(), content_type=CONTENT_TYPE_LATEST)
+
+
 class UserList(generics.ListAPIView):
     queryset = User.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -90,7 +116,7 @@ class UserDetail(generics.RetrieveAPIView):
 
 
 class OpModelList(APIView):
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticatedOrReadOnly,)
     # queryset = OpenPlainsModel.objects.all()
     # serializer_class = OPModelSerializer
@@ -110,7 +136,7 @@ class OpModelList(APIView):
 
 class OpModelDetails(APIView):
     """View an OpenPlains model's details"""
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticatedOrReadOnly,)
     queryset = OpenPlainsModel.objects.all()
     serializer_class = OPModelSerializer
@@ -140,9 +166,240 @@ class OpModelDetails(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+def ownedResponses(queryset, user):
+    """
+    Jobs a user may see, their own ones or all of them for staff. Model setup jobs
+    are queued by a task without an owner, they belong to the model's owner.
+    """
+    return queryset if user.is_staff else queryset.filter(Q(owner=user) | Q(model__owner=user))
+
+
+class ProcessingResponseList(generics.ListAPIView):
+    """List the actinia jobs recorded from submissions and status polling"""
+    queryset = ProcessingResponseModel.objects.select_related('owner')
+    permission_classes = [IsAuthenticated]
+    serializer_class = ProcessingResponseSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ProcessingResponseFilter
+
+    def get_queryset(self):
+        return ownedResponses(super().get_queryset(), self.request.user)
+
+
+class ProcessingResponseDetail(generics.RetrieveAPIView):
+    """Latest recorded state of an actinia job with its process log and status history"""
+    queryset = ProcessingResponseModel.objects.select_related('owner').prefetch_related('status_events')
+    permission_classes = [IsAuthenticated]
+    serializer_class = ProcessingResponseDetailSerializer
+    lookup_field = 'resource_id'
+
+    def get_queryset(self):
+        return ownedResponses(super().get_queryset(), self.request.user)
+
+
+class ModuleProfileReport(APIView):
+    """Run time profile of GRASS modules across finished actinia jobs"""
+    permission_classes = (IsAuthenticatedOrReadOnly,)
+
+    def get(self, request, format=None):
+        return Response({"modules": ModuleTiming.objects.report()})
+
+
+def stacBaseUrl(request):
+    return request.build_absolute_uri('/savana/stac/')
+
+
+def stacError(description):
+    return Response({"code": "InvalidParameterValue", "description": description}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class StacSearch(APIView):
+    """
+    STAC API item search over the indexed project rasters and actinia exports
+    GET|POST /stac/search?bbox=&datetime=&collections=&ids=&limit=&page=
+    """
+    permission_classes = (AllowAny,)
+
+    def get(self, request, format=None):
+        params = {
+            key: request.GET[key].split(',') if key in ('collections', 'ids') else request.GET[key]
+            for key in request.GET
+        }
+        return self.search(request, params, "GET")
+
+    def post(self, request, format=None):
+        return self.search(request, dict(request.data), "POST")
+
+    def search(self, request, params, method):
+        items = StacItem.objects.all()
+        try:
+            if params.get('collections'):
+                items = items.filter(collection__in=params['collections'])
+            if params.get('ids'):
+                items = items.filter(item_id__in=params['ids'])
+            if params.get('bbox'):
+                items = items.filter(geometry__intersects=Polygon.from_bbox(parseBbox(params['bbox'])))
+            if params.get('intersects'):
+                intersects = params['intersects']
+                if not isinstance(intersects, str):
+                    intersects = json.dumps(intersects)
+                items = items.filter(geometry__intersects=GEOSGeometry(intersects, srid=4326))
+            if params.get('datetime'):
+                start, end = parseDatetimeInterval(params['datetime'])
+                if start is not None:
+                    items = items.filter(end_datetime__gte=start)
+                if end is not None:
+                    items = items.filter(start_datetime__lte=end)
+            limit = min(max(int(params.get('limit', 10)), 1), 1000)
+            page = max(int(params.get('page', 1)), 1)
+        except (ValueError, TypeError, GEOSException, GDALException) as e:
+            return stacError(str(e))
+
+        matched = items.count()
+        offset = (page - 1) * limit
+        base_url = stacBaseUrl(request)
+        features = [item.to_stac(base_url) for item in items[offset:offset + limit]]
+
+        links = []
+        if offset + limit < matched:
+            if method == "GET":
+                query = request.GET.copy()
+                query['page'] = page + 1
+                links.append({"rel": "next", "href": f"{base_url}search?{query.urlencode()}", "method": "GET"})
+            else:
+                links.append({"rel": "next", "href": f"{base_url}search", "method": "POST", "body": {**params, "page": page + 1}})
+
+        return Response({
+            "type": "FeatureCollection",
+            "features": features,
+            "links": links,
+            "numberMatched": matched,
+            "numberReturned": len(features),
+        })
+
+
+class StacCollections(APIView):
+    """Collections of the indexed STAC items with their spatial and temporal extent"""
+    permission_classes = (AllowAny,)
+
+    def get(self, request, format=None):
+        base_url = stacBaseUrl(request)
+        collections = StacItem.objects.values('collection').annotate(
+            count=Count('id'),
+            start=Min('start_datetime'),
+            end=Max('end_datetime'),
+            extent=Extent('geometry')
+        ).order_by('collection')
+        return Response({
+            "collections": [
+                {
+                    "type": "Collection",
+                    "stac_version": "1.0.0",
+                    "id": c['collection'],
+                    "description": f"{c['count']} items",
+                    "license": "proprietary",
+                    "extent": {
+                        "spatial": {"bbox": [list(c['extent'])]},
+                        "temporal": {"interval": [[
+                            c['start'].isoformat() if c['start'] else None,
+                            c['end'].isoformat() if c['end'] else None
+                        ]]}
+                    },
+                    "links": [{"rel": "items", "href": f"{base_url}search?collections={c['collection']}", "type": "application/geo+json"}]
+                }
+                for c in collections
+            ],
+            "links": []
+        })
+
+
+class StacItemDetail(APIView):
+    """A single indexed STAC item"""
+    permission_classes = (AllowAny,)
+
+    def get(self, request, collection, item_id, format=None):
+        try:
+            item = StacItem.objects.get(collection=collection, item_id=item_id)
+        except StacItem.DoesNotExist:
+            raise Http404
+        return Response(item.to_stac(stacBaseUrl(request)))
+
+
+class ModelZonalStats(APIView):
+    """
+    Statistics of a raster per county or HUC12 of a model's extent
+    GET /models/{model_id}/zonal_stats/?resource_id=&raster=|url=&zones=county|huc12&mode=exact|approximate&categorical=true
+    """
+    permission_classes = (IsAuthenticatedOrReadOnly,)
+
+    def get_zones(self, model, zone_type):
+        extents = ModelExtent.objects.filter(model=model).select_related('county')
+        if zone_type == 'county':
+            return [(e.county.geoid, e.county.name, e.county.geom) for e in extents]
+        footprint = County.objects.filter(modelextent__model=model).aggregate(footprint=Union('geom'))['footprint']
+        if footprint is None:
+            return []
+        hucs = Huc12.objects.filter(geom__intersects=footprint).only('huc12', 'name', 'geom')
+        return [(h.huc12, h.name, h.geom) for h in hucs]
+
+    def get_raster(self, params):
+        if params.get('resource_id') and params.get('raster'):
+            path = acp.exportPath(acp.currentUser(), params['resource_id'], params['raster'])
+            return path if path is not None and os.path.isfile(path) else None
+        # Compare the decoded, normalised path so neither "../" nor "%2e%2e/" leaves the bucket
+        url = urlsplit(params.get('url', ''))
+        path = unquote(url.path)
+        if url.scheme != 'https' or url.netloc != 'storage.googleapis.com' or url.query or url.fragment:
+            return None
+        if '..' in path.split('/') or not posixpath.normpath(path).startswith('/tomorrownow-actinia-dev/'):
+            return None
+        return f"/vsicurl/https://storage.googleapis.com{quote(posixpath.normpath(path))}"
+
+    def get(self, request, model_id, format=None):
+        try:
+            model = OpenPlainsModel.objects.get(slug=model_id)
+        except OpenPlainsModel.DoesNotExist:
+            raise Http404
+
+        params = request.GET
+        path = self.get_raster(params)
+        if path is None:
+            return Response({"error": "Pass resource_id and raster of an actinia export, or the url of a project COG"}, status=status.HTTP_400_BAD_REQUEST)
+        zone_type = params.get('zones', 'county')
+        if zone_type not in ('county', 'huc12'):
+            return Response({"error": "zones must be county or huc12"}, status=status.HTTP_400_BAD_REQUEST)
+        approximate = params.get('mode', 'exact') == 'approximate'
+        categorical = params.get('categorical', '').lower() in ('1', 'true')
+
+        zones = self.get_zones(model, zone_type)
+        version = zonal.rasterVersion(path)
+        key = zonal.cacheKey(path, version, [zone[0] for zone in zones], approximate, categorical)
+        results = cache.get(key)
+        metrics.cacheResult('zonal_stats', results is not None)
+        if results is None:
+            results = zonal.zonalStats(path, zones, approximate=approximate, categorical=categorical)
+            cache.set(key, results, 60 * 60 * 24)
+
+        return Response({
+            "model": model.slug,
+            "zones": zone_type,
+            "mode": "approximate" if approximate else "exact",
+            "raster_version": version,
+            "results": results
+        })
+
+
+def recordSubmission(request, response):
+    """Record a job submitted to actinia on behalf of the requesting user"""
+    owner = request.user if request.user.is_authenticated else None
+    ProcessingResponseModel.objects.record([response], owner=owner)
+    if response.get('resource_id'):
+        tracing.rememberJob(response['resource_id'])
+
+
 def resourceStatus(user_id, resource_id):
     url = f"{acp.baseUrl()}/resources/{user_id}/{resource_id}"
-    r = requests.get(url, auth=acp.auth())
+    r = acp.session().get(url)
     data = r.json()
     print(f"resourceStatus: {r.status_code}")
     if r.status_code == 200:
@@ -153,7 +410,7 @@ def resourceStatus(user_id, resource_id):
             return resourceStatus(user_id, resource_id)
 
 
-def gLocations(request):
+async def gLocations(request):
     """
     Gets List of Users Avaliable Locations
     Actinia Route
@@ -161,7 +418,7 @@ def gLocations(request):
     """
     if request.method == 'GET':
         url = f"{acp.baseUrl()}/locations"
-        r = requests.get(url, auth=acp.auth())
+        r = await acp.asyncClient().get(url)
         print(f"Request URL: {url}")
         return JsonResponse({"response": r.json()}, safe=False)
 
@@ -182,13 +439,13 @@ def gLocation(request, location_name):
     url = f"{acp.baseUrl()}/locations/{location_name}"
     if request.method == 'POST':
         data = request.data
-        r = requests.post(url, auth=acp.auth(), json=data)
+        r = acp.session().post(url, json=data)
         print(f"Request URL: {url}")
         cache.delete('grass_locations')
         return JsonResponse({"response": r.json()}, safe=False)
 
     if request.method == 'DELETE':
-        r = requests.delete(url, auth=acp.auth())
+        r = acp.session().delete(url)
         print(f"Request URL: {url}")
         if r.status_code == 200:
             return JsonResponse({"response": r.json()}, safe=False)
@@ -199,7 +456,7 @@ def gLocation(request, location_name):
     return JsonResponse({"error": "gLocation View: Fix Me"})
 
 
-def gLocationInfo(request, location_name):
+async def gLocationInfo(request, location_name):
     """
     Get the location projection and current computational region of the PERMANENT mapset
     Actinia Route
@@ -207,7 +464,7 @@ def gLocationInfo(request, location_name):
     """
     if request.method == 'GET':
         url = f"{acp.baseUrl()}/locations/{location_name}/info"
-        r = requests.get(url, auth=acp.auth())
+        r = await acp.asyncClient().get(url)
         print(f"Request URL: {url}")
         return JsonResponse({"response": r.json()}, safe=False)
 
@@ -215,7 +472,7 @@ def gLocationInfo(request, location_name):
     return JsonResponse({"error": "gLocations View: Fix Me"})
 
 
-def gMapsets(request, location_name):
+async def gMapsets(request, location_name):
     """
     Get a list of all mapsets that are located in a specific location.
     Actinia Route
@@ -223,7 +480,7 @@ def gMapsets(request, location_name):
     """
     url = f"{acp.baseUrl()}/locations/{location_name}/mapsets"
     if request.method == 'GET':
-        r = requests.get(url, auth=acp.auth())
+        r = await acp.asyncClient().get(url)
         print(f"Request URL: {url}")
         print(r)
         return JsonResponse({"response": r.json()}, safe=False)
@@ -244,13 +501,13 @@ def gMapset(request, location_name, mapset_name):
     """
     url = f"{acp.baseUrl()}/locations/{location_name}/mapsets/{mapset_name}"
     if request.method == 'POST':
-        r = requests.post(url, auth=acp.auth())
+        r = acp.session().post(url)
         print(f"Request URL: {url}")
         # cache.delete_many(keys=cache.keys('*.grass_locations.*'))
         return JsonResponse({"response": r.json()}, safe=False)
 
     if request.method == 'DELETE':
-        r = requests.delete(url, auth=acp.auth())
+        r = acp.session().delete(url)
         print(f"Request URL: {url}")
         if r.status_code == 200:
             # cache.delete_many(keys=cache.keys('*.grass_locations.*'))
@@ -275,19 +532,19 @@ def gMapsetLock(request, location_name, mapset_name):
     url = f"{acp.baseUrl()}/locations/{location_name}/mapsets/{mapset_name}/lock"
 
     if request.method == 'GET':
-        r = requests.get(url, auth=acp.auth())
+        r = acp.session().get(url)
         print(f"Request URL: {url}")
         # cache.delete_many(keys=cache.keys('*.grass_locations.*'))
         return JsonResponse({"response": r.json()}, safe=False)
 
     if request.method == 'POST':
-        r = requests.post(url, auth=acp.auth())
+        r = acp.session().post(url)
         print(f"Request URL: {url}")
         # cache.delete_many(keys=cache.keys('*.grass_locations.*'))
         return JsonResponse({"response": r.json()}, safe=False)
 
     if request.method == 'DELETE':
-        r = requests.delete(url, auth=acp.auth())
+        r = acp.session().delete(url)
         print(f"Request URL: {url}")
         if r.status_code == 200:
             # cache.delete_many(keys=cache.keys('*.grass_locations.*'))
@@ -299,7 +556,7 @@ def gMapsetLock(request, location_name, mapset_name):
     return JsonResponse({"error": "gLocation View: Fix Me"})
 
 
-def gMapsetInfo(request, location_name, mapset_name):
+async def gMapsetInfo(request, location_name, mapset_name):
     """
     Get mapsets info.
     Actinia Route
@@ -307,7 +564,7 @@ def gMapsetInfo(request, location_name, mapset_name):
     """
     url = f"{acp.baseUrl()}/locations/{location_name}/mapsets/{mapset_name}/info"
     if request.method == 'GET':
-        r = requests.get(url, auth=acp.auth())
+        r = await acp.asyncClient().get(url)
         print(f"Request URL: {url}")
         print(r)
         return JsonResponse({"response": r.json()}, safe=False)
@@ -317,7 +574,7 @@ def gMapsetInfo(request, location_name, mapset_name):
 
 
 # Create your views here.
-def gListRasters(request, location_name, mapset_name):
+async def gListRasters(request, location_name, mapset_name):
     """
     Get list of raster layers in mapset.
     Actinia Route
@@ -325,13 +582,13 @@ def gListRasters(request, location_name, mapset_name):
     """
     url = f"{acp.baseUrl()}/locations/{location_name}/mapsets/" \
           f"{mapset_name}/raster_layers"
-    r = requests.get(url, auth=acp.auth())
+    r = await acp.asyncClient().get(url)
     print(f"Request URL: {url}")
     return JsonResponse({"response": r.json()}, safe=False)
 
 
 # Create your views here.
-def gListVectors(request, location_name, mapset_name):
+async def gListVectors(request, location_name, mapset_name):
     """
     Get list of vector layers in mapset.
     Actinia Route
@@ -339,13 +596,13 @@ def gListVectors(request, location_name, mapset_name):
     """
     url = f"{acp.baseUrl()}/locations/{location_name}/mapsets/" \
           f"{mapset_name}/vector_layers"
-    r = requests.get(url, auth=acp.auth())
+    r = await acp.asyncClient().get(url)
     print(f"Request URL: {url}")
     print(r)
     return JsonResponse({"response": r.json()}, safe=False)
 
 
-def rRenderImage(request, location_name, raster_name, mapset_name):
+async def rRenderImage(request, location_name, raster_name, mapset_name):
     """
     Get png image of raster
     Actinia Route
@@ -355,14 +612,14 @@ def rRenderImage(request, location_name, raster_name, mapset_name):
     url = f"{acp.baseUrl()}/locations/{location_name}/mapsets/" \
           f"{mapset_name}/raster_layers/{raster_name}/render"
 
-    r = requests.get(url, auth=acp.auth(), stream=True)
+    r = await acp.asyncClient().get(url)
 
     if r.status_code == 200:
         decode = base64.b64encode(r.content).decode('utf-8')
         return JsonResponse({"response": {"imagedata": decode, "raster_name": raster_name}}, safe=False)
 
 
-def vRenderImage(request, location_name, vector_name, mapset_name):
+async def vRenderImage(request, location_name, vector_name, mapset_name):
     """
     Get png image of vector
     Actinia Route
@@ -372,14 +629,14 @@ def vRenderImage(request, location_name, vector_name, mapset_name):
     url = f"{acp.baseUrl()}/locations/{location_name}/mapsets/" \
           f"{mapset_name}/vector_layers/{vector_name}/render"
 
-    r = requests.get(url, auth=acp.auth(), stream=True)
+    r = await acp.asyncClient().get(url)
 
     if r.status_code == 200:
         decode = base64.b64encode(r.content).decode('utf-8')
         return JsonResponse({"response": {"imagedata": decode, "raster_name": vector_name}}, safe=False)
 
 
-def rInfo(request, location_name, mapset_name, raster_name):
+async def rInfo(request, location_name, mapset_name, raster_name):
     """
     Get raster info using r.info
     Actinia Route
@@ -389,12 +646,12 @@ def rInfo(request, location_name, mapset_name, raster_name):
     url = f"{acp.baseUrl()}/locations/{location_name}/mapsets/" \
           f"{mapset_name}/raster_layers/{raster_name}"
 
-    r = requests.get(url, auth=acp.auth())
+    r = await acp.asyncClient().get(url)
     print(f"Request URL: {url}")
     return JsonResponse({"response": r.json()}, safe=False)
 
 
-def vInfo(request, location_name, mapset_name, vector_name):
+async def vInfo(request, location_name, mapset_name, vector_name):
     """
     Get raster info using r.info
     Actinia Route
@@ -404,12 +661,12 @@ def vInfo(request, location_name, mapset_name, vector_name):
     url = f"{acp.baseUrl()}/locations/{location_name}/mapsets/" \
           f"{mapset_name}/vector_layers/{vector_name}"
 
-    r = requests.get(url, auth=acp.auth())
+    r = await acp.asyncClient().get(url)
     print(f"Request URL: {url}")
     return JsonResponse({"response": r.json()}, safe=False)
 
 
-def rColors(request, location_name, mapset_name, raster_name):
+async def rColors(request, location_name, mapset_name, raster_name):
     """
     Get a list of all mapsets that are located in a specific location.
     Actinia Route
@@ -418,7 +675,7 @@ def rColors(request, location_name, mapset_name, raster_name):
     url = f"{acp.baseUrl()}/locations/{location_name}/mapsets" \
           f"/{mapset_name}/raster_layers/{raster_name}/colors"
     if request.method == 'GET':
-        r = requests.get(url, auth=acp.auth())
+        r = await acp.asyncClient().get(url)
         print(f"Request URL: {url}")
         print(r)
         return JsonResponse({"response": r.json()}, safe=False)
@@ -428,7 +685,7 @@ def rColors(request, location_name, mapset_name, raster_name):
 
 
 # @csrf_exempt
-def rGeoTiff(request, location_name, mapset_name, raster_name):
+async def rGeoTiff(request, location_name, mapset_name, raster_name):
     """
     Get GeoTiff of an existing raster map layer
     Export an existing raster map layer as GTiff or COG (if COG driver available). 
@@ -440,12 +697,13 @@ def rGeoTiff(request, location_name, mapset_name, raster_name):
     url = f"{acp.baseUrl()}/locations/{location_name}/mapsets/" \
         f"{mapset_name}/raster_layers/{raster_name}/geotiff_async_orig"
 
-    r = requests.post(url, auth=acp.auth())
+    r = await acp.asyncClient().post(url)
 
     if r.status_code == 200:
         jsonResponse = r.json()
         print(f"Response: {r.json()}")
         resource_id = jsonResponse['resource_id']
+        await sync_to_async(recordSubmission)(request, jsonResponse)
 
         viewResponse = {
             "response": {
@@ -1128,13 +1386,14 @@ def rDrain(request):
         ]
         pc = acp.create_actinia_process_chain(grass_commands)
         print(f"Process Chain: {pc}")
-        r = requests.post(
-            url, auth=acp.auth(),
+        r = acp.session().post(
+            url,
             json=pc,
             headers={"content-type": "application/json; charset=utf-8"}
         )
         jsonResponse = r.json()
         print(f"Response: {r.json()}")
+        recordSubmission(request, jsonResponse)
         requestModel = DrainRequestSerializer(data={"point": db_point, "huc12": huc12}, context={'request': request})
         if (requestModel.is_valid()):
             print("serializer data:", requestModel.validated_data)
@@ -1143,7 +1402,7 @@ def rDrain(request):
             return JsonResponse({'route': 'r.drain', 'params': request.data, 'pc': pc, 'response': jsonResponse, 'errors': requestModel.errors})
 
 
-def gModules(request):
+async def gModules(request):
     """
     Get a list of all grass modules that are avaliable to user.
     Actinia Route
@@ -1158,8 +1417,8 @@ def gModules(request):
 
     url = f"{acp.baseUrl()}/grass_modules"
     if request.method == 'GET':
-        query_params = request.GET
-        r = requests.get(url, auth=acp.auth(), params=query_params)
+        query_params = dict(request.GET.lists())
+        r = await acp.asyncClient().get(url, params=query_params)
         print(f"Request URL: {url}")
         print(r)
         return JsonResponse({"response": r.json()}, safe=False)
@@ -1168,7 +1427,7 @@ def gModules(request):
     return JsonResponse({"error": "gModules View: Fix Me"})
 
 
-def gModule(request, grassmodule):
+async def gModule(request, grassmodule):
     """
     Gets details about a Grass Module.
     Actinia Route
@@ -1177,7 +1436,7 @@ def gModule(request, grassmodule):
 
     url = f"{acp.baseUrl()}/grass_modules/{grassmodule}"
     if request.method == 'GET':
-        r = requests.get(url, auth=acp.auth())
+        r = await acp.asyncClient().get(url)
         print(f"Request URL: {url}")
         print(r)
         if r.status_code == 200:
@@ -10,7 +10,6 @@ from django.contrib.gis.db.models.functions import Distance
 from .serializers import WorldBorderSerializer, CountyBoarderSerializer
 from rest_framework import viewsets, generics
 from .filters import WorldPopulationFilter   
-import requests
 
 # Create your views here.
 
@@ -1,4 +1,6 @@
 #!/bin/bash
+# actinia exports are optimized and ingested automatically by the savana.tasks.terracottaIngest
+# celery task, this script is only needed for data that did not come from actinia.
 # Example workflow
 # mkdir -p optimized
 # for file in *.TIF
@@ -5,7 +5,7 @@
 # Author: Corey White (smortopahri@gmail.com)                                  #
 # Maintainer: Corey White                                                      #
 # -----                                                                        #
-# Last Modified: Thu Mar 24 2022                                               #
+# Last Modified: Mon Oct 19 2026                                               #
 # Modified By: Corey White                                                     #
 # -----                                                                        #
 # License: GPLv3                                                               #
@@ -32,9 +32,46 @@
 
 
 from fastapi import FastAPI
+from starlette.middleware.cors import CORSMiddleware
+from titiler.core.errors import DEFAULT_STATUS_CODES, add_exception_handlers
+from titiler.core.factory import TilerFactory
+from titiler.core.middleware import CacheControlMiddleware
+
+from .cache import TileCache, TileCacheMiddleware
+from .dependencies import DatasetPathParams
+from .nlcd import router as nlcd_router
+from .settings import api_settings
+
+api = FastAPI(title=api_settings.name)
+
+tile_cache = TileCache(api_settings.tile_cache_bytes)
+
+# XYZ tiles, previews and point queries for actinia exported COGs and the GCS NLCD/DEM COGs
+cog = TilerFactory(router_prefix="cog", path_dependency=DatasetPathParams)
+api.include_router(cog.router, prefix="/cog", tags=["Cloud Optimized GeoTIFF"])
+
+# NLCD land cover years and change between years
+api.include_router(nlcd_router, prefix="/nlcd", tags=["NLCD"])
+
+add_exception_handlers(api, DEFAULT_STATUS_CODES)
+
+api.add_middleware(TileCacheMiddleware, cache=tile_cache, cachecontrol=api_settings.cog_cachecontrol)
+api.add_middleware(CacheControlMiddleware, cachecontrol=api_settings.cachecontrol)
+api.add_middleware(
+    CORSMiddleware,
+    allow_origins=api_settings.origins,
+    # Tiles are public, and credentials can't be combined with a wildcard origin
+    allow_credentials=False,
+    allow_methods=["GET"],
+    allow_headers=["*"],
+)
 
-api = FastAPI()
 
 @api.get("/")
 def read_root():
-    return {"message": "Hello world!"}
\ No newline at end of file
+    return {"message": "Hello world!"}
+
+
+@api.get("/healthz")
+def health():
+    return {"status": "ok", "tile_cache": tile_cache.stats()}
@@ -0,0 +1,179 @@
+###############################################################################
+# Filename: cache.py                                                           #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import os
+from collections import OrderedDict
+from urllib.parse import parse_qs
+
+
+class TileCache:
+    """In-process LRU cache of rendered responses, bounded by total bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key, headers, body):
+        if len(body) > self.max_bytes:
+            return
+        if key in self.entries:
+            self.size -= len(self.entries.pop(key)[1])
+        self.entries[key] = (headers, body)
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def stats(self):
+        return {
+            'entries': len(self.entries),
+            'bytes': self.size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+class TileCacheMiddleware:
+    """
+    ASGI middleware serving successful GET responses for tile, preview and point
+    routes from a TileCache. Panning the map re-requests the same tiles, which
+    otherwise re-read and re-encode the COG blocks every time.
+
+    Responses of local COGs, which are rewritten in place, carry an ETag of the
+    file version and a short Cache-Control instead of the long one used for the
+    immutable remote datasets. A browser revalidating an unchanged tile gets a 304.
+    """
+
+    cached_routes = ('/tiles/', '/preview', '/point/', '/crop/')
+
+    def __init__(self, app, cache, cachecontrol):
+        self.app = app
+        self.cache = cache
+        self.cachecontrol = cachecontrol
+
+    def cacheable(self, scope):
+        return scope['type'] == 'http' and scope['method'] == 'GET' and \
+            any(route in scope['path'] for route in self.cached_routes)
+
+    @staticmethod
+    def datasetVersion(query_string):
+        """
+        Version of the local COG a request reads, so tiles are dropped when the
+        file is rewritten in place (cogPostprocess replaces actinia exports).
+        Empty for remote datasets, None if the file can't be read.
+        """
+        url = parse_qs(query_string).get('url', [''])[0]
+        if not url.startswith('/'):
+            return ''
+        try:
+            stat = os.stat(url)
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def validators(self, version):
+        """ETag and Cache-Control headers of a local COG version"""
+        if not version:
+            return []
+        return [(b'etag', f'W/"{version}"'.encode()), (b'cache-control', self.cachecontrol.encode())]
+
+    @staticmethod
+    def withHeaders(send, extra):
+        """Wrap send to add headers to successful responses"""
+        async def wrapped(message):
+            if message['type'] == 'http.response.start' and extra and message.get('status') == 200:
+                names = {name for name, _ in extra}
+                headers = [(k, v) for k, v in message.get('headers', []) if k.lower() not in names]
+                message = dict(message, headers=headers + extra)
+            await send(message)
+        return wrapped
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] != 'GET':
+            await self.app(scope, receive, send)
+            return
+
+        query_string = scope['query_string'].decode()
+        version = self.datasetVersion(query_string)
+        if version is None:
+            await self.app(scope, receive, send)
+            return
+
+        validators = self.validators(version)
+        if validators:
+            if_none_match = dict(scope['headers']).get(b'if-none-match', b'')
+            if validators[0][1] in [tag.strip() for tag in if_none_match.split(b',')]:
+                await send({'type': 'http.response.start', 'status': 304, 'headers': validators})
+                await send({'type': 'http.response.body', 'body': b''})
+                return
+        send = self.withHeaders(send, validators)
+
+        if not self.cacheable(scope):
+            await self.app(scope, receive, send)
+            return
+
+        key = f"{scope['path']}?{query_string}#{version}"
+        entry = self.cache.get(key)
+        if entry is not None:
+            headers, body = entry
+            await send({'type': 'http.response.start', 'status': 200, 'headers': headers + [(b'x-tile-cache', b'hit')]})
+            await send({'type': 'http.response.body', 'body': body})
+            return
+
+        start = {}
+        chunks = []
+
+        async def capture(message):
+            if message['type'] == 'http.response.start':
+                start.update(message)
+                message = dict(message, headers=list(message.get('headers', [])) + [(b'x-tile-cache', b'miss')])
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+                if not message.get('more_body', False) and start.get('status') == 200:
+                    headers = [(k, v) for k, v in start.get('headers', []) if k.lower() != b'x-tile-cache']
+                    self.cache.set(key, headers, b''.join(chunks))
+            await send(message)
+
+        await self.app(scope, receive, capture)
@@ -0,0 +1,61 @@
+###############################################################################
+# Filename: dependencies.py                                                    #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import os
+
+from fastapi import HTTPException, Query
+
+from .settings import api_settings
+
+
+def DatasetPathParams(
+    url: str = Query(
+        ...,
+        description="Path of an actinia exported COG under /actinia_core/resources or a URL of a public TomorrowNow COG."
+    )
+) -> str:
+    """
+    Only serve actinia results and the project COGs, so the tiler can't be used
+    to read arbitrary files or proxy arbitrary URLs.
+    """
+    if url.startswith('/'):
+        path = os.path.normpath(url)
+        root = os.path.normpath(api_settings.actinia_resources)
+        if os.path.commonpath([path, root]) != root:
+            raise HTTPException(status_code=403, detail="Dataset path is outside of the actinia resources")
+        return path
+
+    if any(url.startswith(prefix) for prefix in api_settings.allowed_urls):
+        return url
+
+    raise HTTPException(status_code=403, detail="Dataset URL is not allowed")
+
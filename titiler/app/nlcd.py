@@ -0,0 +1,199 @@
+###############################################################################
+# Filename: nlcd.py                                                            #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+import json
+from functools import lru_cache
+from urllib.request import urlopen
+
+import numpy
+from fastapi import APIRouter, HTTPException, Path, Query, Request
+from fastapi.responses import Response
+from rio_tiler.io import Reader
+from rio_tiler.models import ImageData
+
+from .settings import api_settings
+
+NLCD_YEARS = [2001, 2004, 2006, 2008, 2011, 2013, 2016, 2019]
+
+NLCD_COG_URL = "https://storage.googleapis.com/tomorrownow-actinia-dev/nlcd/nlcd_{year}_cog.tif"
+
+# NLCD legend colors
+NLCD_COLORMAP = {
+    11: (70, 107, 159, 255),
+    12: (209, 222, 248, 255),
+    21: (222, 197, 197, 255),
+    22: (217, 146, 130, 255),
+    23: (235, 0, 0, 255),
+    24: (171, 0, 0, 255),
+    31: (179, 172, 159, 255),
+    41: (104, 171, 95, 255),
+    42: (28, 95, 44, 255),
+    43: (181, 197, 143, 255),
+    51: (175, 150, 60, 255),
+    52: (204, 184, 121, 255),
+    71: (223, 223, 194, 255),
+    72: (209, 209, 130, 255),
+    73: (163, 204, 81, 255),
+    74: (130, 186, 158, 255),
+    81: (220, 217, 57, 255),
+    82: (171, 108, 40, 255),
+    90: (184, 217, 235, 255),
+    95: (108, 159, 184, 255),
+}
+
+
+def default_index():
+    """STAC ItemCollection of the NLCD COGs used by the savana rDrain model"""
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "stac_version": "1.0.0",
+                "id": f"nlcd_{year}_cog",
+                "properties": {"datetime": f"{year}-01-01T00:00:00Z"},
+                "assets": {"data": {"href": NLCD_COG_URL.format(year=year), "type": "image/tiff; application=geotiff; profile=cloud-optimized"}},
+                "geometry": None,
+                "links": []
+            }
+            for year in NLCD_YEARS
+        ]
+    }
+
+
+@lru_cache(maxsize=1)
+def nlcd_index():
+    """
+    Map of year to COG href, read from the STAC ItemCollection at
+    TITILER_NLCD_INDEX when it is set so new years don't need a deploy.
+    """
+    if api_settings.nlcd_index:
+        if api_settings.nlcd_index.startswith("http"):
+            with urlopen(api_settings.nlcd_index) as f:
+                collection = json.load(f)
+        else:
+            with open(api_settings.nlcd_index) as f:
+                collection = json.load(f)
+    else:
+        collection = default_index()
+
+    return {
+        int(feature["properties"]["datetime"][:4]): feature["assets"]["data"]["href"]
+        for feature in collection["features"]
+    }
+
+
+def year_href(year):
+    href = nlcd_index().get(year)
+    if href is None:
+        raise HTTPException(status_code=404, detail=f"No NLCD layer for {year}, available years are {sorted(nlcd_index())}")
+    return href
+
+
+def read_tile(year, z, x, y):
+    with Reader(year_href(year)) as src:
+        return src.tile(x, y, z, tilesize=256, indexes=1, resampling_method="nearest")
+
+
+def png(image):
+    return Response(image.render(img_format="PNG", colormap=NLCD_COLORMAP), media_type="image/png")
+
+
+router = APIRouter()
+
+
+@router.get("/years")
+def years():
+    """Available NLCD years and their COGs"""
+    return [{"year": year, "href": href} for year, href in sorted(nlcd_index().items())]
+
+
+@router.get("/{year}/tiles/{z}/{x}/{y}.png", response_class=Response)
+def year_tile(
+    year: int = Path(..., description="NLCD year"),
+    z: int = Path(..., description="Tile zoom"),
+    x: int = Path(..., description="Tile column"),
+    y: int = Path(..., description="Tile row"),
+):
+    """NLCD land cover tile for a single year"""
+    return png(read_tile(year, z, x, y))
+
+
+@router.get("/change/{from_year}/{to_year}/tiles/{z}/{x}/{y}.png", response_class=Response)
+def change_tile(
+    from_year: int = Path(..., description="Earlier NLCD year"),
+    to_year: int = Path(..., description="Later NLCD year"),
+    z: int = Path(..., description="Tile zoom"),
+    x: int = Path(..., description="Tile column"),
+    y: int = Path(..., description="Tile row"),
+    show: str = Query("to", regex="^(from|to)$", description="Color changed pixels by their class in the earlier or later year"),
+):
+    """Pixels whose land cover class changed between two years, all other pixels are transparent"""
+    before = read_tile(from_year, z, x, y)
+    after = read_tile(to_year, z, x, y)
+    changed = (before.data[0] != after.data[0]) & (before.mask > 0) & (after.mask > 0)
+    source = before if show == "from" else after
+    image = ImageData(
+        source.data.copy(),
+        numpy.where(changed, 255, 0).astype("uint8"),
+        crs=source.crs,
+        bounds=source.bounds,
+    )
+    return png(image)
+
+
+@router.get("/tilejson.json")
+def tilejson(
+    request: Request,
+    year: int = Query(None, description="NLCD year"),
+    from_year: int = Query(None, description="Earlier NLCD year of a change layer"),
+    to_year: int = Query(None, description="Later NLCD year of a change layer"),
+):
+    """TileJSON for a year or change layer, so the land cover time slider can swap sources"""
+    if year is not None:
+        year_href(year)
+        path = f"{year}/tiles/{{z}}/{{x}}/{{y}}.png"
+    elif from_year is not None and to_year is not None:
+        year_href(from_year)
+        year_href(to_year)
+        path = f"change/{from_year}/{to_year}/tiles/{{z}}/{{x}}/{{y}}.png"
+    else:
+        raise HTTPException(status_code=400, detail="Pass year or from_year and to_year")
+
+    base = str(request.url_for("years")).rsplit("/years", 1)[0]
+    return {
+        "tilejson": "2.2.0",
+        "name": path,
+        "tiles": [f"{base}/{path}"],
+        "minzoom": 0,
+        "maxzoom": 14,
+    }
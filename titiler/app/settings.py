@@ -0,0 +1,64 @@
+###############################################################################
+# Filename: settings.py                                                        #
+# Project: TomorrowNow                                                         #
+# File Created: Monday October 19th 2026                                       #
+# Author: Corey White (smortopahri@gmail.com)                                  #
+# Maintainer: Corey White                                                      #
+# -----                                                                        #
+# Last Modified: Mon Oct 19 2026                                               #
+# Modified By: Corey White                                                     #
+# -----                                                                        #
+# License: GPLv3                                                               #
+#                                                                              #
+# Copyright (c) 2022 TomorrowNow                                               #
+#                                                                              #
+# TomorrowNow is an open-source geospatial participartory modeling platform    #
+# to enable stakeholder engagment in socio-environmental decision-makeing.     #
+#                                                                              #
+# This program is free software: you can redistribute it and/or modify         #
+# it under the terms of the GNU General Public License as published by         #
+# the Free Software Foundation, either version 3 of the License, or            #
+# (at your option) any later version.                                          #
+#                                                                              #
+# This program is distributed in the hope that it will be useful,              #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of               #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the                #
+# GNU General Public License for more details.                                 #
+#                                                                              #
+# You should have received a copy of the GNU General Public License            #
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.       #
+#                                                                              #
+###############################################################################
+
+from typing import List
+
+from pydantic import BaseSettings
+
+
+class ApiSettings(BaseSettings):
+    """Tile server settings, read from TITILER_* environment variables"""
+
+    name: str = "TomorrowNow Tiles"
+    cors_origins: str = "*"
+    cachecontrol: str = "public, max-age=86400"
+    # Local COGs can be rewritten in place, their responses are revalidated with an ETag
+    cog_cachecontrol: str = "public, max-age=60"
+    # Bytes of rendered tiles kept in memory, keyed on the COG's mtime so rewritten exports aren't served stale
+    tile_cache_bytes: int = 256 * 1024 * 1024
+    actinia_resources: str = "/actinia_core/resources"
+    allowed_urls: List[str] = [
+        "https://storage.googleapis.com/tomorrownow-actinia-dev/",
+    ]
+    # STAC ItemCollection of the NLCD year stack, path or URL
+    nlcd_index: str = ""
+
+    class Config:
+        env_prefix = "TITILER_"
+        env_file = ".env"
+
+    @property
+    def origins(self):
+        return [origin.strip() for origin in self.cors_origins.split(",")]
+
+
+api_settings = ApiSettings()